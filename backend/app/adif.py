@@ -1,3 +1,5 @@
+from collections.abc import Iterable
+
 from app.models import QSO
 
 
@@ -5,34 +7,107 @@ def _adif_field(name: str, value: str) -> str:
     return f"<{name}:{len(value)}>{value}"
 
 
+def adif_header() -> str:
+    return "\n".join([
+        _adif_field("ADIF_VER", "3.1.4"),
+        _adif_field("PROGRAMID", "POTA Logger"),
+        _adif_field("PROGRAMVERSION", "1.0"),
+        "<EOH>",
+        "",
+    ])
+
+
+class AdifEncoder:
+    """Renders QSO records for one export.
+
+    The STATION_CALLSIGN and SIG fields are the same for every record, so
+    they are formatted once up front; each record is then a single f-string
+    with dates sliced from isoformat() instead of two strftime calls.
+    Records come out framed by blank lines the way generate_adif() lays
+    them out.
+    """
+
+    def __init__(self, operator_callsign: str):
+        self._prefix = "\n" + _adif_field("STATION_CALLSIGN", operator_callsign.upper()) + " "
+
+    def record(self, qso: QSO) -> str:
+        call = qso.callsign.upper()
+        park = qso.park_reference.upper()
+        band = qso.band.lower()
+        freq = f"{qso.frequency:.4f}"
+        mode = qso.mode.upper()
+        rst_sent = qso.rst_sent
+        rst_rcvd = qso.rst_received
+        ts = qso.timestamp.isoformat()  # YYYY-MM-DDTHH:MM:SS[...]
+        return (
+            f"{self._prefix}<CALL:{len(call)}>{call} <SIG:4>POTA <SIG_INFO:{len(park)}>{park}"
+            f" <QSO_DATE:8>{ts[0:4]}{ts[5:7]}{ts[8:10]} <TIME_ON:6>{ts[11:13]}{ts[14:16]}{ts[17:19]}"
+            f" <BAND:{len(band)}>{band} <FREQ:{len(freq)}>{freq} <MODE:{len(mode)}>{mode}"
+            f" <RST_SENT:{len(rst_sent)}>{rst_sent} <RST_RCVD:{len(rst_rcvd)}>{rst_rcvd} <EOR>\n"
+        )
+
+    def records(self, qsos: Iterable[QSO]) -> str:
+        """A batch of records as one string."""
+        record = self.record
+        return "".join([record(qso) for qso in qsos])
+
+
 def generate_adif(operator_callsign: str, qsos: list[QSO]) -> str:
-    lines = []
-
-    # Header
-    lines.append(_adif_field("ADIF_VER", "3.1.4"))
-    lines.append(_adif_field("PROGRAMID", "POTA Logger"))
-    lines.append(
-        _adif_field("PROGRAMVERSION", "1.0")
-    )
-    lines.append("<EOH>")
-    lines.append("")
-
-    for qso in qsos:
-        record = []
-        record.append(_adif_field("STATION_CALLSIGN", operator_callsign.upper()))
-        record.append(_adif_field("CALL", qso.callsign.upper()))
-        record.append(_adif_field("SIG", "POTA"))
-        record.append(_adif_field("SIG_INFO", qso.park_reference.upper()))
-        record.append(_adif_field("QSO_DATE", qso.timestamp.strftime("%Y%m%d")))
-        record.append(_adif_field("TIME_ON", qso.timestamp.strftime("%H%M%S")))
-        record.append(_adif_field("BAND", qso.band.lower()))
-        freq_str = f"{qso.frequency:.4f}"
-        record.append(_adif_field("FREQ", freq_str))
-        record.append(_adif_field("MODE", qso.mode.upper()))
-        record.append(_adif_field("RST_SENT", qso.rst_sent))
-        record.append(_adif_field("RST_RCVD", qso.rst_received))
-        record.append("<EOR>")
-        lines.append(" ".join(record))
-        lines.append("")
-
-    return "\n".join(lines)
+    return adif_header() + AdifEncoder(operator_callsign).records(qsos)
+
+
+class AdifParser:
+    """Incremental ADI reader: feed text in chunks of any size, get records back.
+
+    Fields are read by their declared length rather than by pattern, so
+    values may contain '<' or newlines. A field split across chunks waits
+    in a small buffer, which keeps memory flat however large the file is.
+    Header fields (everything before <EOH>) are dropped.
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._record: dict[str, str] = {}
+
+    def feed(self, text: str) -> list[dict[str, str]]:
+        buf = self._buf + text
+        records = []
+        pos = 0
+        while True:
+            start = buf.find("<", pos)
+            if start < 0:
+                pos = len(buf)
+                break
+            end = buf.find(">", start)
+            if end < 0:
+                pos = start
+                break
+            spec = buf[start + 1:end].split(":")
+            name = spec[0].strip().upper()
+            if len(spec) == 1:
+                if name == "EOR":
+                    if self._record:
+                        records.append(self._record)
+                    self._record = {}
+                elif name == "EOH":
+                    self._record = {}
+                pos = end + 1
+                continue
+            try:
+                length = int(spec[1])
+            except ValueError:
+                # Not a field specifier, e.g. a stray '<' in header text
+                pos = start + 1
+                continue
+            if end + 1 + length > len(buf):
+                pos = start
+                break
+            self._record[name] = buf[end + 1:end + 1 + length]
+            pos = end + 1 + length
+        self._buf = buf[pos:]
+        return records
+
+    def close(self) -> list[dict[str, str]]:
+        """Records still pending at end of input (a final record missing its <EOR>)."""
+        record, self._record, self._buf = self._record, {}, ""
+        return [record] if record else []
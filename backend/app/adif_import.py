@@ -0,0 +1,243 @@
+"""Streaming ADIF import into hunt sessions, one session per UTC date.
+
+    cd backend && python -m app.adif_import log.adi [more.adi ...]
+"""
+
+import asyncio
+import codecs
+import sys
+import time
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.adif import AdifParser
+from app.bands import khz_to_band
+from app.models import QSO, QSO_UNIQUE_COLUMNS, HuntSession
+from app.qso_codes import add_names
+from app.write_queue import WriteQueue
+
+IMPORT_BATCH_SIZE = 5000
+READ_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class ImportStats:
+    records: int = 0
+    created: int = 0
+    duplicates: int = 0
+    skipped: int = 0
+    sessions_created: int = 0
+    # Ids of sessions that gained QSOs; one per logged day, so stays small
+    session_ids: set[str] = field(default_factory=set)
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> dict:
+        elapsed = self.elapsed
+        return {
+            "records": self.records,
+            "created": self.created,
+            "duplicates": self.duplicates,
+            "skipped": self.skipped,
+            "sessions_created": self.sessions_created,
+            "elapsed_seconds": round(elapsed, 3),
+            "records_per_second": round(self.records / elapsed) if elapsed else None,
+        }
+
+
+def _park_refs(record: dict[str, str]) -> list[str]:
+    # POTA_REF may list several parks (two-fers) with optional @location suffixes
+    refs = record.get("POTA_REF", "")
+    if not refs and record.get("SIG", "").strip().upper() == "POTA":
+        refs = record.get("SIG_INFO", "")
+    return [r.split("@")[0].strip().upper() for r in refs.split(",") if r.strip()]
+
+
+def _timestamp(record: dict[str, str]) -> datetime | None:
+    # Sliced by hand: strptime was the costliest step of a large import
+    day = record.get("QSO_DATE", "").strip()
+    clock = record.get("TIME_ON", "").strip().ljust(6, "0")
+    try:
+        return datetime(
+            int(day[0:4]), int(day[4:6]), int(day[6:8]),
+            int(clock[0:2]), int(clock[2:4]), int(clock[4:6]),
+        )
+    except ValueError:
+        return None
+
+
+def qso_values(record: dict[str, str]) -> list[dict]:
+    """QSO column values for one ADIF record, one per park; [] if it can't be used."""
+    callsign = record.get("CALL", "").strip().upper()
+    parks = _park_refs(record)
+    timestamp = _timestamp(record)
+    try:
+        frequency = float(record.get("FREQ", ""))  # MHz
+    except ValueError:
+        frequency = 0.0
+    band = record.get("BAND", "").strip().lower() or khz_to_band(str(frequency * 1000))
+    if not (callsign and parks and timestamp and band):
+        return []
+    mode = record.get("SUBMODE", "").strip() or record.get("MODE", "").strip()
+    return [
+        {
+            "park_reference": park,
+            "callsign": callsign,
+            "frequency": frequency,
+            "band": band,
+            "mode": mode.upper(),
+            "rst_sent": record.get("RST_SENT", "").strip(),
+            "rst_received": record.get("RST_RCVD", "").strip(),
+            "timestamp": timestamp,
+        }
+        for park in parks
+    ]
+
+
+async def _create_sessions(db: AsyncSession, dates: set[date]) -> tuple[int, list[tuple]]:
+    """Insert sessions for any of the dates lacking one; (rows created, (id, date) of all)."""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    result = await db.execute(
+        sqlite_insert(HuntSession.__table__).on_conflict_do_nothing(index_elements=["session_date"]),
+        [{"id": str(uuid.uuid4()), "session_date": d, "created_at": now} for d in dates],
+    )
+    rows = await db.execute(
+        select(HuntSession.id, HuntSession.session_date).where(HuntSession.session_date.in_(dates))
+    )
+    return max(result.rowcount, 0), list(rows)
+
+
+async def _insert_rows(db: AsyncSession, rows: list[dict]) -> int:
+    # Core executemany: sqlite counts only rows the statement itself inserted,
+    # not the worked_summary rows its triggers touch
+    result = await db.execute(
+        sqlite_insert(QSO.__table__).on_conflict_do_nothing(index_elements=QSO_UNIQUE_COLUMNS),
+        rows,
+    )
+    return result.rowcount
+
+
+class _SessionIds:
+    """Hunt session id per date, creating sessions on first use."""
+
+    def __init__(self, stats: ImportStats):
+        self._ids: dict[date, str] = {}
+        self._stats = stats
+
+    async def resolve(self, write_queue: WriteQueue, dates: set[date]) -> dict[date, str]:
+        missing = dates - self._ids.keys()
+        if missing:
+            created, rows = await write_queue.submit(
+                lambda db: _create_sessions(db, missing), savepoint=True
+            )
+            self._stats.sessions_created += created
+            self._ids.update((d, str(sid)) for sid, d in rows)
+        return self._ids
+
+
+async def _insert_batch(
+    write_queue: WriteQueue, sessions: _SessionIds, rows: list[dict], stats: ImportStats
+) -> None:
+    ids = await sessions.resolve(write_queue, {row["timestamp"].date() for row in rows})
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    for row in rows:
+        row["id"] = str(uuid.uuid4())
+        row["hunt_session_id"] = ids[row["timestamp"].date()]
+        row["created_at"] = now
+        stats.session_ids.add(row["hunt_session_id"])
+    # Names commit on their own, so a failed insert never takes them along
+    bands = {row["band"] for row in rows}
+    modes = {row["mode"] for row in rows}
+    await write_queue.submit(lambda db: add_names(db, bands, modes), savepoint=True)
+    created = await write_queue.submit(lambda db: _insert_rows(db, rows), savepoint=True)
+    stats.created += created
+    stats.duplicates += len(rows) - created
+
+
+async def import_adif(
+    write_queue: WriteQueue,
+    chunks: AsyncIterable[bytes],
+    progress: Callable[[ImportStats], None] | None = None,
+    batch_size: int = IMPORT_BATCH_SIZE,
+    stats: ImportStats | None = None,
+) -> ImportStats:
+    """Parse ADIF bytes as they arrive and insert QSOs in batches through the write queue.
+
+    Duplicates of already-logged QSOs (uq_qso_session_call_park_band) are
+    counted rather than raised. Only one batch is held in memory at a time.
+    Pass stats to read the counts of committed batches if the import fails
+    or is cancelled partway.
+    """
+    stats = stats if stats is not None else ImportStats()
+    sessions = _SessionIds(stats)
+    parser = AdifParser()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    rows: list[dict] = []
+
+    async def handle(records: list[dict[str, str]]) -> None:
+        nonlocal rows
+        for record in records:
+            stats.records += 1
+            values = qso_values(record)
+            if not values:
+                stats.skipped += 1
+            rows.extend(values)
+            if len(rows) >= batch_size:
+                await _insert_batch(write_queue, sessions, rows, stats)
+                rows = []
+                if progress is not None:
+                    progress(stats)
+
+    async for chunk in chunks:
+        await handle(parser.feed(decoder.decode(chunk)))
+    await handle(parser.feed(decoder.decode(b"", final=True)) + parser.close())
+    if rows:
+        await _insert_batch(write_queue, sessions, rows, stats)
+    if progress is not None:
+        progress(stats)
+    return stats
+
+
+async def read_file(path: str, chunk_size: int = READ_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            yield chunk
+
+
+def _print_progress(stats: ImportStats) -> None:
+    s = stats.as_dict()
+    print(
+        f"\r{s['records']} records  {s['created']} new  {s['duplicates']} duplicate  "
+        f"{s['skipped']} skipped  {s['records_per_second'] or 0} rec/s",
+        end="",
+        flush=True,
+    )
+
+
+async def _main(paths: list[str]) -> None:
+    from app.database import async_session, engine
+    from app.migrations import run_migrations
+
+    await run_migrations(engine)
+    write_queue = WriteQueue(async_session)
+    for path in paths:
+        print(path)
+        stats = await import_adif(write_queue, read_file(path), progress=_print_progress)
+        print(f"\n{stats.sessions_created} new sessions, {stats.elapsed:.1f}s")
+    await write_queue.stop()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("usage: python -m app.adif_import <file.adi> [...]")
+    asyncio.run(_main(sys.argv[1:]))
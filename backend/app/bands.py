@@ -0,0 +1,54 @@
+from bisect import bisect_right
+from collections.abc import Iterable
+
+try:
+    import numpy as np
+except ImportError:  # optional; the bisect path handles every input
+    np = None
+
+BAND_RANGES: list[tuple[float, float, str]] = [
+    (1800, 2000, "160m"),
+    (3500, 4000, "80m"),
+    (5330, 5406, "60m"),
+    (7000, 7300, "40m"),
+    (10100, 10150, "30m"),
+    (14000, 14350, "20m"),
+    (18068, 18168, "17m"),
+    (21000, 21450, "15m"),
+    (24890, 24990, "12m"),
+    (28000, 30000, "10m"),
+    (50000, 54000, "6m"),
+    (144000, 148000, "2m"),
+]
+
+# Flattened [low0, high0, low1, high1, ...] boundaries. bisect_right() of a
+# frequency lands on an odd index exactly when it is inside a band, so a
+# parallel label table with "" at the even (gap) slots classifies in one step.
+_EDGES: list[float] = [edge for low, high, _ in BAND_RANGES for edge in (low, high)]
+_LABELS: list[str] = [""]
+for _, _, _band in BAND_RANGES:
+    _LABELS += [_band, ""]
+
+# Below this many values the NumPy call overhead outweighs the vectorized scan.
+NUMPY_MIN_BATCH = 256
+
+
+def _parse_khz(khz) -> float:
+    try:
+        return float(khz)
+    except (ValueError, TypeError):
+        return float("nan")
+
+
+def khz_to_band(khz: str) -> str:
+    # NaN compares false against every edge and falls off the end -> ""
+    return _LABELS[bisect_right(_EDGES, _parse_khz(khz))]
+
+
+def classify_khz(values: Iterable) -> list[str]:
+    """Band for each kHz value, same results as khz_to_band() per item."""
+    freqs = [_parse_khz(v) for v in values]
+    if np is not None and len(freqs) >= NUMPY_MIN_BATCH:
+        idx = np.searchsorted(np.asarray(_EDGES), np.asarray(freqs), side="right")
+        return np.asarray(_LABELS, dtype=object)[idx].tolist()
+    return [_LABELS[bisect_right(_EDGES, f)] for f in freqs]
@@ -1,15 +1,85 @@
 import os
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 DATABASE_URL = os.environ.get(
     "DATABASE_URL", "sqlite+aiosqlite:///pota.db"
 )
 
-engine = create_async_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# SQLite performance profile, applied to every new connection; an empty
+# value leaves that pragma at SQLite's default
+SQLITE_PRAGMAS = {
+    "journal_mode": os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "cache_size": os.environ.get("SQLITE_CACHE_SIZE", "-65536"),  # negative: KiB, so 64 MB
+    "mmap_size": os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)),
+    "temp_store": os.environ.get("SQLITE_TEMP_STORE", "MEMORY"),
+    "busy_timeout": os.environ.get("SQLITE_BUSY_TIMEOUT", "5000"),  # ms
+}
+SQLITE_READ_POOL_SIZE = int(os.environ.get("SQLITE_READ_POOL_SIZE", "4"))
+
+
+def _set_pragmas(engine: AsyncEngine, pragmas: dict[str, str]) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            if value:
+                cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_engines(url: str = DATABASE_URL) -> tuple[AsyncEngine, AsyncEngine]:
+    """(writer, reader) engines for url.
+
+    For an SQLite file the writer is a single pooled connection, so writes
+    queue in the pool instead of failing with "database is locked", and the
+    reader is a small pool of query_only connections. In WAL mode readers
+    never block the writer, so long exports don't hold up QSO inserts.
+    Other databases, and in-memory SQLite, share one engine for both.
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        engine = create_async_engine(url)
+        return engine, engine
+    if parsed.database in (None, "", ":memory:"):
+        engine = create_async_engine(url, connect_args={"check_same_thread": False})
+        return engine, engine
+
+    writer = create_async_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    _set_pragmas(writer, SQLITE_PRAGMAS)
+    reader = create_async_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=SQLITE_READ_POOL_SIZE,
+        max_overflow=0,
+    )
+    # journal_mode is a property of the file, set by the writer
+    _set_pragmas(reader, {**SQLITE_PRAGMAS, "journal_mode": "", "query_only": "ON"})
+    return writer, reader
+
+
+engine, read_engine = create_engines()
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+read_session = async_sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
 
 
 async def get_db():
     async with async_session() as session:
         yield session
+
+
+async def get_read_db():
+    """Session on the read-only pool, for endpoints that never write."""
+    async with read_session() as session:
+        yield session
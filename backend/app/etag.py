@@ -0,0 +1,58 @@
+import hashlib
+import uuid
+from collections import defaultdict
+
+from fastapi import Request, Response
+
+# Version counters live in process memory, so ETags are scoped to this process
+# lifetime; a restart changes every tag instead of risking a false match.
+BOOT_ID = uuid.uuid4().hex[:12]
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1(
+        "\x1f".join(str(p) for p in (BOOT_ID, *parts)).encode()
+    ).hexdigest()[:24]
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str, exists: bool = False) -> bool:
+    """True when If-None-Match names this tag.
+
+    `*` matches any current representation, so it only counts once the
+    caller passes `exists=True` for a resource it has confirmed is there.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return exists
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    candidates = (tag.strip().removeprefix("W/") for tag in header.split(","))
+    return etag in candidates
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    # Let browsers keep the body but revalidate it on every request
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
+
+
+class VersionCounter:
+    """Per-key counters bumped on every mutation of the keyed resource."""
+
+    def __init__(self):
+        self._versions: defaultdict[str, int] = defaultdict(int)
+
+    def get(self, key) -> int:
+        return self._versions.get(str(key), 0)
+
+    def bump(self, key) -> int:
+        self._versions[str(key)] += 1
+        return self._versions[str(key)]
@@ -0,0 +1,90 @@
+import os
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+
+EXPORT_CACHE_BYTES = int(os.environ.get("EXPORT_CACHE_BYTES", str(64 * 1024 * 1024)))
+# Larger renders are streamed every time rather than evicting everything else
+EXPORT_CACHE_MAX_ENTRY_BYTES = int(
+    os.environ.get("EXPORT_CACHE_MAX_ENTRY_BYTES", str(16 * 1024 * 1024))
+)
+
+# (session id, format, session version, settings version); the settings
+# version stands in for the operator callsign so a hit never reads settings
+ExportKey = tuple[str, str, int, int]
+# (filename, body)
+Export = tuple[str, bytes]
+
+
+class ExportCache:
+    """Rendered exports in an LRU bounded by total bytes.
+
+    Keys carry the session and settings versions, so a QSO mutation or a
+    settings update makes older renders unreachable; they age out as new
+    entries push the cache over its budget.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = EXPORT_CACHE_BYTES,
+        max_entry_bytes: int = EXPORT_CACHE_MAX_ENTRY_BYTES,
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self._entries: OrderedDict[ExportKey, Export] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: ExportKey) -> Export | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: ExportKey, filename: str, body: bytes) -> None:
+        if len(body) > self.max_entry_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= len(old[1])
+        self._entries[key] = (filename, body)
+        self.bytes += len(body)
+        while self.bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.bytes -= len(evicted)
+            self.evictions += 1
+
+    async def tee(
+        self, key: ExportKey, filename: str, chunks: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        """Pass a streamed render through, storing it once it completes.
+
+        Collection stops as soon as the render outgrows max_entry_bytes, and
+        an interrupted stream is never stored.
+        """
+        parts: list[bytes] | None = []
+        size = 0
+        async for chunk in chunks:
+            if parts is not None:
+                size += len(chunk)
+                if size > self.max_entry_bytes:
+                    parts = None
+                else:
+                    parts.append(chunk)
+            yield chunk
+        if parts is not None:
+            self.put(key, filename, b"".join(parts))
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
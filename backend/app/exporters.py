@@ -0,0 +1,135 @@
+"""Export formats sharing one row pipeline: ADIF, CSV, JSON Lines and Cabrillo.
+
+Every writer receives the same rows, selected as EXPORT_COLUMNS and
+streamed in batches, and turns a batch into one string. Writers unpack the
+row tuples positionally instead of building a dict per QSO.
+"""
+
+import csv
+import io
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from json.encoder import encode_basestring  # C-accelerated JSON string quoting
+from typing import Protocol
+
+from app.adif import AdifEncoder, adif_header
+from app.models import QSO
+
+# Plain rows rather than ORM objects: nothing lands in an identity map.
+# CSV and JSON Lines fields follow this order.
+EXPORT_COLUMNS = (
+    QSO.callsign, QSO.park_reference, QSO.timestamp, QSO.band,
+    QSO.frequency, QSO.mode, QSO.rst_sent, QSO.rst_received,
+)
+CSV_HEADER = [
+    "callsign", "park_reference", "timestamp_utc", "band",
+    "frequency_mhz", "mode", "rst_sent", "rst_received",
+]
+
+# Cabrillo mode categories; anything else is a digital mode
+CABRILLO_MODES = {
+    "CW": "CW",
+    "SSB": "PH", "USB": "PH", "LSB": "PH", "AM": "PH",
+    "FM": "FM",
+    "RTTY": "RY",
+}
+
+
+class RecordWriter(Protocol):
+    def records(self, rows: Iterable) -> str: ...
+
+
+class CsvWriter:
+    """Rows as written by csv.writerows, timestamps as 'YYYY-MM-DD HH:MM:SS' UTC."""
+
+    def __init__(self, operator_callsign: str):
+        self._buf = io.StringIO()
+        self._writer = csv.writer(self._buf, lineterminator="\n")
+
+    def records(self, rows: Iterable) -> str:
+        # Stored timestamps carry microseconds; the column promises whole seconds
+        self._writer.writerows(
+            (call, park, ts.isoformat(" ", "seconds"), band, freq, mode, rst_sent, rst_rcvd)
+            for call, park, ts, band, freq, mode, rst_sent, rst_rcvd in rows
+        )
+        out = self._buf.getvalue()
+        self._buf.seek(0)
+        self._buf.truncate()
+        return out
+
+
+class JsonLinesWriter:
+    """One JSON object per QSO, keyed by column name, timestamps in ISO 8601 UTC."""
+
+    def __init__(self, operator_callsign: str):
+        pass
+
+    def records(self, rows: Iterable) -> str:
+        q = encode_basestring
+        return "".join([
+            f'{{"callsign":{q(call)},"park_reference":{q(park)},"timestamp":"{ts.isoformat()}Z",'
+            f'"band":{q(band)},"frequency":{freq!r},"mode":{q(mode)},'
+            f'"rst_sent":{q(rst_sent)},"rst_received":{q(rst_rcvd)}}}\n'
+            for call, park, ts, band, freq, mode, rst_sent, rst_rcvd in rows
+        ])
+
+
+def cabrillo_header(operator_callsign: str) -> str:
+    return (
+        "START-OF-LOG: 3.0\n"
+        "CREATED-BY: POTA Logger 1.0\n"
+        f"CALLSIGN: {operator_callsign.upper()}\n"
+    )
+
+
+def cabrillo_footer(operator_callsign: str) -> str:
+    return "END-OF-LOG:\n"
+
+
+class CabrilloWriter:
+    """Cabrillo 3.0 QSO lines; the hunted park goes in the received exchange."""
+
+    def __init__(self, operator_callsign: str):
+        self._mycall = f"{operator_callsign.upper():<13}"
+
+    def records(self, rows: Iterable) -> str:
+        mycall = self._mycall
+        modes = CABRILLO_MODES
+        lines = []
+        for call, park, ts, band, freq, mode, rst_sent, rst_rcvd in rows:
+            t = ts.isoformat()
+            lines.append(
+                f"QSO: {round(freq * 1000):>5} {modes.get(mode.upper(), 'DG')} {t[0:10]} {t[11:13]}{t[14:16]}"
+                f" {mycall} {rst_sent:<3} {call.upper():<13} {rst_rcvd:<3} {park.upper()}\n"
+            )
+        return "".join(lines)
+
+
+def _no_text(operator_callsign: str) -> str:
+    return ""
+
+
+@dataclass(frozen=True)
+class Exporter:
+    extension: str
+    media_type: str
+    writer: Callable[[str], RecordWriter]  # operator callsign -> writer
+    header: Callable[[str], str] = _no_text
+    footer: Callable[[str], str] = _no_text
+
+
+def _adif_header(operator_callsign: str) -> str:
+    return adif_header()
+
+
+def _csv_header(operator_callsign: str) -> str:
+    return ",".join(CSV_HEADER) + "\n"
+
+
+EXPORTERS: dict[str, Exporter] = {
+    "adif": Exporter("adi", "application/octet-stream", AdifEncoder, _adif_header),
+    "csv": Exporter("csv", "text/csv; charset=utf-8", CsvWriter, _csv_header),
+    "jsonl": Exporter("jsonl", "application/x-ndjson", JsonLinesWriter),
+    "cabrillo": Exporter("log", "text/plain; charset=utf-8", CabrilloWriter, cabrillo_header, cabrillo_footer),
+}
+FORMAT_PATTERN = "^(" + "|".join(EXPORTERS) + ")$"
@@ -0,0 +1,122 @@
+import asyncio
+from collections.abc import Set
+from datetime import date, datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import QSO, HuntSession
+
+HuntedKey = tuple[str, str, str]
+
+
+def hunted_key(callsign: str, park_reference: str, band: str) -> HuntedKey:
+    return (callsign.upper(), park_reference.upper(), band.upper())
+
+
+async def _load_today(db: AsyncSession, today: date) -> tuple[str | None, dict[HuntedKey, set[str]]]:
+    session_id = (
+        await db.execute(select(HuntSession.id).where(HuntSession.session_date == today))
+    ).scalar_one_or_none()
+    keys: dict[HuntedKey, set[str]] = {}
+    if session_id is not None:
+        rows = await db.execute(
+            select(QSO.id, QSO.callsign, QSO.park_reference, QSO.band).where(
+                QSO.hunt_session_id == session_id
+            )
+        )
+        for qso_id, callsign, park, band in rows:
+            keys.setdefault(hunted_key(callsign, park, band), set()).add(str(qso_id))
+    return (str(session_id) if session_id is not None else None), keys
+
+
+class HuntedIndex:
+    """Today's hunted (callsign, park, band) keys, kept in step with QSO writes.
+
+    Each key maps to the ids of the QSOs that produced it, so a key stays
+    hunted until its last QSO is deleted. The routes record an insert or
+    delete only after the database write has succeeded, and clients learn
+    a QSO's id from its insert's response, so in practice each QSO's
+    insert reaches the index before its delete. The index reloads from
+    the database once per UTC day.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self._session_factory = session_factory
+        self._date: date | None = None
+        self._session_id: str | None = None
+        self._keys: dict[HuntedKey, set[str]] = {}
+        self._lock = asyncio.Lock()
+        self.loads = 0
+        # Bumped on every change; lets responses derived from the index be ETagged
+        self.version = 0
+
+    async def current(self) -> Set[HuntedKey]:
+        today = datetime.now(timezone.utc).date()
+        if self._date != today:
+            async with self._lock:
+                if self._date != today:
+                    async with self._session_factory() as db:
+                        self._session_id, self._keys = await _load_today(db, today)
+                    self._date = today
+                    self.loads += 1
+                    self.version += 1
+        return self._keys.keys()
+
+    def invalidate(self) -> None:
+        """Reload on next use, e.g. after a bulk import bypassed record_insert."""
+        self._date = None
+
+    async def record_insert(self, qso: QSO) -> None:
+        async with self._lock:
+            if not self._tracks(qso):
+                return
+            key = hunted_key(qso.callsign, qso.park_reference, qso.band)
+            self._keys.setdefault(key, set()).add(str(qso.id))
+            self.version += 1
+
+    async def record_delete(self, qso: QSO) -> None:
+        async with self._lock:
+            if not self._tracks(qso):
+                return
+            key = hunted_key(qso.callsign, qso.park_reference, qso.band)
+            ids = self._keys.get(key)
+            if ids is not None:
+                ids.discard(str(qso.id))
+                if not ids:
+                    del self._keys[key]
+                self.version += 1
+
+    def _tracks(self, qso: QSO) -> bool:
+        if self._date is None:
+            return False
+        if self._session_id is None:
+            # Today's session has been created since we loaded; reload lazily
+            # rather than guess whether this QSO belongs to it.
+            self._date = None
+            return False
+        return str(qso.hunt_session_id) == self._session_id
+
+    async def verify(self) -> dict:
+        """Compare the in-memory index with a fresh read of the database."""
+        await self.current()
+        async with self._lock:
+            async with self._session_factory() as db:
+                _, expected = await _load_today(db, self._date)
+            current = set(self._keys)
+        missing = sorted(expected.keys() - current)
+        extra = sorted(current - expected.keys())
+        return {
+            "date": self._date.isoformat(),
+            "size": len(current),
+            "consistent": not missing and not extra,
+            "missing": [list(k) for k in missing],
+            "extra": [list(k) for k in extra],
+        }
+
+    def stats(self) -> dict:
+        return {
+            "date": self._date.isoformat() if self._date else None,
+            "size": len(self._keys),
+            "loads": self.loads,
+        }
@@ -3,19 +3,65 @@ from contextlib import asynccontextmanager
 import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from app.database import engine
-from app.models import Base
-from app.routers import export, hunt_sessions, parks, qsos, radio, settings, spots
+from app.database import async_session, engine, read_session
+from app.etag import VersionCounter
+from app.export_cache import ExportCache
+from app.hunted_index import HuntedIndex
+from app.migrations import run_migrations
+from app.park_cache import ParkCache
+from app.park_catalog import ParkCatalog
+from app.qso_codes import QSOCodes
+from app.routers import export, hunt_sessions, imports, parks, qsos, radio, settings, spots, stats
+from app.settings_cache import SettingsCache
+from app.spot_cache import SpotCache
+from app.spot_history import SPOT_HISTORY_ENABLED, SpotRecorder
+from app.spot_stream import SpotStream
+from app.worked_index import WorkedIndex
+from app.write_queue import WriteQueue
+
+
+def init_state(
+    app: FastAPI,
+    session_factory: async_sessionmaker[AsyncSession],
+    read_session_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> None:
+    """Attach the process-wide caches and indexes to app.state.
+
+    The indexes only ever read, so they load through read_session_factory
+    when one is given and leave the writer connection to writes.
+    """
+    read_session_factory = read_session_factory or session_factory
+    app.state.spot_cache = SpotCache()
+    app.state.park_catalog = ParkCatalog()
+    app.state.session_versions = VersionCounter()
+    app.state.settings_versions = VersionCounter()
+    app.state.settings_cache = SettingsCache(session_factory, app.state.settings_versions)
+    app.state.export_cache = ExportCache()
+    app.state.hunted_index = HuntedIndex(read_session_factory)
+    app.state.worked_index = WorkedIndex(read_session_factory)
+    app.state.spot_stream = SpotStream(lambda: spots.load_annotated_spots(app))
+    app.state.spot_recorder = SpotRecorder(app, session_factory)
+    app.state.write_queue = WriteQueue(session_factory)
+    app.state.park_cache = ParkCache(app.state.write_queue)
+    app.state.qso_codes = QSOCodes(app.state.write_queue)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await run_migrations(engine)
     async with httpx.AsyncClient() as client:
         app.state.http_client = client
+        init_state(app, async_session, read_session)
+        await app.state.settings_cache.get()
+        await app.state.worked_index.current()
+        if SPOT_HISTORY_ENABLED:
+            app.state.spot_recorder.start()
         yield
+        await app.state.spot_recorder.stop()
+        await app.state.settings_cache.stop()
+        await app.state.write_queue.stop()
 
 
 app = FastAPI(title="POTA Logger", lifespan=lifespan)
@@ -26,12 +72,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count"],
 )
 
 app.include_router(hunt_sessions.router)
 app.include_router(qsos.router)
 app.include_router(export.router)
+app.include_router(export.log_router)
+app.include_router(imports.router)
 app.include_router(settings.router)
 app.include_router(parks.router)
 app.include_router(spots.router)
 app.include_router(radio.router)
+app.include_router(stats.router)
@@ -0,0 +1,117 @@
+"""Embedded, versioned schema migrations.
+
+Each module named ``vNNNN_<slug>.py`` in this package is one migration.
+It holds frozen SQL in ``STATEMENTS`` and may define ``upgrade(conn)``
+for steps that need Python. Applied versions are recorded in the
+``schema_version`` table. When the database is current, startup costs one
+``SELECT`` and no reflection.
+
+Each migration runs in one ``engine.begin()`` block, but pysqlite only
+opens the transaction at the first INSERT, UPDATE or DELETE. DDL before
+that point, index builds included, commits statement by statement; it is
+written to be idempotent (``IF NOT EXISTS``), so an upgrade that dies
+there re-runs it on the next start. From the first data change on, the
+rest of the migration, later DDL included, commits together with its
+``schema_version`` row: data steps are never half applied or applied
+without being recorded.
+
+    cd backend && python -m app.migrations [--dry-run]
+"""
+
+import importlib
+import logging
+import pkgutil
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import Connection, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+VERSION_TABLE = "schema_version"
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    description: str
+    statements: tuple[str, ...]
+    upgrade: Callable[[Connection], None] | None = None
+
+    def apply(self, conn: Connection) -> None:
+        for statement in self.statements:
+            conn.exec_driver_sql(statement)
+        if self.upgrade is not None:
+            self.upgrade(conn)
+        conn.execute(
+            text(
+                f"INSERT INTO {VERSION_TABLE} (version, name, applied_at) "
+                "VALUES (:version, :name, :applied_at)"
+            ),
+            {
+                "version": self.version,
+                "name": self.name,
+                "applied_at": datetime.now(timezone.utc).replace(tzinfo=None),
+            },
+        )
+
+
+def load_migrations() -> list[Migration]:
+    migrations = []
+    for info in sorted(pkgutil.iter_modules(__path__), key=lambda m: m.name):
+        if not info.name.startswith("v"):
+            continue
+        module = importlib.import_module(f"{__name__}.{info.name}")
+        migrations.append(
+            Migration(
+                version=int(info.name[1:5]),
+                name=info.name,
+                description=(module.__doc__ or "").strip().splitlines()[0],
+                statements=tuple(getattr(module, "STATEMENTS", ())),
+                upgrade=getattr(module, "upgrade", None),
+            )
+        )
+    versions = [m.version for m in migrations]
+    if versions != sorted(set(versions)):
+        raise RuntimeError(f"Duplicate or unordered migration versions: {versions}")
+    return migrations
+
+
+def current_version(conn: Connection) -> int:
+    try:
+        return conn.exec_driver_sql(f"SELECT MAX(version) FROM {VERSION_TABLE}").scalar() or 0
+    except OperationalError:
+        # No version table: an empty database or one made by create_all
+        return 0
+
+
+def _ensure_version_table(conn: Connection) -> None:
+    conn.exec_driver_sql(
+        f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+        "version INTEGER NOT NULL PRIMARY KEY, "
+        "name VARCHAR(100) NOT NULL, "
+        "applied_at DATETIME NOT NULL)"
+    )
+
+
+async def run_migrations(engine: AsyncEngine, dry_run: bool = False) -> list[Migration]:
+    """Bring the schema up to date; returns the migrations applied (or pending, for a dry run)."""
+    async with engine.connect() as conn:
+        version = await conn.run_sync(current_version)
+    migrations = load_migrations()
+    if migrations and version >= migrations[-1].version:
+        return []
+    pending = [m for m in migrations if m.version > version]
+    if dry_run:
+        return pending
+    async with engine.begin() as conn:
+        await conn.run_sync(_ensure_version_table)
+    for migration in pending:
+        logger.info("Applying migration %s: %s", migration.name, migration.description)
+        async with engine.begin() as conn:
+            await conn.run_sync(migration.apply)
+    return pending
@@ -0,0 +1,28 @@
+import argparse
+import asyncio
+
+from app.database import engine
+from app.migrations import current_version, run_migrations
+
+
+async def main(dry_run: bool) -> None:
+    async with engine.connect() as conn:
+        version = await conn.run_sync(current_version)
+    print(f"Schema version {version}")
+    migrations = await run_migrations(engine, dry_run=dry_run)
+    if not migrations:
+        print("Up to date")
+    for m in migrations:
+        print(f"{'Would apply' if dry_run else 'Applied'} {m.name}: {m.description}")
+        if dry_run:
+            for statement in m.statements:
+                print(f"    {statement};")
+            if m.upgrade is not None:
+                print("    -- plus a Python upgrade step")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m app.migrations")
+    parser.add_argument("--dry-run", action="store_true", help="list pending migrations without applying them")
+    asyncio.run(main(parser.parse_args().dry_run))
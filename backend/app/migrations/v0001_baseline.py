@@ -0,0 +1,36 @@
+"""Hunt sessions, QSOs and settings as originally created by create_all."""
+
+STATEMENTS = [
+    """CREATE TABLE IF NOT EXISTS hunt_sessions (
+    id VARCHAR(36) NOT NULL,
+    session_date DATE NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (session_date)
+)""",
+    """CREATE TABLE IF NOT EXISTS qsos (
+    id VARCHAR(36) NOT NULL,
+    hunt_session_id VARCHAR(36) NOT NULL,
+    park_reference VARCHAR(20) NOT NULL,
+    callsign VARCHAR(20) NOT NULL,
+    frequency FLOAT NOT NULL,
+    band VARCHAR(10) NOT NULL,
+    mode VARCHAR(10) NOT NULL,
+    rst_sent VARCHAR(10) NOT NULL,
+    rst_received VARCHAR(10) NOT NULL,
+    timestamp DATETIME NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT uq_qso_session_call_park_band UNIQUE (hunt_session_id, callsign, park_reference, band),
+    FOREIGN KEY(hunt_session_id) REFERENCES hunt_sessions (id)
+)""",
+    """CREATE TABLE IF NOT EXISTS settings (
+    id VARCHAR(36) NOT NULL,
+    operator_callsign VARCHAR(20) NOT NULL,
+    flrig_host VARCHAR(100) NOT NULL,
+    flrig_port INTEGER NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id)
+)""",
+]
@@ -0,0 +1,20 @@
+"""Spot history table and its time-range indexes."""
+
+STATEMENTS = [
+    """CREATE TABLE IF NOT EXISTS spot_history (
+    id INTEGER NOT NULL,
+    activator VARCHAR(20) NOT NULL,
+    reference VARCHAR(20) NOT NULL,
+    frequency FLOAT NOT NULL,
+    band VARCHAR(10) NOT NULL,
+    mode VARCHAR(10) NOT NULL,
+    spot_time DATETIME NOT NULL,
+    last_seen DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT uq_spot_history_spot UNIQUE (activator, reference, frequency, spot_time)
+)""",
+    "CREATE INDEX IF NOT EXISTS ix_spot_history_spot_time ON spot_history (spot_time)",
+    "CREATE INDEX IF NOT EXISTS ix_spot_history_reference_time ON spot_history (reference, spot_time)",
+    "CREATE INDEX IF NOT EXISTS ix_spot_history_activator_time ON spot_history (activator, spot_time)",
+    "CREATE INDEX IF NOT EXISTS ix_spot_history_band_time ON spot_history (band, spot_time)",
+]
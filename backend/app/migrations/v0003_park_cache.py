@@ -0,0 +1,11 @@
+"""Persistent park lookup cache."""
+
+STATEMENTS = [
+    """CREATE TABLE IF NOT EXISTS park_cache (
+    reference VARCHAR(20) NOT NULL,
+    found BOOLEAN NOT NULL,
+    data TEXT,
+    fetched_at DATETIME NOT NULL,
+    PRIMARY KEY (reference)
+)""",
+]
@@ -0,0 +1,16 @@
+"""Offline park catalog with a name index for prefix search."""
+
+STATEMENTS = [
+    """CREATE TABLE IF NOT EXISTS parks (
+    reference VARCHAR(20) NOT NULL,
+    name VARCHAR(200) NOT NULL,
+    active BOOLEAN NOT NULL,
+    entity_id INTEGER,
+    location_desc VARCHAR(100) NOT NULL,
+    latitude FLOAT,
+    longitude FLOAT,
+    grid VARCHAR(10) NOT NULL,
+    PRIMARY KEY (reference)
+)""",
+    "CREATE INDEX IF NOT EXISTS ix_parks_name ON parks (name)",
+]
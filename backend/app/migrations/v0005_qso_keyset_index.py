@@ -0,0 +1,5 @@
+"""Composite index for keyset pagination of a session's QSOs."""
+
+STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_qsos_session_timestamp ON qsos (hunt_session_id, timestamp, id)",
+]
@@ -0,0 +1,34 @@
+"""All-time worked summary kept in step with qsos by triggers."""
+
+# The key expressions here and in app/worked_index.py must agree
+_KEYS = """('park', upper({row}.park_reference)),
+        ('park_band', upper({row}.park_reference) || ' ' || upper({row}.band)),
+        ('call', upper({row}.callsign))"""
+
+STATEMENTS = [
+    """CREATE TABLE IF NOT EXISTS worked_summary (
+    kind VARCHAR(10) NOT NULL,
+    key VARCHAR(40) NOT NULL,
+    qso_count INTEGER NOT NULL,
+    PRIMARY KEY (kind, key)
+)""",
+    # Backfill; recomputes from scratch so a resumed upgrade stays exact
+    """INSERT INTO worked_summary (kind, key, qso_count)
+SELECT kind, key, COUNT(*) FROM (
+    SELECT 'park' AS kind, upper(park_reference) AS key FROM qsos
+    UNION ALL SELECT 'park_band', upper(park_reference) || ' ' || upper(band) FROM qsos
+    UNION ALL SELECT 'call', upper(callsign) FROM qsos
+) WHERE true GROUP BY kind, key
+ON CONFLICT (kind, key) DO UPDATE SET qso_count = excluded.qso_count""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_qsos_worked_insert AFTER INSERT ON qsos BEGIN
+    INSERT INTO worked_summary (kind, key, qso_count)
+    SELECT column1, column2, 1 FROM (VALUES {_KEYS.format(row="NEW")}) WHERE true
+    ON CONFLICT (kind, key) DO UPDATE SET qso_count = qso_count + 1;
+END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_qsos_worked_delete AFTER DELETE ON qsos BEGIN
+    UPDATE worked_summary SET qso_count = qso_count - 1
+    WHERE (kind, key) IN (VALUES {_KEYS.format(row="OLD")});
+    DELETE FROM worked_summary
+    WHERE qso_count <= 0 AND (kind, key) IN (VALUES {_KEYS.format(row="OLD")});
+END""",
+]
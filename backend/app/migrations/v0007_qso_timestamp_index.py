@@ -0,0 +1,5 @@
+"""Index for date-range ADIF export across all sessions."""
+
+STATEMENTS = [
+    "CREATE INDEX IF NOT EXISTS ix_qsos_timestamp ON qsos (timestamp, id)",
+]
@@ -0,0 +1,146 @@
+"""Compact QSO storage: BLOB UUIDs, integer Hz frequencies, band and mode codes.
+
+SQLite can't change a column's type, so hunt_sessions, qsos and settings
+are rebuilt: each is copied into a new table in the compact layout, the
+old one is dropped and the copy renamed into its place. The copy, drops
+and renames share one transaction, so an interrupted upgrade leaves the
+old tables as they were. The freed pages stay in the file until the next
+VACUUM.
+"""
+
+import uuid
+
+from sqlalchemy import Connection
+
+BANDS = [
+    "2190m", "630m", "560m", "160m", "80m", "60m", "40m", "30m", "20m", "17m", "15m",
+    "12m", "10m", "8m", "6m", "5m", "4m", "2m", "1.25m", "70cm", "33cm", "23cm",
+    "13cm", "9cm", "6cm", "3cm", "1.25cm", "6mm", "4mm", "2.5mm", "2mm", "1mm", "submm",
+]
+MODES = [
+    "CW", "SSB", "USB", "LSB", "AM", "FM", "FT8", "FT4", "JS8", "RTTY",
+    "PSK31", "MFSK", "OLIVIA", "SSTV", "DATA", "DIGITALVOICE",
+]
+
+
+def _seed(table: str, names: list[str]) -> str:
+    values = ", ".join(f"({code}, '{name}')" for code, name in enumerate(names, 1))
+    return f"INSERT INTO {table} (code, name) VALUES {values} ON CONFLICT DO NOTHING"
+
+
+STATEMENTS = [
+    """CREATE TABLE IF NOT EXISTS bands (
+    code INTEGER NOT NULL,
+    name VARCHAR(10) NOT NULL,
+    PRIMARY KEY (code),
+    UNIQUE (name)
+)""",
+    """CREATE TABLE IF NOT EXISTS modes (
+    code INTEGER NOT NULL,
+    name VARCHAR(10) NOT NULL,
+    PRIMARY KEY (code),
+    UNIQUE (name)
+)""",
+    _seed("bands", BANDS),
+    _seed("modes", MODES),
+]
+
+# The worked_summary key expressions, as in v0006 but reading the band name
+_KEYS = """('park', upper({row}.park_reference)),
+        ('park_band', upper({row}.park_reference) || ' ' || upper((SELECT bands.name FROM bands WHERE bands.code = {row}.band))),
+        ('call', upper({row}.callsign))"""
+
+REBUILD = [
+    """CREATE TABLE IF NOT EXISTS hunt_sessions_v8 (
+    id BLOB NOT NULL,
+    session_date DATE NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    UNIQUE (session_date)
+)""",
+    """CREATE TABLE IF NOT EXISTS qsos_v8 (
+    id BLOB NOT NULL,
+    hunt_session_id BLOB NOT NULL,
+    park_reference VARCHAR(20) NOT NULL,
+    callsign VARCHAR(20) NOT NULL,
+    frequency INTEGER NOT NULL,
+    band INTEGER NOT NULL,
+    mode INTEGER NOT NULL,
+    rst_sent VARCHAR(10) NOT NULL,
+    rst_received VARCHAR(10) NOT NULL,
+    timestamp DATETIME NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT uq_qso_session_call_park_band UNIQUE (hunt_session_id, callsign, park_reference, band),
+    FOREIGN KEY(hunt_session_id) REFERENCES hunt_sessions (id),
+    FOREIGN KEY(band) REFERENCES bands (code),
+    FOREIGN KEY(mode) REFERENCES modes (code)
+)""",
+    """CREATE TABLE IF NOT EXISTS settings_v8 (
+    id BLOB NOT NULL,
+    operator_callsign VARCHAR(20) NOT NULL,
+    flrig_host VARCHAR(100) NOT NULL,
+    flrig_port INTEGER NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id)
+)""",
+    # Leftovers of an interrupted attempt
+    "DELETE FROM hunt_sessions_v8",
+    "DELETE FROM qsos_v8",
+    "DELETE FROM settings_v8",
+    # Bands and modes beyond the seeded ones get the next free codes
+    "INSERT INTO bands (name) SELECT DISTINCT band FROM qsos WHERE true ON CONFLICT DO NOTHING",
+    "INSERT INTO modes (name) SELECT DISTINCT mode FROM qsos WHERE true ON CONFLICT DO NOTHING",
+    """INSERT INTO hunt_sessions_v8 (id, session_date, created_at)
+SELECT uuid_blob(id), session_date, created_at FROM hunt_sessions""",
+    """INSERT INTO qsos_v8 (
+    id, hunt_session_id, park_reference, callsign, frequency, band, mode,
+    rst_sent, rst_received, timestamp, created_at
+)
+SELECT uuid_blob(q.id), uuid_blob(q.hunt_session_id), q.park_reference, q.callsign,
+    CAST(round(q.frequency * 1000000) AS INTEGER), b.code, m.code,
+    q.rst_sent, q.rst_received, q.timestamp, q.created_at
+FROM qsos q JOIN bands b ON b.name = q.band JOIN modes m ON m.name = q.mode""",
+    """INSERT INTO settings_v8 (id, operator_callsign, flrig_host, flrig_port, created_at, updated_at)
+SELECT uuid_blob(id), operator_callsign, flrig_host, flrig_port, created_at, updated_at FROM settings""",
+    # Drops the old indexes and worked_summary triggers with the tables
+    "DROP TABLE qsos",
+    "DROP TABLE hunt_sessions",
+    "DROP TABLE settings",
+    "ALTER TABLE hunt_sessions_v8 RENAME TO hunt_sessions",
+    "ALTER TABLE qsos_v8 RENAME TO qsos",
+    "ALTER TABLE settings_v8 RENAME TO settings",
+    "CREATE INDEX IF NOT EXISTS ix_qsos_session_timestamp ON qsos (hunt_session_id, timestamp, id)",
+    "CREATE INDEX IF NOT EXISTS ix_qsos_timestamp ON qsos (timestamp, id)",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_qsos_worked_insert AFTER INSERT ON qsos BEGIN
+    INSERT INTO worked_summary (kind, key, qso_count)
+    SELECT column1, column2, 1 FROM (VALUES {_KEYS.format(row="NEW")}) WHERE true
+    ON CONFLICT (kind, key) DO UPDATE SET qso_count = qso_count + 1;
+END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_qsos_worked_delete AFTER DELETE ON qsos BEGIN
+    UPDATE worked_summary SET qso_count = qso_count - 1
+    WHERE (kind, key) IN (VALUES {_KEYS.format(row="OLD")});
+    DELETE FROM worked_summary
+    WHERE qso_count <= 0 AND (kind, key) IN (VALUES {_KEYS.format(row="OLD")});
+END""",
+]
+
+
+def _uuid_blob(value: str) -> bytes:
+    try:
+        return uuid.UUID(value).bytes
+    except ValueError:
+        # Not a UUID (hand-edited rows); keep references to it consistent
+        return uuid.uuid5(uuid.NAMESPACE_OID, value).bytes
+
+
+def upgrade(conn: Connection) -> None:
+    frequency_type = conn.exec_driver_sql(
+        "SELECT type FROM pragma_table_info('qsos') WHERE name = 'frequency'"
+    ).scalar()
+    if frequency_type == "INTEGER":
+        return  # rebuilt already; only the version row went missing
+    conn.connection.dbapi_connection.create_function("uuid_blob", 1, _uuid_blob, deterministic=True)
+    for statement in REBUILD:
+        conn.exec_driver_sql(statement)
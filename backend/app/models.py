@@ -1,19 +1,131 @@
 import uuid
 from datetime import date, datetime, timezone
 
-from sqlalchemy import Date, DateTime, Float, ForeignKey, Integer, String, TypeDecorator, UniqueConstraint
+from sqlalchemy import (
+    Boolean,
+    Date,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    TypeDecorator,
+    UniqueConstraint,
+    case,
+    event,
+    literal_column,
+)
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.sql.functions import FunctionElement
 
 
 class SQLiteUUID(TypeDecorator):
-    impl = String(36)
+    """UUIDs stored as 16-byte BLOBs and read back as strings.
+
+    Byte order sorts the same as the canonical text form, so ordering and
+    keyset cursors on ids are unchanged.
+    """
+
+    impl = LargeBinary(16)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, bytes):
+            return value
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(value)
+        return value.bytes
+
+    def result_processor(self, dialect, coltype):
+        # Formatted straight from hex: building uuid.UUID objects cost more
+        # than the rest of reading a QSO row
+        def process(value):
+            if value is None:
+                return value
+            h = value.hex()
+            return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+        return process
+
+
+class FrequencyHz(TypeDecorator):
+    """Frequency in MHz, as the API and ADIF use it, stored as integer Hz."""
+
+    impl = Integer
     cache_ok = True
 
     def process_bind_param(self, value, dialect):
-        return str(value) if value is not None else value
+        return round(value * 1_000_000) if value is not None else value
+
+    def result_processor(self, dialect, coltype):
+        def process(value):
+            return value / 1_000_000 if value is not None else value
+
+        return process
+
+
+class _lookup(FunctionElement):
+    """(SELECT <want> FROM <table> WHERE <have> = <expr>).
+
+    Rendered by hand: SQLAlchemy adds the outer table to a correlated
+    select() placed in a RETURNING clause instead of correlating it.
+    """
+
+    type = String()
+    inherit_cache = True
+
+
+@compiles(_lookup)
+def _compile_lookup(element, compiler, **kw):
+    table, want, have, expr = element.clauses
+    return (
+        f"(SELECT {table.name}.{want.name} FROM {table.name} "
+        f"WHERE {table.name}.{have.name} = {compiler.process(expr, **kw)})"
+    )
+
+
+class LookupCode(TypeDecorator):
+    """A name stored as the integer code of its row in a lookup table.
+
+    Names bind through a subquery on the lookup table, so inserts and
+    filters deal in names. Reads decode the seeded codes, which are the same
+    in every database, from a Python tuple and only look up later
+    additions in SQL, so RETURNING and plain selects also see names. A
+    name with no lookup row binds as NULL: filters match nothing and
+    inserts fail NOT NULL, so writers add new names first (app.qso_codes).
+    """
+
+    impl = Integer
+    cache_ok = True
+
+    def __init__(self, lookup_table: str, seeded: tuple[str, ...]):
+        super().__init__()
+        self.lookup_table = lookup_table
+        self.seeded = seeded
+        self._names = (None, *seeded)  # indexed by code
+
+    def bind_expression(self, bindvalue):
+        return _lookup(
+            literal_column(self.lookup_table), literal_column("code"), literal_column("name"), bindvalue
+        )
+
+    def column_expression(self, column):
+        later = _lookup(
+            literal_column(self.lookup_table), literal_column("name"), literal_column("code"), column
+        )
+        return case((column <= literal_column(str(len(self.seeded))), column), else_=later)
 
-    def process_result_value(self, value, dialect):
-        return str(value) if value is not None else value
+    def result_processor(self, dialect, coltype):
+        names = self._names
+
+        def process(value):
+            return names[value] if type(value) is int else value
+
+        return process
 
 
 class Base(DeclarativeBase):
@@ -36,6 +148,52 @@ class HuntSession(Base):
     )
 
 
+# Seed rows of the lookup tables, coded from 1 in this order (bands by
+# frequency, as ADIF lists them); migration v0008 seeds the same lists
+BAND_NAMES = [
+    "2190m", "630m", "560m", "160m", "80m", "60m", "40m", "30m", "20m", "17m", "15m",
+    "12m", "10m", "8m", "6m", "5m", "4m", "2m", "1.25m", "70cm", "33cm", "23cm",
+    "13cm", "9cm", "6cm", "3cm", "1.25cm", "6mm", "4mm", "2.5mm", "2mm", "1mm", "submm",
+]
+MODE_NAMES = [
+    "CW", "SSB", "USB", "LSB", "AM", "FM", "FT8", "FT4", "JS8", "RTTY",
+    "PSK31", "MFSK", "OLIVIA", "SSTV", "DATA", "DIGITALVOICE",
+]
+
+
+class Band(Base):
+    """Lookup table behind QSO.band; rows are only ever added."""
+
+    __tablename__ = "bands"
+
+    code: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(10), unique=True)
+
+
+class Mode(Base):
+    """Lookup table behind QSO.mode; rows are only ever added."""
+
+    __tablename__ = "modes"
+
+    code: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(10), unique=True)
+
+
+def _seeder(names: list[str]):
+    def seed(table, connection, **kw):
+        connection.execute(table.insert(), [{"code": i, "name": n} for i, n in enumerate(names, 1)])
+
+    return seed
+
+
+event.listen(Band.__table__, "after_create", _seeder(BAND_NAMES))
+event.listen(Mode.__table__, "after_create", _seeder(MODE_NAMES))
+
+
+# Columns of uq_qso_session_call_park_band, the conflict target for QSO inserts
+QSO_UNIQUE_COLUMNS = ["hunt_session_id", "callsign", "park_reference", "band"]
+
+
 class QSO(Base):
     __tablename__ = "qsos"
     __table_args__ = (
@@ -43,6 +201,10 @@ class QSO(Base):
             "hunt_session_id", "callsign", "park_reference", "band",
             name="uq_qso_session_call_park_band",
         ),
+        # Keyset pagination over a session's QSOs in logging order
+        Index("ix_qsos_session_timestamp", "hunt_session_id", "timestamp", "id"),
+        # Date-range export across sessions
+        Index("ix_qsos_timestamp", "timestamp", "id"),
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
@@ -53,9 +215,9 @@ class QSO(Base):
     )
     park_reference: Mapped[str] = mapped_column(String(20))
     callsign: Mapped[str] = mapped_column(String(20))
-    frequency: Mapped[float] = mapped_column(Float)
-    band: Mapped[str] = mapped_column(String(10))
-    mode: Mapped[str] = mapped_column(String(10))
+    frequency: Mapped[float] = mapped_column(FrequencyHz())
+    band: Mapped[str] = mapped_column(LookupCode("bands", tuple(BAND_NAMES)), ForeignKey("bands.code"))
+    mode: Mapped[str] = mapped_column(LookupCode("modes", tuple(MODE_NAMES)), ForeignKey("modes.code"))
     rst_sent: Mapped[str] = mapped_column(String(10))
     rst_received: Mapped[str] = mapped_column(String(10))
     timestamp: Mapped[datetime] = mapped_column(
@@ -85,3 +247,69 @@ class Settings(Base):
         default=lambda: datetime.now(timezone.utc),
         onupdate=lambda: datetime.now(timezone.utc),
     )
+
+
+class SpotHistory(Base):
+    """One row per distinct upstream spot, appended by the spot recorder."""
+
+    __tablename__ = "spot_history"
+    __table_args__ = (
+        UniqueConstraint(
+            "activator", "reference", "frequency", "spot_time",
+            name="uq_spot_history_spot",
+        ),
+        Index("ix_spot_history_spot_time", "spot_time"),
+        Index("ix_spot_history_reference_time", "reference", "spot_time"),
+        Index("ix_spot_history_activator_time", "activator", "spot_time"),
+        Index("ix_spot_history_band_time", "band", "spot_time"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    activator: Mapped[str] = mapped_column(String(20))
+    reference: Mapped[str] = mapped_column(String(20))
+    frequency: Mapped[float] = mapped_column(Float)  # kHz, as spotted
+    band: Mapped[str] = mapped_column(String(10))
+    mode: Mapped[str] = mapped_column(String(10))
+    spot_time: Mapped[datetime] = mapped_column(DateTime())
+    last_seen: Mapped[datetime] = mapped_column(DateTime())
+
+
+class ParkCache(Base):
+    """Persistent tier of the park lookup cache; data is NULL for unknown parks."""
+
+    __tablename__ = "park_cache"
+
+    reference: Mapped[str] = mapped_column(String(20), primary_key=True)
+    found: Mapped[bool] = mapped_column(Boolean)
+    data: Mapped[str | None] = mapped_column(Text, nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime())
+
+
+class Park(Base):
+    """Offline copy of the POTA park catalog (all_parks_ext.csv)."""
+
+    __tablename__ = "parks"
+    __table_args__ = (Index("ix_parks_name", "name"),)
+
+    reference: Mapped[str] = mapped_column(String(20), primary_key=True)
+    name: Mapped[str] = mapped_column(String(200))
+    active: Mapped[bool] = mapped_column(Boolean, default=True)
+    entity_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    location_desc: Mapped[str] = mapped_column(String(100), default="")
+    latitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    longitude: Mapped[float | None] = mapped_column(Float, nullable=True)
+    grid: Mapped[str] = mapped_column(String(10), default="")
+
+
+class WorkedSummary(Base):
+    """All-time QSO counts per worked park, park+band and callsign.
+
+    Maintained by triggers on qsos (see migrations v0006 and v0008), so
+    every write path keeps it in step inside the same transaction.
+    """
+
+    __tablename__ = "worked_summary"
+
+    kind: Mapped[str] = mapped_column(String(10), primary_key=True)  # park, park_band, call
+    key: Mapped[str] = mapped_column(String(40), primary_key=True)
+    qso_count: Mapped[int] = mapped_column(Integer)
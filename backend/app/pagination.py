@@ -0,0 +1,39 @@
+import base64
+import json
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort: str, key: tuple) -> str:
+    """Opaque cursor holding the sort order and the last key of a page."""
+    raw = json.dumps([sort, key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+# A float slot also takes ints: JSON writes 14074.0 back as 14074.0, but
+# a hand-made cursor may say 14074
+NUMBER = (int, float)
+
+
+def decode_cursor(cursor: str, sort: str, types: tuple[type | tuple[type, ...], ...]) -> tuple:
+    """The key of a cursor from encode_cursor, checked against the expected types.
+
+    Cursors come from the client, so anything but a list with one value of
+    the right type per slot is rejected rather than compared against keys.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, key = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise InvalidCursor("Malformed cursor")
+    if cursor_sort != sort:
+        raise InvalidCursor("Cursor was issued for a different sort order")
+    if (
+        not isinstance(key, list)
+        or len(key) != len(types)
+        or not all(isinstance(value, t) for value, t in zip(key, types))
+    ):
+        raise InvalidCursor("Malformed cursor")
+    return tuple(key)
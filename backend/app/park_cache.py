@@ -0,0 +1,273 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ParkCache as ParkCacheRow
+from app.park_catalog import ParkCatalog
+from app.write_queue import WriteQueue
+
+PARK_URL = "https://api.pota.app/park/{ref}"
+
+PARK_CACHE_SIZE = int(os.environ.get("PARK_CACHE_SIZE", "4096"))
+PARK_CACHE_TTL = float(os.environ.get("PARK_CACHE_TTL", str(30 * 86400)))
+PARK_CACHE_NEGATIVE_TTL = float(os.environ.get("PARK_CACHE_NEGATIVE_TTL", "86400"))
+# Upper bound on simultaneous upstream requests across all lookups
+PARK_BATCH_CONCURRENCY = int(os.environ.get("PARK_BATCH_CONCURRENCY", "4"))
+
+NOT_FOUND = "not_found"
+UPSTREAM_ERROR = "upstream_error"
+
+
+class ParkNotFound(Exception):
+    pass
+
+
+class ParkCache:
+    """In-process LRU of park lookups backed by the park_cache table.
+
+    Unknown references are cached too (for a shorter TTL) so typos don't
+    reach the upstream API on every keystroke. Fetched entries are written
+    through the write queue, so a lookup never holds the writer connection.
+    Upstream requests share one semaphore, and concurrent lookups of the
+    same reference share one request.
+    """
+
+    def __init__(
+        self,
+        write_queue: WriteQueue,
+        size: int = PARK_CACHE_SIZE,
+        ttl: float = PARK_CACHE_TTL,
+        negative_ttl: float = PARK_CACHE_NEGATIVE_TTL,
+        concurrency: int = PARK_BATCH_CONCURRENCY,
+    ):
+        self._write_queue = write_queue
+        self.size = size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # reference -> (park data or None if unknown, fetched_at epoch seconds)
+        self._entries: OrderedDict[str, tuple[dict | None, float]] = OrderedDict()
+        self._semaphore = asyncio.Semaphore(concurrency)
+        # reference -> upstream request other lookups of it can join
+        self._inflight: dict[str, asyncio.Task] = {}
+        self.memory_hits = 0
+        self.catalog_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.shared_fetches = 0
+        self.upstream_errors = 0
+        self.upstream_requests = 0
+        self.upstream_seconds = 0.0
+        self.upstream_max_seconds = 0.0
+
+    def _fresh(self, data: dict | None, fetched_at: float) -> bool:
+        ttl = self.ttl if data is not None else self.negative_ttl
+        return time.time() - fetched_at < ttl
+
+    def _remember(self, ref: str, data: dict | None, fetched_at: float) -> None:
+        self._entries[ref] = (data, fetched_at)
+        self._entries.move_to_end(ref)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def peek(self, ref: str) -> dict | None:
+        """Fresh in-memory entry for ref, raising ParkNotFound for cached misses."""
+        entry = self._entries.get(ref)
+        if entry is None or not self._fresh(*entry):
+            return None
+        self._entries.move_to_end(ref)
+        self.memory_hits += 1
+        if entry[0] is None:
+            raise ParkNotFound(ref)
+        return entry[0]
+
+    def clear(self) -> None:
+        """Drop the in-memory entries, e.g. after a catalog import changed them."""
+        self._entries.clear()
+
+    async def get(
+        self,
+        park_ref: str,
+        db: AsyncSession,
+        client: httpx.AsyncClient,
+        catalog: ParkCatalog | None = None,
+    ) -> dict:
+        parks, _ = await self.get_many([park_ref], db, client, catalog)
+        if not parks:
+            raise ParkNotFound(park_ref)
+        return next(iter(parks.values()))
+
+    async def get_many(
+        self,
+        park_refs: list[str],
+        db: AsyncSession,
+        client: httpx.AsyncClient,
+        catalog: ParkCatalog | None = None,
+    ) -> tuple[dict[str, dict], dict[str, str]]:
+        """Look up several parks: memory, the offline catalog, one table query, then the API.
+
+        Returns (parks, errors) keyed by upper-cased reference. Only the
+        upstream requests run concurrently, bounded by the cache-wide
+        semaphore; a reference another lookup is already fetching waits
+        for that request instead of sending its own. db is only read, and its
+        transaction is ended before the first upstream request so no
+        connection is held across the network.
+        """
+        parks: dict[str, dict] = {}
+        errors: dict[str, str] = {}
+        pending = []
+        for ref in dict.fromkeys(r.upper() for r in park_refs):
+            try:
+                data = self.peek(ref)
+            except ParkNotFound:
+                errors[ref] = NOT_FOUND
+                continue
+            if data is not None:
+                parks[ref] = data
+            else:
+                pending.append(ref)
+        if not pending:
+            return parks, errors
+
+        if catalog is not None:
+            now = time.time()
+            for ref, data in (await catalog.get_many(db, pending)).items():
+                self.catalog_hits += 1
+                self._remember(ref, data, now)
+                parks[ref] = data
+            pending = [ref for ref in pending if ref not in parks]
+            if not pending:
+                await db.rollback()
+                return parks, errors
+
+        stale: dict[str, dict] = {}
+        rows = await db.execute(select(ParkCacheRow).where(ParkCacheRow.reference.in_(pending)))
+        for row in rows.scalars():
+            fetched_at = row.fetched_at.replace(tzinfo=timezone.utc).timestamp()
+            data = json.loads(row.data) if row.found else None
+            if not self._fresh(data, fetched_at):
+                if data is not None:
+                    stale[row.reference] = data
+                continue
+            self.db_hits += 1
+            self._remember(row.reference, data, fetched_at)
+            if data is None:
+                errors[row.reference] = NOT_FOUND
+            else:
+                parks[row.reference] = data
+
+        await db.rollback()
+
+        missing = [ref for ref in pending if ref not in parks and ref not in errors]
+        if not missing:
+            return parks, errors
+        self.misses += len(missing)
+        started = set()
+        tasks = []
+        for ref in missing:
+            task = self._inflight.get(ref)
+            if task is None:
+                task = self._start_fetch(ref, client)
+                started.add(ref)
+            else:
+                self.shared_fetches += 1
+            tasks.append(task)
+        # Shielded so a cancelled caller doesn't abort a request others await
+        fetched = await asyncio.gather(*(asyncio.shield(t) for t in tasks))
+        to_store = []
+        for ref, (ok, data) in zip(missing, fetched):
+            if ok:
+                if ref in started:
+                    to_store.append((ref, data))
+                if data is None:
+                    errors[ref] = NOT_FOUND
+                else:
+                    parks[ref] = data
+            elif ref in stale:
+                # Upstream trouble: fall back to the expired entry
+                parks[ref] = stale[ref]
+            else:
+                errors[ref] = UPSTREAM_ERROR
+        await self._store(to_store)
+        return parks, errors
+
+    def _start_fetch(self, ref: str, client: httpx.AsyncClient) -> asyncio.Task:
+        async def fetch():
+            async with self._semaphore:
+                ok, data = await self._fetch(ref, client)
+            if ok:
+                # Visible to peek() before the row is stored
+                self._remember(ref, data, time.time())
+            return ok, data
+
+        task = asyncio.create_task(fetch())
+        self._inflight[ref] = task
+        task.add_done_callback(lambda _: self._inflight.pop(ref, None))
+        return task
+
+    async def _fetch(self, ref: str, client: httpx.AsyncClient) -> tuple[bool, dict | None]:
+        """(True, data) for a definitive answer (None if unknown), (False, None) on failure."""
+        start = time.perf_counter()
+        try:
+            resp = await client.get(PARK_URL.format(ref=ref), timeout=5.0)
+        except httpx.HTTPError:
+            resp = None
+        elapsed = time.perf_counter() - start
+        self.upstream_requests += 1
+        self.upstream_seconds += elapsed
+        self.upstream_max_seconds = max(self.upstream_max_seconds, elapsed)
+
+        if resp is not None and resp.status_code == 200:
+            try:
+                data = resp.json()
+            except ValueError:  # truncated body, HTML error page
+                data = None
+            if isinstance(data, dict):
+                return True, data
+        elif resp is not None and resp.status_code == 404:
+            return True, None
+        # Never cache the failure itself
+        self.upstream_errors += 1
+        return False, None
+
+    async def _store(self, entries: list[tuple[str, dict | None]]) -> None:
+        if not entries:
+            return
+        now = datetime.now(timezone.utc)
+        rows = []
+        for ref, data in entries:
+            self._remember(ref, data, now.timestamp())
+            rows.append({
+                "reference": ref,
+                "found": data is not None,
+                "data": json.dumps(data) if data is not None else None,
+                "fetched_at": now.replace(tzinfo=None),
+            })
+        stmt = sqlite_insert(ParkCacheRow)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["reference"],
+            set_={c: stmt.excluded[c] for c in ("found", "data", "fetched_at")},
+        )
+        await self._write_queue.submit(lambda db: db.execute(stmt, rows))
+
+    def stats(self) -> dict:
+        requests = self.upstream_requests
+        return {
+            "size": len(self._entries),
+            "memory_hits": self.memory_hits,
+            "catalog_hits": self.catalog_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "shared_fetches": self.shared_fetches,
+            "upstream_requests": requests,
+            "upstream_errors": self.upstream_errors,
+            "upstream_avg_ms": round(self.upstream_seconds / requests * 1000, 2) if requests else None,
+            "upstream_max_ms": round(self.upstream_max_seconds * 1000, 2),
+        }
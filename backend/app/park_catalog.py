@@ -0,0 +1,189 @@
+"""Offline POTA park catalog: CSV import, prefix search and lookups.
+
+Import the catalog published at https://pota.app/all_parks_ext.csv with:
+
+    cd backend && python -m app.park_catalog all_parks_ext.csv
+"""
+
+import asyncio
+import csv
+import re
+import sys
+import time
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Park
+
+IMPORT_BATCH_SIZE = 2000
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def _float(value: str) -> float | None:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _int(value: str) -> int | None:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_catalog(lines: Iterable[str]) -> Iterator[dict]:
+    """Rows of the POTA catalog CSV as parks-table values; blank references are skipped."""
+    for row in csv.DictReader(lines):
+        reference = (row.get("reference") or "").strip().upper()
+        if not reference:
+            continue
+        yield {
+            "reference": reference,
+            "name": (row.get("name") or "").strip(),
+            "active": (row.get("active") or "1").strip() not in ("0", "false", "False"),
+            "entity_id": _int(row.get("entityId")),
+            "location_desc": (row.get("locationDesc") or "").strip(),
+            "latitude": _float(row.get("latitude")),
+            "longitude": _float(row.get("longitude")),
+            "grid": (row.get("grid") or "").strip(),
+        }
+
+
+def park_json(park: Park) -> dict:
+    """Catalog row in the same shape the POTA park API returns."""
+    return {
+        "reference": park.reference,
+        "name": park.name,
+        "active": int(park.active),
+        "entityId": park.entity_id,
+        "locationDesc": park.location_desc,
+        "latitude": park.latitude,
+        "longitude": park.longitude,
+        "grid": park.grid,
+    }
+
+
+async def import_catalog(db: AsyncSession, rows: Iterable[dict]) -> int:
+    """Upsert catalog rows in large batches; returns the number of rows written."""
+    stmt = sqlite_insert(Park)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["reference"],
+        set_={c.name: stmt.excluded[c.name] for c in Park.__table__.columns if c.name != "reference"},
+    )
+    count = 0
+    batch: list[dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            await db.execute(stmt, batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        await db.execute(stmt, batch)
+        count += len(batch)
+    await db.commit()
+    return count
+
+
+class ParkCatalog:
+    """In-memory prefix index over the parks table.
+
+    Matches are ranked in tiers: exact reference, reference prefix, name
+    prefix, then any word of the name. Each tier is a sorted array walked
+    from a bisect position, so a search touches only the rows it returns.
+    """
+
+    def __init__(self):
+        self.loaded = False
+        self._lock = asyncio.Lock()
+        self._build([])
+
+    def _build(self, parks: list[tuple[str, str, str]]) -> None:
+        # parks: (reference, name, location_desc); the index arrays hold
+        # (search text, position in parks) and are sorted by text
+        self._parks = sorted(parks)
+        self._refs = [(p[0], i) for i, p in enumerate(self._parks)]
+        self._names = sorted((p[1].lower(), i) for i, p in enumerate(self._parks))
+        # First words are already covered by the name-prefix tier
+        self._words = sorted(
+            (word, i)
+            for i, p in enumerate(self._parks)
+            for word in set(_WORD.findall(p[1].lower())[1:])
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self._parks)
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        if self.loaded:
+            return
+        async with self._lock:
+            if not self.loaded:
+                await self.reload(db)
+
+    async def reload(self, db: AsyncSession) -> None:
+        rows = await db.execute(select(Park.reference, Park.name, Park.location_desc))
+        self._build([tuple(r) for r in rows])
+        self.loaded = True
+
+    def search(self, query: str, limit: int = 20) -> list[dict]:
+        q = query.strip()
+        if not q:
+            return []
+        # An exact reference sorts first among its own prefix matches
+        tiers = (
+            (self._refs, q.upper()),
+            (self._names, q.lower()),
+            (self._words, q.lower()),
+        )
+        found: dict[int, None] = {}  # insertion-ordered set of positions
+        for array, prefix in tiers:
+            for j in range(bisect_left(array, (prefix,)), len(array)):
+                text, i = array[j]
+                if not text.startswith(prefix):
+                    break
+                found.setdefault(i, None)
+                if len(found) >= limit:
+                    break
+            if len(found) >= limit:
+                break
+        return [
+            {"reference": ref, "name": name, "locationDesc": location}
+            for ref, name, location in (self._parks[i] for i in found)
+        ]
+
+    async def get_many(self, db: AsyncSession, refs: list[str]) -> dict[str, dict]:
+        """Catalog entries for the given references, keyed by upper-cased reference."""
+        await self.ensure_loaded(db)
+        if not self.size:
+            return {}
+        wanted = list({r.upper() for r in refs})
+        rows = await db.execute(select(Park).where(Park.reference.in_(wanted)))
+        return {p.reference: park_json(p) for p in rows.scalars()}
+
+
+async def _main(path: str) -> None:
+    from app.database import async_session, engine
+    from app.migrations import run_migrations
+
+    await run_migrations(engine)
+    start = time.perf_counter()
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        async with async_session() as db:
+            count = await import_catalog(db, parse_catalog(f))
+    elapsed = time.perf_counter() - start
+    print(f"Imported {count} parks in {elapsed:.1f}s")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m app.park_catalog <all_parks_ext.csv>")
+    asyncio.run(_main(sys.argv[1]))
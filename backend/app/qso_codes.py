@@ -0,0 +1,47 @@
+"""Keeps the bands and modes lookup tables ahead of QSO writes.
+
+QSO.band and QSO.mode are stored as codes into these tables (see
+LookupCode in app.models). A QSO whose band or mode has no row yet would
+fail NOT NULL, so every write path adds new names first.
+"""
+
+from collections.abc import Iterable
+
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import BAND_NAMES, MODE_NAMES, Band, Mode
+from app.write_queue import WriteQueue
+
+
+async def add_names(db: AsyncSession, bands: Iterable[str], modes: Iterable[str]) -> None:
+    """Give any new band or mode names a code. The caller commits."""
+    for table, names in ((Band.__table__, set(bands)), (Mode.__table__, set(modes))):
+        if names:
+            await db.execute(
+                sqlite_insert(table).on_conflict_do_nothing(index_elements=["name"]),
+                [{"name": name} for name in names],
+            )
+
+
+class QSOCodes:
+    """Band and mode names known to have codes, so most single-QSO writes skip add_names.
+
+    Starts from the seeded names and learns the rest once their rows are
+    committed. Lookup rows are never deleted, so a known name stays valid
+    whatever other processes do.
+    """
+
+    def __init__(self, write_queue: WriteQueue):
+        self._write_queue = write_queue
+        self._bands = set(BAND_NAMES)
+        self._modes = set(MODE_NAMES)
+        self.added = 0
+
+    async def ensure(self, band: str, mode: str) -> None:
+        if band in self._bands and mode in self._modes:
+            return
+        await self._write_queue.submit(lambda db: add_names(db, [band], [mode]), savepoint=True)
+        self._bands.add(band)
+        self._modes.add(mode)
+        self.added += 1
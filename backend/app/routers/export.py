@@ -1,29 +1,168 @@
 import uuid
+import zlib
+from collections.abc import AsyncIterator
+from datetime import date, datetime, time, timedelta
+from typing import Optional
 
-from fastapi import APIRouter, Depends
-from fastapi.responses import Response
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
-from app.adif import generate_adif
-from app.database import get_db
+from app.database import get_read_db
+from app.etag import etag_matches, make_etag, not_modified, set_etag
+from app.exporters import EXPORT_COLUMNS, EXPORTERS, FORMAT_PATTERN, Exporter
+from app.models import QSO
 from app.routers.hunt_sessions import get_hunt_session_or_404
-from app.routers.settings import get_or_create_settings
+from app.settings_cache import SETTINGS_VERSION_KEY
 
 router = APIRouter(prefix="/api/hunt-sessions/{session_id}", tags=["export"])
+log_router = APIRouter(prefix="/api/export", tags=["export"])
+
+# Rows fetched per round trip, and so QSOs encoded per flushed chunk
+EXPORT_BATCH_SIZE = 1000
+
+GZIP_LEVEL = 6
+
+
+async def stream_export(
+    bind: AsyncEngine, stmt: Select, exporter: Exporter, operator_callsign: str
+) -> AsyncIterator[bytes]:
+    """Encode QSOs as they are read, one chunk per batch of rows.
+
+    The header goes out before the query runs, so time to first byte does
+    not depend on how many QSOs match. Uses its own session: the request's
+    session is closed before a streaming body is sent.
+    """
+    yield exporter.header(operator_callsign).encode()
+    writer = exporter.writer(operator_callsign)
+    async with AsyncSession(bind) as db:
+        result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            yield writer.records(rows).encode()
+    footer = exporter.footer(operator_callsign)
+    if footer:
+        yield footer.encode()
+
+
+async def gzip_stream(chunks: AsyncIterator[bytes], level: int = GZIP_LEVEL) -> AsyncIterator[bytes]:
+    """Gzip a byte stream on the fly, flushing after every chunk so it keeps streaming."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip framing
+    async for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether Accept-Encoding allows gzip; an explicit gzip entry overrides "*" (RFC 9110)."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, *params = part.split(";")
+        coding = coding.strip().lower()
+        if coding not in ("gzip", "*"):
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+    return weights.get("gzip", weights.get("*", 0.0)) > 0
+
+
+def _attachment(filename: str) -> dict[str, str]:
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
 
 
 @router.get("/export")
-async def export_adif(session_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
-    session = await get_hunt_session_or_404(session_id, db, load_qsos=True)
+async def export_session(
+    session_id: uuid.UUID,
+    request: Request,
+    format: str = Query("adif", pattern=FORMAT_PATTERN),
+    read_db: AsyncSession = Depends(get_read_db),
+):
+    """One session as ADIF (or ?format=), served from the export cache when nothing changed.
 
-    settings = await get_or_create_settings(db)
+    Versions are read before the query, so a QSO logged mid-render leaves
+    the stored copy under a key no later request will look up.
+    """
+    state = request.app.state
+    settings = await state.settings_cache.get()
+    key = (
+        str(session_id),
+        format,
+        state.session_versions.get(session_id),
+        state.settings_versions.get(SETTINGS_VERSION_KEY),
+    )
+    etag = make_etag("export", *key)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    exporter = EXPORTERS[format]
+    cached = state.export_cache.get(key)
+    if cached is not None:
+        filename, body = cached
+        response = Response(body, media_type=exporter.media_type, headers=_attachment(filename))
+        set_etag(response, etag)
+        return response
+
+    session = await get_hunt_session_or_404(session_id, read_db)
+    if etag_matches(request, etag, exists=True):
+        return not_modified(etag)
     operator_callsign = settings.operator_callsign
 
-    adif_content = generate_adif(operator_callsign, session.qsos)
-    filename = f"hunt_{session.session_date.strftime('%Y%m%d')}.adi"
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .where(QSO.hunt_session_id == session_id)
+        .order_by(QSO.timestamp, QSO.id)
+    )
+    filename = f"hunt_{session.session_date.strftime('%Y%m%d')}.{exporter.extension}"
 
-    return Response(
-        content=adif_content,
-        media_type="application/octet-stream",
-        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    body = stream_export(read_db.bind, stmt, exporter, operator_callsign)
+    response = StreamingResponse(
+        state.export_cache.tee(key, filename, body),
+        media_type=exporter.media_type,
+        headers=_attachment(filename),
     )
+    set_etag(response, etag)
+    return response
+
+
+@log_router.get("")
+async def export_log(
+    request: Request,
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to"),
+    format: str = Query("adif", pattern=FORMAT_PATTERN),
+    read_db: AsyncSession = Depends(get_read_db),
+):
+    """ADIF (or ?format=) for every QSO logged between two UTC dates (inclusive), or the whole log.
+
+    A range scan over ix_qsos_timestamp in timestamp order, so it neither
+    visits sessions one by one nor holds more than a batch of rows. The
+    body is gzipped on the fly when the client accepts it.
+    """
+    if start and end and start > end:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+
+    settings = await request.app.state.settings_cache.get()
+    operator_callsign = settings.operator_callsign
+
+    stmt = select(*EXPORT_COLUMNS)
+    if start:
+        stmt = stmt.where(QSO.timestamp >= datetime.combine(start, time()))
+    if end:
+        stmt = stmt.where(QSO.timestamp < datetime.combine(end + timedelta(days=1), time()))
+    stmt = stmt.order_by(QSO.timestamp, QSO.id)
+
+    span = "_".join(d.strftime("%Y%m%d") for d in (start, end) if d) or "all"
+    exporter = EXPORTERS[format]
+    headers = {**_attachment(f"pota_log_{span}.{exporter.extension}"), "Vary": "Accept-Encoding"}
+    body = stream_export(read_db.bind, stmt, exporter, operator_callsign)
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=exporter.media_type, headers=headers)
@@ -1,13 +1,17 @@
 import uuid
 from datetime import date, timezone, datetime
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import attributes, selectinload
+from sqlalchemy.orm import selectinload
 
-from app.database import get_db
-from app.models import HuntSession
+from app.database import get_read_db
+from app.etag import etag_matches, make_etag, not_modified, set_etag
+from app.models import QSO, HuntSession
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor
 from app.schemas import HuntSessionDetail, HuntSessionResponse
 
 router = APIRouter(prefix="/api/hunt-sessions", tags=["hunt-sessions"])
@@ -28,32 +32,107 @@ async def get_hunt_session_or_404(
     return session
 
 
+def session_etag(
+    request: Request, session_id: uuid.UUID | str, include_qsos: bool = True
+) -> str:
+    """ETag from the session's in-memory version, bumped by every QSO mutation."""
+    version = request.app.state.session_versions.get(session_id)
+    if include_qsos:
+        return make_etag("session", str(session_id), version)
+    return make_etag("session-header", str(session_id), version)
+
+
+async def _create_session(db: AsyncSession, session_date: date) -> None:
+    await db.execute(
+        sqlite_insert(HuntSession.__table__)
+        .values(session_date=session_date)
+        .on_conflict_do_nothing(index_elements=["session_date"])
+    )
+
+
 @router.get("/today", response_model=HuntSessionDetail)
-async def get_today_session(db: AsyncSession = Depends(get_db)):
+async def get_today_session(
+    request: Request, response: Response, db: AsyncSession = Depends(get_read_db)
+):
     today = datetime.now(timezone.utc).date()
-    result = await db.execute(
+    if request.headers.get("if-none-match"):
+        # Cheap id lookup first so a revalidation never loads the QSOs
+        session_id = (
+            await db.execute(select(HuntSession.id).where(HuntSession.session_date == today))
+        ).scalar_one_or_none()
+        if session_id is not None:
+            etag = session_etag(request, session_id)
+            if etag_matches(request, etag, exists=True):
+                return not_modified(etag)
+    stmt = (
         select(HuntSession)
         .options(selectinload(HuntSession.qsos))
         .where(HuntSession.session_date == today)
     )
-    session = result.scalar_one_or_none()
+    session = (await db.execute(stmt)).scalar_one_or_none()
     if not session:
-        session = HuntSession(session_date=today)
-        db.add(session)
-        await db.commit()
-        await db.refresh(session)
-        attributes.set_committed_value(session, "qsos", [])
+        # Another request may create it first; either way it exists after this
+        await request.app.state.write_queue.submit(lambda writer_db: _create_session(writer_db, today))
+        await db.rollback()  # end the read snapshot so the new row is visible
+        session = (await db.execute(stmt)).scalar_one()
+    set_etag(response, session_etag(request, session.id))
     return session
 
 
 @router.get("", response_model=list[HuntSessionResponse])
-async def list_sessions(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(
-        select(HuntSession).order_by(HuntSession.session_date.desc())
-    )
-    return result.scalars().all()
+async def list_sessions(
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Sessions, newest first; with `limit`, `X-Next-Cursor` continues the listing."""
+    stmt = select(HuntSession).order_by(HuntSession.session_date.desc())
+    if cursor:
+        try:
+            (before,) = decode_cursor(cursor, "sessions", (str,))
+            before = date.fromisoformat(before)
+        except (InvalidCursor, ValueError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=str(e) or "Malformed cursor")
+        stmt = stmt.where(HuntSession.session_date < before)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    sessions = (await db.execute(stmt)).scalars().all()
+    if limit is not None and len(sessions) > limit:
+        sessions = sessions[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            "sessions", (sessions[-1].session_date.isoformat(),)
+        )
+    return sessions
 
 
 @router.get("/{session_id}", response_model=HuntSessionDetail)
-async def get_session(session_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
-    return await get_hunt_session_or_404(session_id, db, load_qsos=True)
+async def get_session(
+    session_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    include_qsos: bool = True,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Session with its QSOs; `include_qsos=false` returns the header and qso_count only."""
+    # Sessions are never deleted, so a tag we issued for this id means it
+    # exists; answer revalidations without touching the database.
+    etag = session_etag(request, session_id, include_qsos)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    session = await get_hunt_session_or_404(session_id, db, load_qsos=include_qsos)
+    if etag_matches(request, etag, exists=True):
+        return not_modified(etag)
+    set_etag(response, etag)
+    if include_qsos:
+        return session
+    qso_count = (
+        await db.execute(select(func.count()).where(QSO.hunt_session_id == session_id))
+    ).scalar_one()
+    return HuntSessionDetail(
+        id=session.id,
+        session_date=session.session_date,
+        created_at=session.created_at,
+        qsos=None,
+        qso_count=qso_count,
+    )
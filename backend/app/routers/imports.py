@@ -0,0 +1,35 @@
+import logging
+
+from fastapi import APIRouter, Request
+
+from app.adif_import import ImportStats, import_adif
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/import", tags=["import"])
+
+
+@router.post("/adif")
+async def import_adif_log(request: Request):
+    """Import an ADIF (.adi) log sent as the raw request body.
+
+    The body is parsed as it streams in and QSOs are filed into the hunt
+    session for their UTC date. Returns counts and throughput.
+    """
+
+    def log_progress(stats: ImportStats) -> None:
+        logger.info("ADIF import progress: %s", stats.as_dict())
+
+    state = request.app.state
+    stats = ImportStats()
+    try:
+        await import_adif(state.write_queue, request.stream(), progress=log_progress, stats=stats)
+    finally:
+        # Batches already committed stay, even if the upload failed or went away
+        if stats.created:
+            for session_id in stats.session_ids:
+                state.session_versions.bump(session_id)
+            state.hunted_index.invalidate()
+            await state.worked_index.reload()
+            state.spot_stream.poke()
+    return stats.as_dict()
@@ -1,12 +1,56 @@
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db, get_read_db
+from app.park_cache import ParkNotFound
+from app.park_catalog import import_catalog, parse_catalog
+from app.schemas import ParkBatchRequest, ParkBatchResponse
 
 router = APIRouter(prefix="/api/parks", tags=["parks"])
 
 
+@router.get("/search")
+async def search_parks(
+    request: Request,
+    q: str = Query(min_length=1),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Autocomplete over the imported catalog by reference or name prefix."""
+    catalog = request.app.state.park_catalog
+    await catalog.ensure_loaded(db)
+    return catalog.search(q, limit)
+
+
+@router.post("/import")
+async def import_parks(request: Request, db: AsyncSession = Depends(get_db)):
+    """Replace catalog rows from a POTA all_parks_ext.csv request body."""
+    body = (await request.body()).decode("utf-8-sig")
+    count = await import_catalog(db, parse_catalog(body.splitlines()))
+    catalog = request.app.state.park_catalog
+    await catalog.reload(db)
+    # Remembered lookups may predate the imported rows
+    request.app.state.park_cache.clear()
+    return {"imported": count, "total": catalog.size}
+
+
+@router.post("/batch", response_model=ParkBatchResponse)
+async def get_parks_batch(
+    data: ParkBatchRequest, request: Request, db: AsyncSession = Depends(get_read_db)
+):
+    """Look up many parks in one round trip; failures are reported per reference."""
+    state = request.app.state
+    parks, errors = await state.park_cache.get_many(
+        data.references, db, state.http_client, state.park_catalog
+    )
+    return {"parks": parks, "errors": errors}
+
+
 @router.get("/{park_ref}")
-async def get_park(park_ref: str, request: Request):
-    client = request.app.state.http_client
-    resp = await client.get(f"https://api.pota.app/park/{park_ref}", timeout=5.0)
-    if resp.status_code != 200:
+async def get_park(park_ref: str, request: Request, db: AsyncSession = Depends(get_read_db)):
+    # Memory first, then the offline catalog; only unknown references hit the network
+    state = request.app.state
+    try:
+        return await state.park_cache.get(park_ref, db, state.http_client, state.park_catalog)
+    except ParkNotFound:
         raise HTTPException(status_code=404, detail="Park not found")
-    return resp.json()
@@ -1,55 +1,231 @@
 import uuid
+from datetime import datetime, timezone
+from functools import partial
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import bindparam, delete, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.models import QSO
+from app.database import get_read_db
+from app.models import QSO, QSO_UNIQUE_COLUMNS, HuntSession
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.qso_codes import add_names
 from app.routers.hunt_sessions import get_hunt_session_or_404
-from app.schemas import QSOCreate, QSOResponse
+from app.schemas import QSOBatchRequest, QSOBatchResponse, QSOCreate, QSOResponse
+from app.spot_history import utc_naive
 
 router = APIRouter(prefix="/api/hunt-sessions/{session_id}/qsos", tags=["qsos"])
 
 
+def _insert_qso_statement():
+    # Core insert on the table: an ORM insert with parameters would switch
+    # SQLAlchemy into its bulk path, which doesn't support INSERT ... SELECT
+    table = QSO.__table__
+    columns = table.c
+    source = select(*(bindparam(c.name, type_=c.type) for c in columns)).where(
+        select(HuntSession.id).where(HuntSession.id == bindparam("hunt_session_id")).exists()
+    )
+    return (
+        sqlite_insert(table)
+        .from_select([c.name for c in columns], source)
+        .on_conflict_do_nothing(index_elements=QSO_UNIQUE_COLUMNS)
+        .returning(*columns)
+    )
+
+
+# Built once so SQLAlchemy's compiled-statement cache is hit on every insert
+INSERT_QSO = _insert_qso_statement()
+INSERT_QSO_ROWS = (
+    sqlite_insert(QSO)
+    .on_conflict_do_nothing(index_elements=QSO_UNIQUE_COLUMNS)
+    .returning(QSO.id)
+)
+DELETE_QSO = (
+    delete(QSO.__table__)
+    .where(QSO.__table__.c.id == bindparam("qso_id"))
+    .where(QSO.__table__.c.hunt_session_id == bindparam("session_id"))
+    .returning(*QSO.__table__.c)
+)
+
+
+async def insert_qso(db: AsyncSession, session_id: uuid.UUID, data: QSOCreate) -> QSO | None:
+    """Insert one QSO in a single statement; None if the session is missing or it's a duplicate.
+
+    INSERT ... SELECT ... WHERE EXISTS checks the session, ON CONFLICT DO
+    NOTHING absorbs duplicates, and RETURNING reads the row back, so the
+    happy path is one round trip. The caller commits.
+    """
+    now = utc_naive(datetime.now(timezone.utc))
+    params = {
+        "id": str(uuid.uuid4()),
+        "hunt_session_id": str(session_id),
+        **data.model_dump(),
+        "timestamp": now,
+        "created_at": now,
+    }
+    row = (await db.execute(INSERT_QSO, params)).first()
+    return QSO(**row._mapping) if row is not None else None
+
+
+async def delete_qso_row(db: AsyncSession, session_id: uuid.UUID, qso_id: uuid.UUID) -> QSO | None:
+    """Delete one QSO and return it, or None if the session has no such QSO. The caller commits."""
+    row = (
+        await db.execute(DELETE_QSO, {"qso_id": str(qso_id), "session_id": str(session_id)})
+    ).first()
+    return QSO(**row._mapping) if row is not None else None
+
+
+async def qsos_inserted(state, qsos: list[QSO]) -> None:
+    """Bring versions and indexes in step with committed inserts; run by the write queue."""
+    if not qsos:
+        return
+    for session_id in {qso.hunt_session_id for qso in qsos}:
+        state.session_versions.bump(session_id)
+    for qso in qsos:
+        await state.hunted_index.record_insert(qso)
+        await state.worked_index.record_insert(qso)
+    state.spot_stream.poke()
+
+
+async def _qso_inserted(state, qso: QSO | None) -> None:
+    await qsos_inserted(state, [qso] if qso is not None else [])
+
+
+async def _qso_deleted(state, qso: QSO | None) -> None:
+    if qso is None:
+        return
+    state.session_versions.bump(qso.hunt_session_id)
+    await state.hunted_index.record_delete(qso)
+    await state.worked_index.record_delete(qso)
+    state.spot_stream.poke()
+
+
 @router.post("", response_model=QSOResponse, status_code=201)
 async def create_qso(
-    session_id: uuid.UUID, data: QSOCreate, db: AsyncSession = Depends(get_db)
+    session_id: uuid.UUID,
+    data: QSOCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
 ):
-    await get_hunt_session_or_404(session_id, db)
-    qso = QSO(hunt_session_id=session_id, **data.model_dump())
-    db.add(qso)
-    try:
-        await db.commit()
-    except IntegrityError:
-        await db.rollback()
+    """Log one QSO through the write queue, which group-commits concurrent writes."""
+    state = request.app.state
+    await state.qso_codes.ensure(data.band, data.mode)
+    qso = await state.write_queue.submit(
+        lambda writer_db: insert_qso(writer_db, session_id, data),
+        on_commit=partial(_qso_inserted, state),
+    )
+    if qso is None:
+        # Nothing inserted: tell a missing session apart from a duplicate
+        await get_hunt_session_or_404(session_id, db)
         raise HTTPException(
             status_code=409,
             detail=f"Already logged {data.callsign.upper()} at {data.park_reference.upper()} on {data.band}",
         )
-    await db.refresh(qso)
     return qso
 
 
-@router.get("", response_model=list[QSOResponse])
-async def list_qsos(session_id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+@router.post("/batch", response_model=QSOBatchResponse)
+async def create_qsos_batch(
+    session_id: uuid.UUID,
+    data: QSOBatchRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Log many QSOs in one queued write; already-logged rows are reported as duplicates."""
+    state = request.app.state
     await get_hunt_session_or_404(session_id, db)
-    result = await db.execute(
-        select(QSO).where(QSO.hunt_session_id == session_id).order_by(QSO.timestamp)
+    now = utc_naive(datetime.now(timezone.utc))
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "hunt_session_id": str(session_id),
+            **item.model_dump(exclude={"timestamp"}),
+            "timestamp": utc_naive(item.timestamp) if item.timestamp else now,
+            "created_at": now,
+        }
+        for item in data.qsos
+    ]
+    # Names commit on their own, so a failed insert never takes them along
+    bands = {row["band"] for row in rows}
+    modes = {row["mode"] for row in rows}
+    await state.write_queue.submit(lambda writer_db: add_names(writer_db, bands, modes), savepoint=True)
+
+    async def insert(writer_db: AsyncSession) -> set[str]:
+        # Conflicts with earlier rows, in the table or in this batch, are skipped
+        # rather than aborting the write; RETURNING tells us which landed.
+        result = await writer_db.execute(INSERT_QSO_ROWS, rows)
+        return set(result.scalars())
+
+    def created(ids: set[str]) -> list[QSO]:
+        return [QSO(**row) for row in rows if row["id"] in ids]
+
+    # insertmanyvalues may split the rows over several statements
+    created_ids = await state.write_queue.submit(
+        insert, savepoint=True, on_commit=lambda ids: qsos_inserted(state, created(ids))
     )
-    return result.scalars().all()
+    results = [
+        {"status": "created", "qso": QSO(**row)} if row["id"] in created_ids else {"status": "duplicate"}
+        for row in rows
+    ]
+    return {
+        "created": len(created_ids),
+        "duplicates": len(rows) - len(created_ids),
+        "results": results,
+    }
+
+
+@router.get("", response_model=list[QSOResponse])
+async def list_qsos(
+    session_id: uuid.UUID,
+    response: Response,
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """QSOs in logging order.
+
+    With `limit`, `X-Next-Cursor` holds the cursor for the next page. Pages
+    are keyed on (timestamp, id), so QSOs logged while paging never shift
+    or repeat rows that were already returned.
+    """
+    stmt = (
+        select(QSO)
+        .where(QSO.hunt_session_id == session_id)
+        .order_by(QSO.timestamp, QSO.id)
+    )
+    if cursor:
+        try:
+            timestamp, qso_id = decode_cursor(cursor, "qsos", (str, str))
+            after = (datetime.fromisoformat(timestamp), str(uuid.UUID(qso_id)))
+        except (InvalidCursor, ValueError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=str(e) or "Malformed cursor")
+        stmt = stmt.where(tuple_(QSO.timestamp, QSO.id) > after)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    qsos = (await db.execute(stmt)).scalars().all()
+    if not qsos:
+        await get_hunt_session_or_404(session_id, db)
+    if limit is not None and len(qsos) > limit:
+        qsos = qsos[:limit]
+        last = qsos[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(
+            "qsos", (last.timestamp.isoformat(), str(last.id))
+        )
+    return qsos
 
 
 @router.delete("/{qso_id}", status_code=204)
 async def delete_qso(
-    session_id: uuid.UUID, qso_id: uuid.UUID, db: AsyncSession = Depends(get_db)
+    session_id: uuid.UUID,
+    qso_id: uuid.UUID,
+    request: Request,
 ):
-    result = await db.execute(
-        select(QSO).where(QSO.id == qso_id, QSO.hunt_session_id == session_id)
+    state = request.app.state
+    qso = await state.write_queue.submit(
+        lambda writer_db: delete_qso_row(writer_db, session_id, qso_id),
+        on_commit=partial(_qso_deleted, state),
     )
-    qso = result.scalar_one_or_none()
-    if not qso:
+    if qso is None:
         raise HTTPException(status_code=404, detail="QSO not found")
-    await db.delete(qso)
-    await db.commit()
@@ -1,12 +1,8 @@
 import asyncio
 import xmlrpc.client
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.database import get_db
-from app.routers.settings import get_or_create_settings
 
 router = APIRouter(prefix="/api/radio", tags=["radio"])
 
@@ -16,8 +12,8 @@ class SetFrequencyRequest(BaseModel):
 
 
 @router.post("/set-frequency")
-async def set_frequency(data: SetFrequencyRequest, db: AsyncSession = Depends(get_db)):
-    settings = await get_or_create_settings(db)
+async def set_frequency(data: SetFrequencyRequest, request: Request):
+    settings = await request.app.state.settings_cache.get()
     host = settings.flrig_host
     port = settings.flrig_port
 
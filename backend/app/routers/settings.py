@@ -1,45 +1,43 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Request
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
 from app.models import Settings
 from app.schemas import SettingsCreate, SettingsResponse
 
 router = APIRouter(prefix="/api/settings", tags=["settings"])
 
 
-async def get_or_create_settings(db: AsyncSession) -> Settings:
-    result = await db.execute(select(Settings))
-    settings = result.scalar_one_or_none()
-    if not settings:
-        settings = Settings(operator_callsign="")
-        db.add(settings)
-        await db.commit()
-        await db.refresh(settings)
-    return settings
-
-
 @router.get("", response_model=SettingsResponse)
-async def get_settings(db: AsyncSession = Depends(get_db)):
-    return await get_or_create_settings(db)
+async def get_settings(request: Request):
+    return await request.app.state.settings_cache.get()
 
 
 @router.put("", response_model=SettingsResponse)
-async def update_settings(data: SettingsCreate, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Settings))
-    settings = result.scalar_one_or_none()
-    if not settings:
-        settings = Settings(
-            operator_callsign=data.operator_callsign,
-            flrig_host=data.flrig_host,
-            flrig_port=data.flrig_port,
-        )
-        db.add(settings)
-    else:
-        settings.operator_callsign = data.operator_callsign
-        settings.flrig_host = data.flrig_host
-        settings.flrig_port = data.flrig_port
-    await db.commit()
-    await db.refresh(settings)
-    return settings
+async def update_settings(data: SettingsCreate, request: Request):
+    settings_cache = request.app.state.settings_cache
+
+    async def save(db: AsyncSession) -> Settings:
+        result = await db.execute(select(Settings))
+        settings = result.scalar_one_or_none()
+        if not settings:
+            settings = Settings(
+                operator_callsign=data.operator_callsign,
+                flrig_host=data.flrig_host,
+                flrig_port=data.flrig_port,
+            )
+            db.add(settings)
+        else:
+            settings.operator_callsign = data.operator_callsign
+            settings.flrig_host = data.flrig_host
+            settings.flrig_port = data.flrig_port
+        await db.flush()
+        await db.refresh(settings)
+        return settings
+
+    async def write_through(settings: Settings) -> None:
+        # Exports and the radio read the snapshot, never the table
+        settings_cache.set(settings)
+
+    await request.app.state.write_queue.submit(save, savepoint=True, on_commit=write_through)
+    return await settings_cache.get()
@@ -1,82 +1,221 @@
-from datetime import datetime, timezone
+import asyncio
+from collections.abc import Callable, Set
+from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
-from app.database import get_db
-from app.models import HuntSession
+from app.bands import BAND_RANGES, khz_to_band  # noqa: F401 (re-exported)
+from app.database import get_db, get_read_db
+from app.etag import etag_matches, make_etag, not_modified, set_etag
+from app.hunted_index import HuntedKey
+from app.models import SpotHistory
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.schemas import SpotHistoryResponse
+from app.spot_cache import SpotFetchError
+from app.spot_history import utc_naive
+from app.spot_index import CURSOR_TYPES, SORT_KEYS
+from app.worked_index import rebuild_summary, worked_flags
 
 router = APIRouter(prefix="/api/spots", tags=["spots"])
 
-BAND_RANGES: list[tuple[float, float, str]] = [
-    (1800, 2000, "160m"),
-    (3500, 4000, "80m"),
-    (5330, 5406, "60m"),
-    (7000, 7300, "40m"),
-    (10100, 10150, "30m"),
-    (14000, 14350, "20m"),
-    (18068, 18168, "17m"),
-    (21000, 21450, "15m"),
-    (24890, 24990, "12m"),
-    (28000, 30000, "10m"),
-    (50000, 54000, "6m"),
-    (144000, 148000, "2m"),
-]
-
-
-def khz_to_band(khz: str) -> str:
-    try:
-        freq = float(khz)
-    except (ValueError, TypeError):
-        return ""
-    for low, high, band in BAND_RANGES:
-        if low <= freq < high:
-            return band
-    return ""
+KEEPALIVE_SECONDS = 20
+SORT_PATTERN = "^-?(" + "|".join(SORT_KEYS) + ")$"
+
+
+def _multi(values: Optional[list[str]]) -> list[str]:
+    """Accept repeated and comma-separated query values; "All" means no filter."""
+    out = []
+    for value in values or ():
+        out.extend(v for v in value.split(",") if v and v != "All")
+    return out
+
+
+def spot_filter(band: Optional[str], mode: Optional[str]) -> Callable[[dict], bool]:
+    band = band if band and band != "All" else None
+    mode = mode.upper() if mode and mode != "All" else None
+
+    def matches(spot: dict) -> bool:
+        if band and spot["band"] != band:
+            return False
+        if mode and spot.get("mode", "").upper() != mode:
+            return False
+        return True
+
+    return matches
+
+
+def spot_hunted_key(spot: dict) -> HuntedKey:
+    return (
+        spot.get("activator", "").upper(),
+        spot.get("reference", "").upper(),
+        spot["band"].upper(),
+    )
+
+
+def annotate_spots(
+    spots: list[dict], hunted: Set[HuntedKey], worked: dict[str, set[str]]
+) -> list[dict]:
+    # Annotate copies of each spot with hunted and "new one" flags; the snapshot is shared
+    return [
+        {
+            **spot,
+            "hunted": spot_hunted_key(spot) in hunted,
+            **worked_flags(
+                worked, spot.get("activator", ""), spot.get("reference", ""), spot["band"]
+            ),
+        }
+        for spot in spots
+    ]
+
+
+async def load_annotated_spots(app: FastAPI) -> list[dict]:
+    snapshot = await app.state.spot_cache.get(app.state.http_client)
+    return annotate_spots(
+        snapshot.spots,
+        await app.state.hunted_index.current(),
+        await app.state.worked_index.current(),
+    )
 
 
 @router.get("")
 async def get_active_spots(
     request: Request,
-    band: Optional[str] = Query(None),
-    mode: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    band: Optional[list[str]] = Query(None),
+    mode: Optional[list[str]] = Query(None),
+    sort: str = Query("frequency", pattern=SORT_PATTERN),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    fields: Optional[str] = Query(None),
 ):
-    client = request.app.state.http_client
-    resp = await client.get("https://api.pota.app/spot/activator", timeout=10.0)
-    if resp.status_code != 200:
+    """Filter, sort and page the cached spot snapshot.
+
+    `band`/`mode` may repeat or be comma-separated. `sort` is one of
+    frequency, time, park or hunted-last, prefixed with `-` for descending.
+    When more spots remain, `X-Next-Cursor` holds the cursor for the next page.
+    """
+    try:
+        snapshot = await request.app.state.spot_cache.get(request.app.state.http_client)
+    except SpotFetchError:
         raise HTTPException(status_code=502, detail="Failed to fetch spots")
-    spots = resp.json()
-
-    if band and band != "All":
-        spots = [s for s in spots if khz_to_band(s.get("frequency", "")) == band]
-    if mode and mode != "All":
-        spots = [s for s in spots if s.get("mode", "").upper() == mode.upper()]
-
-    # Build set of hunted (callsign, park, band) from today's QSOs
-    hunted: set[tuple[str, str, str]] = set()
-    today = datetime.now(timezone.utc).date()
-    result = await db.execute(
-        select(HuntSession)
-        .options(selectinload(HuntSession.qsos))
-        .where(HuntSession.session_date == today)
+    hunted_index = request.app.state.hunted_index
+    hunted = await hunted_index.current()
+    worked_index = request.app.state.worked_index
+    worked = await worked_index.current()
+
+    etag = make_etag(
+        "spots",
+        snapshot.version,
+        hunted_index.version,
+        worked_index.version,
+        sorted(request.query_params.multi_items()),
+    )
+    if etag_matches(request, etag, exists=True):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    index = snapshot.index
+    sort_key = sort.removeprefix("-")
+    try:
+        after = decode_cursor(cursor, sort, CURSOR_TYPES[sort_key]) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    allowed = index.filter(_multi(band), _multi(mode))
+    positions, next_key = index.page(
+        allowed,
+        sort_key,
+        descending=sort.startswith("-"),
+        cursor=after,
+        limit=limit,
+        hunted=lambda pos: spot_hunted_key(index.spots[pos]) in hunted,
     )
-    session = result.scalar_one_or_none()
-    if session:
-        for qso in session.qsos:
-            hunted.add((qso.callsign.upper(), qso.park_reference.upper(), qso.band.upper()))
-
-    # Annotate each spot with hunted flag
-    for spot in spots:
-        spot_band = khz_to_band(spot.get("frequency", "")).upper()
-        key = (
-            spot.get("activator", "").upper(),
-            spot.get("reference", "").upper(),
-            spot_band,
-        )
-        spot["hunted"] = key in hunted
+    response.headers["X-Total-Count"] = str(index.total(allowed))
+    if next_key is not None:
+        response.headers["X-Next-Cursor"] = encode_cursor(sort, next_key)
 
+    spots = annotate_spots([index.spots[pos] for pos in positions], hunted, worked)
+    if fields:
+        wanted = [f for f in fields.split(",") if f]
+        spots = [{f: s[f] for f in wanted if f in s} for s in spots]
     return spots
+
+
+@router.get("/history", response_model=list[SpotHistoryResponse])
+async def get_spot_history(
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    park: Optional[str] = Query(None),
+    activator: Optional[str] = Query(None),
+    band: Optional[str] = Query(None),
+    mode: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Recorded spots, newest first; each filter maps onto a (column, spot_time) index."""
+    stmt = select(SpotHistory)
+    if start:
+        stmt = stmt.where(SpotHistory.spot_time >= utc_naive(start))
+    if end:
+        stmt = stmt.where(SpotHistory.spot_time < utc_naive(end))
+    if park:
+        stmt = stmt.where(SpotHistory.reference == park.upper())
+    if activator:
+        stmt = stmt.where(SpotHistory.activator == activator.upper())
+    if band:
+        stmt = stmt.where(SpotHistory.band == band)
+    if mode:
+        stmt = stmt.where(SpotHistory.mode == mode.upper())
+    result = await db.execute(stmt.order_by(SpotHistory.spot_time.desc()).limit(limit))
+    return result.scalars().all()
+
+
+@router.get("/hunted/verify")
+async def verify_hunted_index(request: Request):
+    """Check the in-memory hunted index against today's QSOs in the database."""
+    return await request.app.state.hunted_index.verify()
+
+
+@router.get("/worked/verify")
+async def verify_worked_index(request: Request):
+    """Check the all-time worked index and summary table against the QSO log."""
+    return await request.app.state.worked_index.verify()
+
+
+@router.post("/worked/rebuild")
+async def rebuild_worked_index(request: Request, db: AsyncSession = Depends(get_db)):
+    """Recount worked_summary from the QSO log and reload the in-memory index."""
+    rows = await rebuild_summary(db)
+    await request.app.state.worked_index.reload()
+    return {"rows": rows}
+
+
+@router.get("/stream")
+async def stream_spots(
+    request: Request,
+    band: Optional[str] = Query(None),
+    mode: Optional[str] = Query(None),
+):
+    """Server-sent events: a `snapshot` on connect, then `diff` events."""
+    stream = request.app.state.spot_stream
+    sub = stream.subscribe(spot_filter(band, mode))
+
+    async def events():
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(sub.queue.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+        finally:
+            stream.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Request
+
+router = APIRouter(prefix="/api/stats", tags=["stats"])
+
+
+@router.get("")
+async def get_stats(request: Request):
+    state = request.app.state
+    return {
+        "spot_cache": state.spot_cache.stats(),
+        "park_cache": state.park_cache.stats(),
+        "export_cache": state.export_cache.stats(),
+        "hunted_index": state.hunted_index.stats(),
+        "worked_index": state.worked_index.stats(),
+        "spot_stream": {"subscribers": state.spot_stream.subscriber_count},
+        "spot_history": {"snapshots_recorded": state.spot_recorder.snapshots_recorded},
+        "write_queue": state.write_queue.stats(),
+        "settings_cache": state.settings_cache.stats(),
+    }
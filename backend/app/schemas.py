@@ -1,7 +1,8 @@
 import uuid
 from datetime import date, datetime, timezone
+from typing import Literal
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
 
 class HuntSessionResponse(BaseModel):
@@ -13,7 +14,15 @@ class HuntSessionResponse(BaseModel):
 
 
 class HuntSessionDetail(HuntSessionResponse):
-    qsos: list["QSOResponse"] = []
+    # None when the QSO list was not requested; qso_count is always filled
+    qsos: list["QSOResponse"] | None = []
+    qso_count: int | None = None
+
+    @model_validator(mode="after")
+    def count_qsos(self) -> "HuntSessionDetail":
+        if self.qso_count is None and self.qsos is not None:
+            self.qso_count = len(self.qsos)
+        return self
 
 
 class QSOCreate(BaseModel):
@@ -26,6 +35,15 @@ class QSOCreate(BaseModel):
     rst_received: str
 
 
+class QSOBatchItem(QSOCreate):
+    # Catch-up logging carries the original contact time; defaults to now
+    timestamp: datetime | None = None
+
+
+class QSOBatchRequest(BaseModel):
+    qsos: list[QSOBatchItem] = Field(min_length=1, max_length=1000)
+
+
 class QSOResponse(BaseModel):
     id: uuid.UUID
     hunt_session_id: uuid.UUID
@@ -49,6 +67,17 @@ class QSOResponse(BaseModel):
         return v
 
 
+class QSOBatchResult(BaseModel):
+    status: Literal["created", "duplicate"]
+    qso: QSOResponse | None = None
+
+
+class QSOBatchResponse(BaseModel):
+    created: int
+    duplicates: int
+    results: list[QSOBatchResult]
+
+
 class SettingsCreate(BaseModel):
     operator_callsign: str
     flrig_host: str = "localhost"
@@ -64,3 +93,31 @@ class SettingsResponse(BaseModel):
     updated_at: datetime
 
     model_config = {"from_attributes": True}
+
+
+class SpotHistoryResponse(BaseModel):
+    activator: str
+    reference: str
+    frequency: float
+    band: str
+    mode: str
+    spot_time: datetime
+    last_seen: datetime
+
+    model_config = {"from_attributes": True}
+
+    @field_validator("spot_time", "last_seen", mode="before")
+    @classmethod
+    def ensure_utc(cls, v: datetime) -> datetime:
+        if isinstance(v, datetime) and v.tzinfo is None:
+            return v.replace(tzinfo=timezone.utc)
+        return v
+
+
+class ParkBatchRequest(BaseModel):
+    references: list[str] = Field(min_length=1, max_length=200)
+
+
+class ParkBatchResponse(BaseModel):
+    parks: dict[str, dict]
+    errors: dict[str, str]
@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.etag import VersionCounter
+from app.models import Settings
+
+logger = logging.getLogger(__name__)
+
+# Longest another worker process's settings update can go unseen here
+SETTINGS_CACHE_TTL = float(os.environ.get("SETTINGS_CACHE_TTL", "30"))
+
+# Key in app.state.settings_versions; bumped whenever the settings change
+SETTINGS_VERSION_KEY = "settings"
+
+
+async def get_or_create_settings(db: AsyncSession) -> Settings:
+    result = await db.execute(select(Settings))
+    settings = result.scalar_one_or_none()
+    if not settings:
+        settings = Settings(operator_callsign="")
+        db.add(settings)
+        await db.commit()
+        await db.refresh(settings)
+    return settings
+
+
+@dataclass(frozen=True)
+class SettingsSnapshot:
+    id: str
+    operator_callsign: str
+    flrig_host: str
+    flrig_port: int
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def of(cls, row: Settings) -> "SettingsSnapshot":
+        return cls(
+            id=str(row.id),
+            operator_callsign=row.operator_callsign,
+            flrig_host=row.flrig_host,
+            flrig_port=row.flrig_port,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+        )
+
+
+class SettingsCache:
+    """The settings row as an immutable snapshot, so readers never touch the database.
+
+    update_settings writes through with set(). Other processes' updates are
+    picked up by re-reading the row once the snapshot is older than ttl:
+    the stale snapshot is served while one background read refreshes it.
+    Any change bumps the settings version, which keys cached exports.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        versions: VersionCounter,
+        ttl: float = SETTINGS_CACHE_TTL,
+    ):
+        self._session_factory = session_factory
+        self._versions = versions
+        self.ttl = ttl
+        self._snapshot: SettingsSnapshot | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh: asyncio.Task | None = None
+        self._writes = 0
+        self.hits = 0
+        self.loads = 0
+        self.changes_seen = 0
+
+    async def get(self) -> SettingsSnapshot:
+        if self._snapshot is None:
+            async with self._lock:
+                if self._snapshot is None:
+                    await self._load()
+        elif time.monotonic() - self._loaded_at >= self.ttl:
+            if self._refresh is None or self._refresh.done():
+                self._refresh = asyncio.create_task(self._reload())
+        self.hits += 1
+        return self._snapshot
+
+    def set(self, row: Settings) -> SettingsSnapshot:
+        """Replace the snapshot with a row this process just committed."""
+        self._writes += 1
+        self._store(SettingsSnapshot.of(row))
+        return self._snapshot
+
+    async def stop(self) -> None:
+        if self._refresh is not None:
+            self._refresh.cancel()
+            try:
+                await self._refresh
+            except asyncio.CancelledError:
+                pass
+            self._refresh = None
+
+    async def _load(self) -> None:
+        writes = self._writes
+        async with self._session_factory() as db:
+            row = await get_or_create_settings(db)
+        self.loads += 1
+        # A set() while we read has newer data than our SELECT may have seen
+        if self._writes == writes:
+            self._store(SettingsSnapshot.of(row))
+
+    async def _reload(self) -> None:
+        try:
+            async with self._lock:
+                await self._load()
+        except Exception:
+            # Keep serving the old snapshot; the next get() retries
+            logger.exception("Settings reload failed")
+
+    def _store(self, snapshot: SettingsSnapshot) -> None:
+        if self._snapshot is not None and snapshot != self._snapshot:
+            self.changes_seen += 1
+            self._versions.bump(SETTINGS_VERSION_KEY)
+        self._snapshot = snapshot
+        self._loaded_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._snapshot is not None,
+            "age_seconds": round(time.monotonic() - self._loaded_at, 1) if self._snapshot else None,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "loads": self.loads,
+            "changes_seen": self.changes_seen,
+        }
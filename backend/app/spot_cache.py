@@ -0,0 +1,162 @@
+import asyncio
+import itertools
+import os
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from functools import cached_property
+
+import httpx
+
+from app.bands import classify_khz
+from app.spot_index import SpotIndex
+
+SPOTS_URL = "https://api.pota.app/spot/activator"
+
+# Snapshots younger than the TTL are served as-is; older ones are served while
+# a background refresh runs, up to MAX_STALE seconds, after which callers wait.
+SPOT_CACHE_TTL = float(os.environ.get("SPOT_CACHE_TTL", "30"))
+SPOT_CACHE_MAX_STALE = float(os.environ.get("SPOT_CACHE_MAX_STALE", "300"))
+
+
+class SpotFetchError(Exception):
+    pass
+
+
+def with_bands(spots: list[dict]) -> list[dict]:
+    """Classify every spot once and attach its band to the payload."""
+    bands = classify_khz(s.get("frequency", "") for s in spots)
+    for spot, band in zip(spots, bands):
+        spot["band"] = band
+    return spots
+
+
+@dataclass(frozen=True)
+class SpotSnapshot:
+    spots: list[dict]
+    fetched_at: float
+    version: int = 0
+    # Upstream validators, replayed as If-None-Match / If-Modified-Since
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @cached_property
+    def index(self) -> SpotIndex:
+        return SpotIndex(self.spots)
+
+
+class SpotCache:
+    """Process-wide cache of the upstream activator spot list.
+
+    Concurrent callers share a single in-flight upstream request. Listeners
+    see every snapshot with new spots, whichever caller triggered the fetch.
+    """
+
+    def __init__(self, ttl: float = SPOT_CACHE_TTL, max_stale: float = SPOT_CACHE_MAX_STALE):
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self._snapshot: SpotSnapshot | None = None
+        self._refresh: asyncio.Task | None = None
+        self._versions = itertools.count(1)
+        self._listeners: list[Callable[[SpotSnapshot], None]] = []
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.not_modified = 0
+        self.errors = 0
+
+    async def get(self, client: httpx.AsyncClient) -> SpotSnapshot:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            age = time.monotonic() - snapshot.fetched_at
+            if age < self.ttl:
+                self.hits += 1
+                return snapshot
+            if age < self.max_stale:
+                self.stale_hits += 1
+                self._start_refresh(client)
+                return snapshot
+        self.misses += 1
+        # Shield the shared fetch so one disconnecting client can't cancel it
+        # for everybody else waiting on it.
+        return await asyncio.shield(self._start_refresh(client))
+
+    def _start_refresh(self, client: httpx.AsyncClient) -> asyncio.Task:
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.create_task(self._fetch(client))
+            self._refresh.add_done_callback(_consume_exception)
+        return self._refresh
+
+    async def _fetch(self, client: httpx.AsyncClient) -> SpotSnapshot:
+        self.refreshes += 1
+        previous = self._snapshot
+        headers = {}
+        if previous is not None:
+            if previous.etag:
+                headers["If-None-Match"] = previous.etag
+            if previous.last_modified:
+                headers["If-Modified-Since"] = previous.last_modified
+        try:
+            resp = await client.get(SPOTS_URL, headers=headers, timeout=10.0)
+        except httpx.HTTPError as e:
+            self.errors += 1
+            raise SpotFetchError(str(e)) from e
+        if resp.status_code == 304 and previous is not None:
+            self.not_modified += 1
+            snapshot = replace(previous, fetched_at=time.monotonic())
+            snapshot.__dict__["index"] = previous.index  # same spots, same index
+        elif resp.status_code != 200:
+            self.errors += 1
+            raise SpotFetchError(f"POTA API returned {resp.status_code}")
+        else:
+            try:
+                spots = resp.json()
+            except ValueError as e:  # truncated body, HTML error page
+                self.errors += 1
+                raise SpotFetchError(f"POTA API returned invalid JSON: {e}") from e
+            if not isinstance(spots, list):
+                self.errors += 1
+                raise SpotFetchError("POTA API returned something other than a spot list")
+            snapshot = SpotSnapshot(
+                spots=with_bands(spots),
+                fetched_at=time.monotonic(),
+                version=next(self._versions),
+                etag=resp.headers.get("etag"),
+                last_modified=resp.headers.get("last-modified"),
+            )
+        self._snapshot = snapshot
+        if previous is None or snapshot.version != previous.version:
+            for listener in list(self._listeners):
+                listener(snapshot)
+        return snapshot
+
+    def add_listener(self, listener: Callable[[SpotSnapshot], None]) -> None:
+        """Call listener with each new snapshot; it runs inline, so keep it cheap."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[SpotSnapshot], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def stats(self) -> dict:
+        age = None
+        if self._snapshot is not None:
+            age = round(time.monotonic() - self._snapshot.fetched_at, 3)
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "not_modified": self.not_modified,
+            "errors": self.errors,
+            "age_seconds": age,
+            "ttl_seconds": self.ttl,
+        }
+
+
+def _consume_exception(task: asyncio.Task) -> None:
+    # Background refreshes may fail with nobody awaiting them; the error is
+    # already counted, so just mark it retrieved.
+    if not task.cancelled():
+        task.exception()
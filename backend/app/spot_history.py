@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+from fastapi import FastAPI
+from sqlalchemy import delete, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import SpotHistory
+from app.spot_cache import SpotFetchError, SpotSnapshot
+
+logger = logging.getLogger(__name__)
+
+SPOT_HISTORY_ENABLED = os.environ.get("SPOT_HISTORY_ENABLED", "1") == "1"
+SPOT_HISTORY_INTERVAL = float(os.environ.get("SPOT_HISTORY_INTERVAL", "60"))
+# Snapshots held while waiting to be written; the oldest drop first
+SPOT_HISTORY_MAX_PENDING = int(os.environ.get("SPOT_HISTORY_MAX_PENDING", "100"))
+# 0 keeps history forever
+SPOT_HISTORY_RETENTION_DAYS = float(os.environ.get("SPOT_HISTORY_RETENTION_DAYS", "365"))
+SPOT_HISTORY_PRUNE_INTERVAL = float(os.environ.get("SPOT_HISTORY_PRUNE_INTERVAL", "3600"))
+# VACUUM after a prune removes at least this many rows; 0 never vacuums
+SPOT_HISTORY_VACUUM_THRESHOLD = int(os.environ.get("SPOT_HISTORY_VACUUM_THRESHOLD", "50000"))
+
+
+def utc_naive(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _history_row(spot: dict, seen_at: datetime) -> dict | None:
+    try:
+        frequency = float(spot["frequency"])
+        spot_time = utc_naive(datetime.fromisoformat(spot["spotTime"].replace("Z", "+00:00")))
+    except (KeyError, ValueError, TypeError, AttributeError):
+        return None
+    return {
+        "activator": spot.get("activator", "").upper(),
+        "reference": spot.get("reference", "").upper(),
+        "frequency": frequency,
+        "band": spot.get("band", ""),
+        "mode": spot.get("mode", "").upper(),
+        "spot_time": spot_time,
+        "last_seen": seen_at,
+    }
+
+
+async def record_spots(db: AsyncSession, spots: list[dict], seen_at: datetime | None = None) -> int:
+    """Append a snapshot; spots already stored only get their last_seen bumped."""
+    seen_at = utc_naive(seen_at or datetime.now(timezone.utc))
+    rows = [row for row in (_history_row(s, seen_at) for s in spots) if row is not None]
+    if not rows:
+        return 0
+    stmt = sqlite_insert(SpotHistory)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["activator", "reference", "frequency", "spot_time"],
+        set_={"last_seen": stmt.excluded.last_seen},
+    )
+    await db.execute(stmt, rows)
+    await db.commit()
+    return len(rows)
+
+
+async def prune_history(db: AsyncSession, retention_days: float) -> int:
+    cutoff = utc_naive(datetime.now(timezone.utc) - timedelta(days=retention_days))
+    result = await db.execute(delete(SpotHistory).where(SpotHistory.spot_time < cutoff))
+    await db.commit()
+    return result.rowcount
+
+
+class SpotRecorder:
+    """Background task that writes each new spot snapshot to spot_history.
+
+    While running it listens on the spot cache, so snapshots fetched for
+    other callers between ticks are recorded too; the tick itself only
+    keeps the cache refreshing when nobody else asks.
+    """
+
+    def __init__(
+        self,
+        app: FastAPI,
+        session_factory: async_sessionmaker[AsyncSession],
+        interval: float = SPOT_HISTORY_INTERVAL,
+        retention_days: float = SPOT_HISTORY_RETENTION_DAYS,
+    ):
+        self._app = app
+        self._session_factory = session_factory
+        self.interval = interval
+        self.retention_days = retention_days
+        self._task: asyncio.Task | None = None
+        self._pending: deque[SpotSnapshot] = deque(maxlen=SPOT_HISTORY_MAX_PENDING)
+        self._snapshot_ready = asyncio.Event()
+        self._recorded_version: int | None = None
+        self._last_prune: float | None = None
+        self.snapshots_recorded = 0
+
+    def start(self) -> None:
+        self._app.state.spot_cache.add_listener(self._on_snapshot)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._app.state.spot_cache.remove_listener(self._on_snapshot)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_snapshot(self, snapshot: SpotSnapshot) -> None:
+        self._queue(snapshot)
+        self._snapshot_ready.set()
+
+    def _queue(self, snapshot: SpotSnapshot) -> None:
+        last = self._pending[-1].version if self._pending else self._recorded_version
+        if last is None or snapshot.version > last:
+            self._pending.append(snapshot)
+
+    async def record_pending(self) -> None:
+        """Write queued snapshots oldest first; a failed one stays queued for the next try."""
+        while self._pending:
+            snapshot = self._pending[0]
+            async with self._session_factory() as db:
+                await record_spots(db, snapshot.spots)
+            self._pending.popleft()
+            self._recorded_version = snapshot.version
+            self.snapshots_recorded += 1
+
+    async def tick(self) -> None:
+        state = self._app.state
+        try:
+            snapshot = await state.spot_cache.get(state.http_client)
+        except SpotFetchError:
+            await self.record_pending()
+            return
+        self._queue(snapshot)
+        await self.record_pending()
+
+        now = time.monotonic()
+        if self.retention_days and (
+            self._last_prune is None or now - self._last_prune >= SPOT_HISTORY_PRUNE_INTERVAL
+        ):
+            self._last_prune = now
+            async with self._session_factory() as db:
+                pruned = await prune_history(db, self.retention_days)
+            if SPOT_HISTORY_VACUUM_THRESHOLD and pruned >= SPOT_HISTORY_VACUUM_THRESHOLD:
+                async with self._session_factory() as db:
+                    conn = await db.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+                    await conn.execute(text("VACUUM"))
+
+    async def _run(self) -> None:
+        while True:
+            self._snapshot_ready.clear()
+            try:
+                await self.tick()
+            except Exception:
+                logger.exception("Spot history recording failed")
+            # Until the next tick, record snapshots other callers fetch as they land
+            deadline = time.monotonic() + self.interval
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    await asyncio.wait_for(self._snapshot_ready.wait(), remaining)
+                except TimeoutError:
+                    break
+                self._snapshot_ready.clear()
+                try:
+                    await self.record_pending()
+                except Exception:
+                    logger.exception("Spot history recording failed")
@@ -0,0 +1,103 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Callable, Set
+
+from app.pagination import NUMBER
+
+SORT_KEYS = ("frequency", "time", "park", "hunted-last")
+# Types of each sort's key, for checking client cursors
+CURSOR_TYPES = {
+    "frequency": (NUMBER, str, int),
+    "time": (str, str, int),
+    "park": (str, NUMBER, str, int),
+    "hunted-last": (bool, NUMBER, str, int),
+}
+
+
+def _freq(spot: dict) -> float:
+    try:
+        return float(spot.get("frequency", ""))
+    except (ValueError, TypeError):
+        return float("inf")
+
+
+class SpotIndex:
+    """Band/mode postings and sort orders for one spot snapshot.
+
+    Built once per snapshot, then shared by every request that slices it.
+    Positions refer to the snapshot's spot list. Sort keys end with the
+    spotId so they are unique, which keeps keyset cursors stable when the
+    next snapshot adds or drops spots.
+    """
+
+    def __init__(self, spots: list[dict]):
+        self.spots = spots
+        self.by_band: dict[str, set[int]] = {}
+        self.by_mode: dict[str, set[int]] = {}
+        for pos, spot in enumerate(spots):
+            self.by_band.setdefault(spot.get("band", ""), set()).add(pos)
+            self.by_mode.setdefault(spot.get("mode", "").upper(), set()).add(pos)
+
+        def tail(s: dict) -> tuple:
+            return (s.get("activator", "").upper(), s.get("spotId") or 0)
+
+        self.keys: dict[str, list[tuple]] = {
+            "frequency": [(_freq(s), *tail(s)) for s in spots],
+            "time": [(s.get("spotTime", ""), *tail(s)) for s in spots],
+            "park": [(s.get("reference", "").upper(), _freq(s), *tail(s)) for s in spots],
+        }
+        self.order: dict[str, list[int]] = {}
+        self.rank: dict[str, list[int]] = {}
+        for name, keys in self.keys.items():
+            order = sorted(range(len(spots)), key=keys.__getitem__)
+            rank = [0] * len(spots)
+            for r, pos in enumerate(order):
+                rank[pos] = r
+            self.order[name] = order
+            self.rank[name] = rank
+
+    def filter(self, bands: list[str], modes: list[str]) -> set[int] | None:
+        """Positions matching any of the bands and any of the modes; None means all."""
+        allowed: set[int] | None = None
+        if bands:
+            allowed = set().union(*(self.by_band.get(b, ()) for b in bands))
+        if modes:
+            by_mode = set().union(*(self.by_mode.get(m.upper(), ()) for m in modes))
+            allowed = by_mode if allowed is None else allowed & by_mode
+        return allowed
+
+    def page(
+        self,
+        allowed: set[int] | None,
+        sort: str,
+        descending: bool,
+        cursor: tuple | None,
+        limit: int | None,
+        hunted: Callable[[int], bool] | None = None,
+    ) -> tuple[list[int], tuple | None]:
+        """One page of positions in sort order and the key to resume after it."""
+        base = "frequency" if sort == "hunted-last" else sort
+        if allowed is None:
+            ordered = self.order[base]
+        else:
+            ordered = sorted(allowed, key=self.rank[base].__getitem__)
+        keys = self.keys[base]
+        key: Callable[[int], tuple] = keys.__getitem__
+        if sort == "hunted-last":
+            # Stable partition keeps frequency order within each group
+            ordered = [p for p in ordered if not hunted(p)] + [p for p in ordered if hunted(p)]
+            key = lambda p: (hunted(p), *keys[p])  # noqa: E731
+
+        if descending:
+            end = len(ordered) if cursor is None else bisect_left(ordered, cursor, key=key)
+            window = ordered[:end][::-1]
+        else:
+            start = 0 if cursor is None else bisect_right(ordered, cursor, key=key)
+            window = ordered[start:]
+
+        if limit is None or len(window) <= limit:
+            return window, None
+        page = window[:limit]
+        return page, key(page[-1])
+
+    def total(self, allowed: Set[int] | None) -> int:
+        return len(self.spots) if allowed is None else len(allowed)
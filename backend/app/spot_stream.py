@@ -0,0 +1,145 @@
+import asyncio
+import json
+import logging
+import os
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+SPOT_STREAM_INTERVAL = float(os.environ.get("SPOT_STREAM_INTERVAL", "15"))
+SPOT_STREAM_QUEUE_SIZE = 100
+
+SpotKey = tuple[str, str, str]
+
+
+def spot_key(spot: dict) -> SpotKey:
+    return (
+        spot.get("activator", "").upper(),
+        spot.get("reference", "").upper(),
+        str(spot.get("frequency", "")),
+    )
+
+
+def _key_json(key: SpotKey) -> dict:
+    return {"activator": key[0], "reference": key[1], "frequency": key[2]}
+
+
+def format_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+class Subscriber:
+    def __init__(self, matches: Callable[[dict], bool]):
+        self.matches = matches
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize=SPOT_STREAM_QUEUE_SIZE)
+
+    def push(self, event: str, stream: "SpotStream") -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Client fell behind; drop the backlog and resync from scratch.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(stream.snapshot_event(self))
+
+    def diff_event(
+        self,
+        added: list[dict],
+        changed: list[tuple[dict, dict]],
+        removed: list[dict],
+    ) -> str | None:
+        out_added = [s for s in added if self.matches(s)]
+        out_changed = []
+        out_removed = [_key_json(spot_key(s)) for s in removed if self.matches(s)]
+        for old, new in changed:
+            was, now = self.matches(old), self.matches(new)
+            if was and now:
+                out_changed.append(new)
+            elif now:
+                out_added.append(new)
+            elif was:
+                out_removed.append(_key_json(spot_key(old)))
+        if not (out_added or out_changed or out_removed):
+            return None
+        return format_event(
+            "diff", {"added": out_added, "changed": out_changed, "removed": out_removed}
+        )
+
+
+class SpotStream:
+    """Shared upstream poller that pushes spot diffs to every subscriber.
+
+    The poller runs only while at least one client is subscribed.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], Awaitable[list[dict]]],
+        interval: float = SPOT_STREAM_INTERVAL,
+    ):
+        self._load = load
+        self.interval = interval
+        self._spots: dict[SpotKey, dict] = {}
+        self._loaded = False
+        self._subscribers: set[Subscriber] = set()
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, matches: Callable[[dict], bool]) -> Subscriber:
+        sub = Subscriber(matches)
+        self._subscribers.add(sub)
+        if self._loaded:
+            sub.push(self.snapshot_event(sub), self)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        self._subscribers.discard(sub)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def poke(self) -> None:
+        """Re-annotate and publish now instead of waiting for the next tick."""
+        self._wake.set()
+
+    def snapshot_event(self, sub: Subscriber) -> str:
+        spots = [s for s in self._spots.values() if sub.matches(s)]
+        return format_event("snapshot", {"spots": spots})
+
+    def publish(self, spots: list[dict]) -> None:
+        new = {spot_key(s): s for s in spots}
+        old = self._spots
+        added = [s for k, s in new.items() if k not in old]
+        removed = [s for k, s in old.items() if k not in new]
+        changed = [(old[k], s) for k, s in new.items() if k in old and old[k] != s]
+        self._spots = new
+
+        if not self._loaded:
+            self._loaded = True
+            for sub in self._subscribers:
+                sub.push(self.snapshot_event(sub), self)
+            return
+        if not (added or changed or removed):
+            return
+        for sub in self._subscribers:
+            event = sub.diff_event(added, changed, removed)
+            if event is not None:
+                sub.push(event, self)
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                self.publish(await self._load())
+            except Exception:
+                logger.exception("Spot stream refresh failed")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
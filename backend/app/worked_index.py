@@ -0,0 +1,180 @@
+"""All-time worked index: has a park, park+band or activator ever been logged?
+
+The worked_summary table is maintained by triggers on qsos. This module
+mirrors it in memory as three sets so spots can be flagged in O(1).
+
+    cd backend && python -m app.worked_index [--rebuild]
+"""
+
+import asyncio
+import sys
+
+from sqlalchemy import delete, select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import QSO, WorkedSummary
+
+KINDS = ("park", "park_band", "call")
+
+
+def worked_keys(callsign: str, park_reference: str, band: str) -> list[tuple[str, str]]:
+    """(kind, key) rows a QSO contributes; must match the v0008 trigger expressions."""
+    park = park_reference.upper()
+    return [("park", park), ("park_band", f"{park} {band.upper()}"), ("call", callsign.upper())]
+
+
+def worked_flags(worked: dict[str, set[str]], activator: str, reference: str, band: str) -> dict:
+    park = reference.upper()
+    return {
+        "new_park": park not in worked["park"],
+        "new_park_band": f"{park} {band.upper()}" not in worked["park_band"],
+        "new_call": activator.upper() not in worked["call"],
+    }
+
+
+# Recount straight from qsos, for rebuilds and consistency checks
+_RECOUNT = text(
+    """SELECT kind, key, COUNT(*) FROM (
+        SELECT 'park' AS kind, upper(park_reference) AS key FROM qsos
+        UNION ALL SELECT 'park_band', upper(park_reference) || ' ' || upper(bands.name)
+            FROM qsos JOIN bands ON bands.code = qsos.band
+        UNION ALL SELECT 'call', upper(callsign) FROM qsos
+    ) GROUP BY kind, key"""
+)
+
+
+async def _load(db: AsyncSession) -> dict[str, set[str]]:
+    worked: dict[str, set[str]] = {kind: set() for kind in KINDS}
+    for kind, key in await db.execute(select(WorkedSummary.kind, WorkedSummary.key)):
+        worked.setdefault(kind, set()).add(key)
+    return worked
+
+
+async def rebuild_summary(db: AsyncSession) -> int:
+    """Recompute worked_summary from qsos; returns the number of rows written."""
+    rows = [
+        {"kind": kind, "key": key, "qso_count": count}
+        for kind, key, count in await db.execute(_RECOUNT)
+    ]
+    await db.execute(delete(WorkedSummary))
+    if rows:
+        await db.execute(WorkedSummary.__table__.insert(), rows)
+    await db.commit()
+    return len(rows)
+
+
+class WorkedIndex:
+    """In-memory sets of everything ever worked, loaded once from worked_summary.
+
+    Inserts add keys (idempotent); deletes re-read the affected summary rows
+    after the trigger has run, so the sets never drift from the table however
+    writes interleave.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self._session_factory = session_factory
+        self._worked: dict[str, set[str]] | None = None
+        self._lock = asyncio.Lock()
+        self.loads = 0
+        # Bumped on every change; lets responses derived from the index be ETagged
+        self.version = 0
+
+    async def current(self) -> dict[str, set[str]]:
+        if self._worked is None:
+            async with self._lock:
+                if self._worked is None:
+                    await self._reload()
+        return self._worked
+
+    async def _reload(self) -> None:
+        async with self._session_factory() as db:
+            self._worked = await _load(db)
+        self.loads += 1
+        self.version += 1
+
+    async def reload(self) -> None:
+        async with self._lock:
+            await self._reload()
+
+    async def record_insert(self, qso: QSO) -> None:
+        async with self._lock:
+            if self._worked is None:
+                return
+            for kind, key in worked_keys(qso.callsign, qso.park_reference, qso.band):
+                self._worked[kind].add(key)
+            self.version += 1
+
+    async def record_delete(self, qso: QSO) -> None:
+        async with self._lock:
+            if self._worked is None:
+                return
+            keys = worked_keys(qso.callsign, qso.park_reference, qso.band)
+            async with self._session_factory() as db:
+                remaining = set(
+                    await db.execute(
+                        select(WorkedSummary.kind, WorkedSummary.key).where(
+                            tuple_(WorkedSummary.kind, WorkedSummary.key).in_(keys)
+                        )
+                    )
+                )
+            for kind, key in keys:
+                if (kind, key) not in remaining:
+                    self._worked[kind].discard(key)
+            self.version += 1
+
+    async def verify(self) -> dict:
+        """Compare memory, the summary table and a fresh count from qsos."""
+        worked = await self.current()
+        async with self._lock:
+            async with self._session_factory() as db:
+                table = {
+                    (kind, key): count
+                    for kind, key, count in await db.execute(
+                        select(WorkedSummary.kind, WorkedSummary.key, WorkedSummary.qso_count)
+                    )
+                }
+                expected = {(kind, key): count for kind, key, count in await db.execute(_RECOUNT)}
+            memory = {(kind, key) for kind, keys in worked.items() for key in keys}
+        table_drift = sorted(
+            k for k in table.keys() | expected.keys() if table.get(k) != expected.get(k)
+        )
+        memory_drift = sorted(memory ^ expected.keys())
+        return {
+            "size": {kind: len(worked[kind]) for kind in KINDS},
+            "consistent": not table_drift and not memory_drift,
+            "table_drift": [list(k) for k in table_drift],
+            "memory_drift": [list(k) for k in memory_drift],
+        }
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._worked is not None,
+            "size": {kind: len(self._worked[kind]) for kind in KINDS} if self._worked else None,
+            "loads": self.loads,
+        }
+
+
+async def _main(rebuild: bool) -> None:
+    from app.database import async_session, engine
+    from app.migrations import run_migrations
+
+    await run_migrations(engine)
+    index = WorkedIndex(async_session)
+    if rebuild:
+        async with async_session() as db:
+            count = await rebuild_summary(db)
+        print(f"Rebuilt worked_summary: {count} rows")
+    report = await index.verify()
+    print(f"Worked: {report['size']}  consistent: {report['consistent']}")
+    for name in ("table_drift", "memory_drift"):
+        if report[name]:
+            print(f"  {name}: {report[name][:20]}")
+    await engine.dispose()
+    if not report["consistent"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] not in ([], ["--rebuild"]):
+        sys.exit("usage: python -m app.worked_index [--rebuild]")
+    asyncio.run(_main(rebuild=sys.argv[1:] == ["--rebuild"]))
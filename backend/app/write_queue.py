@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# How long the writer keeps collecting after the first queued write
+WRITE_QUEUE_WINDOW_MS = float(os.environ.get("WRITE_QUEUE_WINDOW_MS", "2"))
+WRITE_QUEUE_MAX_BATCH = int(os.environ.get("WRITE_QUEUE_MAX_BATCH", "64"))
+
+Write = Callable[[AsyncSession], Awaitable[Any]]
+OnCommit = Callable[[Any], Awaitable[None]]
+
+
+class _Pending(NamedTuple):
+    write: Write
+    savepoint: bool
+    on_commit: OnCommit | None
+    future: asyncio.Future
+
+
+class WriteQueue:
+    """One background task that applies queued writes with group commit.
+
+    Writes arriving within the window share a transaction and a single
+    COMMIT; each caller still gets its own write's result or exception.
+    A single-statement write needs no more: SQLite rolls back just the
+    failing statement, so the rest of the batch is untouched. A write that
+    issues several statements must be submitted with savepoint=True; it
+    then runs inside its own SAVEPOINT and a failure undoes all of it.
+    Savepoints cost two extra round trips, so the single-statement hot
+    path goes without.
+
+    on_commit(result) runs in the writer once the write has committed,
+    whether or not its caller is still waiting, and before the caller is
+    answered. In-memory state derived from the data (indexes, versions)
+    belongs there: a cancelled request must not leave it behind the
+    database. The task starts on first use.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        window_ms: float = WRITE_QUEUE_WINDOW_MS,
+        max_batch: int = WRITE_QUEUE_MAX_BATCH,
+    ):
+        self._session_factory = session_factory
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._queue: asyncio.Queue[_Pending] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+        self.batches = 0
+        self.writes = 0
+        self.max_batch_size = 0
+        self.errors = 0
+        self.commit_seconds = 0.0
+        self.commit_max_seconds = 0.0
+
+    async def submit(
+        self, write: Write, savepoint: bool = False, on_commit: OnCommit | None = None
+    ) -> Any:
+        """Queue write(db) and wait until the transaction holding it commits."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_Pending(write, savepoint, on_commit, future))
+        return await future
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        while not self._queue.empty():
+            future = self._queue.get_nowait().future
+            if not future.done():
+                future.set_exception(RuntimeError("Write queue stopped"))
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._apply(batch)
+            except Exception as e:
+                logger.exception("Write batch failed")
+                self.errors += len(batch)
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+
+    async def _apply(self, batch: list[_Pending]) -> None:
+        outcomes: list[tuple[_Pending, Any, BaseException | None]] = []
+        async with self._session_factory() as db:
+            for pending in batch:
+                try:
+                    if pending.savepoint:
+                        async with db.begin_nested():
+                            result = await pending.write(db)
+                    else:
+                        result = await pending.write(db)
+                    outcomes.append((pending, result, None))
+                except Exception as e:
+                    self.errors += 1
+                    outcomes.append((pending, None, e))
+            start = time.perf_counter()
+            await db.commit()
+            elapsed = time.perf_counter() - start
+
+        self.batches += 1
+        self.writes += len(batch)
+        self.max_batch_size = max(self.max_batch_size, len(batch))
+        self.commit_seconds += elapsed
+        self.commit_max_seconds = max(self.commit_max_seconds, elapsed)
+        for pending, result, error in outcomes:
+            if error is None and pending.on_commit is not None:
+                try:
+                    await pending.on_commit(result)
+                except Exception:
+                    # The write itself committed; report that, not this
+                    logger.exception("Write on_commit failed")
+            future = pending.future
+            if future.done():  # the request went away
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        batches = self.batches
+        return {
+            "batches": batches,
+            "writes": self.writes,
+            "avg_batch_size": round(self.writes / batches, 2) if batches else None,
+            "max_batch_size": self.max_batch_size,
+            "errors": self.errors,
+            "commit_avg_ms": round(self.commit_seconds / batches * 1000, 3) if batches else None,
+            "commit_max_ms": round(self.commit_max_seconds * 1000, 3),
+        }
@@ -0,0 +1,75 @@
+"""ADIF record encoding throughput, field-by-field encoder vs AdifEncoder.
+
+    cd backend && python -m benchmarks.bench_adif_encode [n_qsos]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.adif import AdifEncoder, _adif_field
+
+REPEATS = 3
+
+
+def legacy_records(operator_callsign: str, qsos: list) -> str:
+    """The encoder before AdifEncoder: eleven _adif_field calls and two strftime per QSO."""
+    out = []
+    for qso in qsos:
+        record = []
+        record.append(_adif_field("STATION_CALLSIGN", operator_callsign.upper()))
+        record.append(_adif_field("CALL", qso.callsign.upper()))
+        record.append(_adif_field("SIG", "POTA"))
+        record.append(_adif_field("SIG_INFO", qso.park_reference.upper()))
+        record.append(_adif_field("QSO_DATE", qso.timestamp.strftime("%Y%m%d")))
+        record.append(_adif_field("TIME_ON", qso.timestamp.strftime("%H%M%S")))
+        record.append(_adif_field("BAND", qso.band.lower()))
+        record.append(_adif_field("FREQ", f"{qso.frequency:.4f}"))
+        record.append(_adif_field("MODE", qso.mode.upper()))
+        record.append(_adif_field("RST_SENT", qso.rst_sent))
+        record.append(_adif_field("RST_RCVD", qso.rst_received))
+        record.append("<EOR>")
+        out.append("\n" + " ".join(record) + "\n")
+    return "".join(out)
+
+
+def synthetic_qsos(n: int) -> list:
+    start = datetime(2024, 1, 1)
+    return [
+        SimpleNamespace(
+            callsign=f"w{i % 10}x{i:06d}",
+            park_reference=f"k-{i % 10000:04d}",
+            timestamp=start + timedelta(seconds=37 * i),
+            band="20M",
+            frequency=14.074 + (i % 50) / 1000,
+            mode="ft8",
+            rst_sent="-10",
+            rst_received="-12",
+        )
+        for i in range(n)
+    ]
+
+
+def best_of(fn, *args) -> tuple[float, str]:
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, out
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    qsos = synthetic_qsos(n)
+    old_s, old = best_of(legacy_records, "kd2abc", qsos)
+    new_s, new = best_of(AdifEncoder("kd2abc").records, qsos)
+    assert new == old, "encoders disagree"
+    print(f"{n} QSOs, {len(new) / 1e6:.1f} MB of ADIF, best of {REPEATS}")
+    print(f"  legacy      {old_s:6.3f} s  {n / old_s:10,.0f} rec/s")
+    print(f"  AdifEncoder {new_s:6.3f} s  {n / new_s:10,.0f} rec/s  ({old_s / new_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
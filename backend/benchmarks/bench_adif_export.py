@@ -0,0 +1,99 @@
+"""ADIF export time to first byte, total time and peak memory by session size.
+
+Time to first byte and peak traced memory should stay flat as the session
+grows, since rows are encoded and flushed one batch at a time.
+
+    cd backend && python -m benchmarks.bench_adif_export [n_qsos ...]
+"""
+
+import asyncio
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select
+
+from app.models import QSO, HuntSession
+from app.exporters import EXPORT_COLUMNS, EXPORTERS
+from app.routers.export import stream_export
+from benchmarks.harness import bench_database
+
+SEED_BATCH_SIZE = 10_000
+
+
+async def seed(session_factory, n: int) -> str:
+    session_id = str(uuid.uuid4())
+    start = datetime(2024, 6, 1, 12, 0)
+    async with session_factory() as db:
+        await db.execute(
+            HuntSession.__table__.insert(),
+            [{"id": session_id, "session_date": date(2024, 6, 1), "created_at": start}],
+        )
+        for offset in range(0, n, SEED_BATCH_SIZE):
+            await db.execute(
+                QSO.__table__.insert(),
+                [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "hunt_session_id": session_id,
+                        "park_reference": f"K-{i % 500:04d}",
+                        "callsign": f"W{i}XYZ",
+                        "frequency": 14.074,
+                        "band": "20m",
+                        "mode": "FT8",
+                        "rst_sent": "59",
+                        "rst_received": "59",
+                        "timestamp": start + timedelta(seconds=i),
+                        "created_at": start,
+                    }
+                    for i in range(offset, min(offset + SEED_BATCH_SIZE, n))
+                ],
+            )
+        await db.commit()
+    return session_id
+
+
+async def _export(bind, session_id: str, trace: bool) -> tuple[float, float, int, int]:
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .where(QSO.hunt_session_id == session_id)
+        .order_by(QSO.timestamp, QSO.id)
+    )
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    ttfb = None
+    size = 0
+    async for chunk in stream_export(bind, stmt, EXPORTERS["adif"], "N0CALL"):
+        if ttfb is None:
+            ttfb = time.perf_counter() - start
+        size += len(chunk)
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    tracemalloc.stop()
+    return ttfb, total, size, peak
+
+
+async def run(n: int) -> None:
+    async with bench_database() as session_factory:
+        session_id = await seed(session_factory, n)
+        bind = session_factory.kw["bind"]
+        # tracemalloc slows everything down, so time and measure separately
+        ttfb, total, size, _ = await _export(bind, session_id, trace=False)
+        _, _, _, peak = await _export(bind, session_id, trace=True)
+    print(
+        f"  {n:8d} QSOs {size / 1e6:6.1f} MB  first byte {ttfb * 1000:6.2f} ms"
+        f"  total {total:6.2f} s  peak {peak / 1e6:6.2f} MB"
+    )
+
+
+async def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [20, 20_000, 200_000]
+    for n in sizes:
+        await run(n)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
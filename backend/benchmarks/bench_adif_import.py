@@ -0,0 +1,80 @@
+"""ADIF import throughput and peak memory for growing log sizes.
+
+Peak traced memory should stay roughly constant as the file grows, since
+only one batch of rows is held at a time.
+
+    cd backend && python -m benchmarks.bench_adif_import [n_records ...]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+
+from app.adif import _adif_field
+from app.adif_import import import_adif, read_file
+from app.write_queue import WriteQueue
+from benchmarks.harness import bench_database
+
+BANDS = [("20m", 14.074), ("40m", 7.074), ("15m", 21.074), ("10m", 28.074)]
+
+
+def write_log(path: str, n: int) -> None:
+    rng = random.Random(7)
+    with open(path, "w") as f:
+        f.write(_adif_field("ADIF_VER", "3.1.4") + "<EOH>\n")
+        for i in range(n):
+            band, freq = rng.choice(BANDS)
+            day = 1 + i // 200  # ~200 contacts per day
+            fields = [
+                ("CALL", f"W{i % 10}X{i:06d}"),
+                ("QSO_DATE", f"{2000 + day // 365:04d}{1 + day % 365 // 31 % 12:02d}{1 + day % 28:02d}"),
+                ("TIME_ON", f"{i % 24:02d}{i % 60:02d}00"),
+                ("BAND", band),
+                ("FREQ", f"{freq:.4f}"),
+                ("MODE", "FT8"),
+                ("RST_SENT", "-10"),
+                ("RST_RCVD", "-12"),
+                ("SIG", "POTA"),
+                ("SIG_INFO", f"K-{rng.randrange(10000):04d}"),
+            ]
+            f.write(" ".join(_adif_field(k, v) for k, v in fields) + " <EOR>\n")
+
+
+async def _import(path: str, trace: bool) -> tuple[dict, int]:
+    async with bench_database() as session_factory:
+        write_queue = WriteQueue(session_factory)
+        if trace:
+            tracemalloc.start()
+        stats = await import_adif(write_queue, read_file(path))
+        peak = tracemalloc.get_traced_memory()[1] if trace else 0
+        tracemalloc.stop()
+        await write_queue.stop()
+    return stats.as_dict(), peak
+
+
+async def run(n: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "log.adi")
+        write_log(path, n)
+        size_mb = os.path.getsize(path) / 1e6
+        # tracemalloc slows everything down, so time and measure separately
+        s, _ = await _import(path, trace=False)
+        _, peak = await _import(path, trace=True)
+    print(
+        f"  {n:8d} records {size_mb:6.1f} MB  {s['elapsed_seconds']:7.2f} s"
+        f"  {s['records_per_second']:7d} rec/s  peak {peak / 1e6:6.1f} MB"
+        f"  ({s['created']} new, {s['duplicates']} duplicate)"
+    )
+
+
+async def main() -> None:
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000]
+    for n in sizes:
+        await run(n)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,68 @@
+"""Band classification microbenchmark.
+
+Compares the original per-spot linear scan (called twice per spot, as the
+spots route used to) against classify_khz() over one batch.
+
+    cd backend && python -m benchmarks.bench_bands [n_spots]
+"""
+
+import random
+import sys
+import timeit
+
+from app import bands
+from app.bands import BAND_RANGES, classify_khz
+
+
+def legacy_khz_to_band(khz: str) -> str:
+    try:
+        freq = float(khz)
+    except (ValueError, TypeError):
+        return ""
+    for low, high, band in BAND_RANGES:
+        if low <= freq < high:
+            return band
+    return ""
+
+
+def synthetic_frequencies(n: int) -> list[str]:
+    rng = random.Random(42)
+    freqs = []
+    for _ in range(n):
+        low, high, _ = rng.choice(BAND_RANGES)
+        freqs.append(f"{rng.uniform(low, high):.1f}")
+    return freqs
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    freqs = synthetic_frequencies(n)
+    assert classify_khz(freqs) == [legacy_khz_to_band(f) for f in freqs]
+
+    def legacy():
+        for f in freqs:
+            legacy_khz_to_band(f)  # band filter
+            legacy_khz_to_band(f)  # hunted key
+
+    def bisect_batch():
+        saved, bands.np = bands.np, None
+        try:
+            classify_khz(freqs)
+        finally:
+            bands.np = saved
+
+    cases = [("legacy linear scan x2", legacy), ("bisect batch", bisect_batch)]
+    if bands.np is not None:
+        cases.append(("numpy batch", lambda: classify_khz(freqs)))
+
+    print(f"{n} spots")
+    baseline = None
+    for name, fn in cases:
+        runs = 20
+        best = min(timeit.repeat(fn, number=runs, repeat=5)) / runs
+        baseline = baseline or best
+        print(f"  {name:24s} {best * 1e3:8.3f} ms   {baseline / best:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
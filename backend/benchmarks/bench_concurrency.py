@@ -0,0 +1,153 @@
+"""QSO insert latency while exports and spot annotation read the same database.
+
+Compares a single default engine (rollback journal, one pool for
+everything) with the performance profile from app.database (WAL, pragmas,
+one writer connection and a read-only pool). Readers run in separate
+processes, like extra workers or a second client, so the numbers show
+database lock contention rather than event loop scheduling: exporters
+stream a large session over and over, annotators reload the hunted and
+worked indexes and annotate a spot list, and QSOs are logged one request
+at a time through the API meanwhile.
+
+    cd backend && python -m benchmarks.bench_concurrency [n_inserts] [session_qsos]
+"""
+
+import asyncio
+import multiprocessing as mp
+import statistics
+import sys
+import time
+
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import create_engines
+from app.exporters import EXPORT_COLUMNS, EXPORTERS
+from app.hunted_index import HuntedIndex
+from app.models import QSO
+from app.routers.export import stream_export
+from app.routers.spots import annotate_spots
+from app.spot_cache import with_bands
+from app.worked_index import WorkedIndex
+from benchmarks.harness import bench_client, bench_engines, qso_payloads
+
+EXPORTERS_PROCESSES = 2
+ANNOTATOR_PROCESSES = 2
+N_SPOTS = 500
+
+
+def fake_spots(n: int) -> list[dict]:
+    return with_bands([
+        {
+            "spotId": i,
+            "activator": f"K{i}ABC",
+            "reference": f"K-{i % 500:04d}",
+            "frequency": f"{14074 + i % 200}",
+            "mode": "FT8",
+            "spotTime": "2025-06-15T18:30:00",
+        }
+        for i in range(n)
+    ])
+
+
+def _reader_engine(url: str, profile: bool):
+    return create_engines(url)[1] if profile else create_async_engine(url)
+
+
+def _bump(counter) -> None:
+    with counter.get_lock():
+        counter.value += 1
+
+
+async def _export_once(engine, spots) -> None:
+    stmt = select(*EXPORT_COLUMNS).order_by(QSO.timestamp, QSO.id)
+    async for _ in stream_export(engine, stmt, EXPORTERS["adif"], "N0CALL"):
+        pass
+
+
+async def _annotate_once(engine, spots) -> None:
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    hunted, worked = HuntedIndex(factory), WorkedIndex(factory)
+    annotate_spots(spots, await hunted.current(), await worked.current())
+
+
+async def _read_loop(read_once, url: str, profile: bool, stop, done, failed) -> None:
+    engine = _reader_engine(url, profile)
+    spots = fake_spots(N_SPOTS)
+    while not stop.is_set():
+        try:
+            await read_once(engine, spots)
+            _bump(done)
+        except OperationalError:  # "database is locked"
+            _bump(failed)
+    await engine.dispose()
+
+
+def _reader(*args) -> None:
+    asyncio.run(_read_loop(*args))
+
+
+async def run(profile: bool, n: int, session_qsos: int) -> None:
+    ctx = mp.get_context("spawn")
+    stop = ctx.Event()
+    exports, annotations, read_errors = ctx.Value("i", 0), ctx.Value("i", 0), ctx.Value("i", 0)
+    async with bench_engines(profile) as (session_factory, read_session_factory):
+        url = session_factory.kw["bind"].url.render_as_string(hide_password=False)
+        async with bench_client(session_factory, read_session_factory) as client:
+            sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+            payloads = qso_payloads(session_qsos, prefix="S")
+            for i in range(0, session_qsos, 1000):
+                await client.post(f"/api/hunt-sessions/{sid}/qsos/batch", json={"qsos": payloads[i:i + 1000]})
+
+            readers = [
+                ctx.Process(target=_reader, args=(_export_once, url, profile, stop, exports, read_errors))
+                for _ in range(EXPORTERS_PROCESSES)
+            ] + [
+                ctx.Process(target=_reader, args=(_annotate_once, url, profile, stop, annotations, read_errors))
+                for _ in range(ANNOTATOR_PROCESSES)
+            ]
+            for p in readers:
+                p.start()
+            while exports.value + read_errors.value == 0:  # wait until the readers are up
+                await asyncio.sleep(0.05)
+            exports.value = annotations.value = read_errors.value = 0
+
+            latencies = []
+            errors = 0
+            started = time.perf_counter()
+            for payload in qso_payloads(n, prefix="N"):
+                start = time.perf_counter()
+                resp = await client.post(f"/api/hunt-sessions/{sid}/qsos", json=payload)
+                latencies.append(time.perf_counter() - start)
+                errors += resp.status_code != 201
+            elapsed = time.perf_counter() - started
+            stop.set()
+            for p in readers:
+                p.join()
+
+    q = statistics.quantiles(latencies, n=100)
+    label = "WAL + reader/writer pools" if profile else "default single engine"
+    print(
+        f"  {label:26s} p50 {q[49] * 1e3:7.2f} ms  p95 {q[94] * 1e3:7.2f} ms"
+        f"  max {max(latencies) * 1e3:8.2f} ms  errors {errors}"
+    )
+    print(
+        f"  {'':26s} {exports.value / elapsed:.1f} exports/s, {annotations.value / elapsed:.1f}"
+        f" annotations/s, {read_errors.value} reads failed with database is locked"
+    )
+
+
+async def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    session_qsos = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    print(
+        f"{n} QSO inserts; {EXPORTERS_PROCESSES} export and {ANNOTATOR_PROCESSES} annotation"
+        f" processes over {session_qsos} logged QSOs"
+    )
+    for profile in (False, True):
+        await run(profile, n, session_qsos)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,64 @@
+"""Record throughput of every export writer over the same synthetic rows.
+
+Rows are named tuples, which like SQLAlchemy rows support both positional
+unpacking and attribute access, and are fed in EXPORT_BATCH_SIZE batches
+the way the streaming export hands them over.
+
+    cd backend && python -m benchmarks.bench_exporters [n_qsos]
+"""
+
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from app.exporters import EXPORT_COLUMNS, EXPORTERS
+from app.routers.export import EXPORT_BATCH_SIZE
+
+REPEATS = 3
+
+Row = namedtuple("Row", [c.key for c in EXPORT_COLUMNS])
+MODES = ["FT8", "SSB", "CW", "FT4"]
+
+
+def synthetic_rows(n: int) -> list[Row]:
+    start = datetime(2024, 1, 1)
+    return [
+        Row(
+            f"W{i % 10}X{i:06d}",
+            f"K-{i % 10000:04d}",
+            start + timedelta(seconds=37 * i),
+            "20m",
+            14.074 + (i % 50) / 1000,
+            MODES[i % len(MODES)],
+            "59",
+            "57",
+        )
+        for i in range(n)
+    ]
+
+
+def render(name: str, rows: list[Row]) -> int:
+    exporter = EXPORTERS[name]
+    writer = exporter.writer("KD2ABC")
+    size = len(exporter.header("KD2ABC").encode())
+    for i in range(0, len(rows), EXPORT_BATCH_SIZE):
+        size += len(writer.records(rows[i:i + EXPORT_BATCH_SIZE]).encode())
+    return size + len(exporter.footer("KD2ABC").encode())
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = synthetic_rows(n)
+    print(f"{n} QSOs, best of {REPEATS}")
+    for name in EXPORTERS:
+        best = float("inf")
+        for _ in range(REPEATS):
+            start = time.perf_counter()
+            size = render(name, rows)
+            best = min(best, time.perf_counter() - start)
+        print(f"  {name:9s} {best:6.3f} s  {n / best:10,.0f} rec/s  {size / 1e6:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
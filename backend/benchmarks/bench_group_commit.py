@@ -0,0 +1,60 @@
+"""Throughput and latency of concurrent single-QSO posts, per-request commit
+against the group-committing write queue.
+
+Several logging positions post QSOs at once. With a window of 0 and batches
+of one the queue commits every request on its own, as create_qso used to;
+the default settings let writes that arrive together share a COMMIT.
+
+    cd backend && python -m benchmarks.bench_group_commit [positions] [qsos_per_position]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+from app.main import app
+from app.write_queue import WRITE_QUEUE_MAX_BATCH, WRITE_QUEUE_WINDOW_MS, WriteQueue
+from benchmarks.harness import bench_client, bench_engines, qso_payloads
+
+
+async def run(label: str, window_ms: float, max_batch: int, positions: int, per_position: int) -> None:
+    async with bench_engines() as (session_factory, read_session_factory):
+        async with bench_client(session_factory, read_session_factory) as client:
+            app.state.write_queue = WriteQueue(session_factory, window_ms=window_ms, max_batch=max_batch)
+            sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+            latencies: list[float] = []
+
+            async def position(p: int) -> None:
+                for payload in qso_payloads(per_position, prefix=f"P{p}X"):
+                    start = time.perf_counter()
+                    resp = await client.post(f"/api/hunt-sessions/{sid}/qsos", json=payload)
+                    resp.raise_for_status()
+                    latencies.append(time.perf_counter() - start)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(position(p) for p in range(positions)))
+            elapsed = time.perf_counter() - started
+            stats = app.state.write_queue.stats()
+
+    q = statistics.quantiles(latencies, n=100)
+    print(
+        f"  {label:22s} {len(latencies) / elapsed:7.0f} QSOs/s  p50 {q[49] * 1e3:6.2f} ms"
+        f"  p95 {q[94] * 1e3:6.2f} ms  {stats['batches']:5d} commits"
+        f"  avg batch {stats['avg_batch_size']:5.2f}  commit avg {stats['commit_avg_ms']:.3f} ms"
+    )
+
+
+async def main() -> None:
+    positions = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    per_position = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"{positions} positions x {per_position} QSOs")
+    await run("commit per request", 0, 1, positions, per_position)
+    await run(
+        f"group commit ({WRITE_QUEUE_WINDOW_MS:g} ms)",
+        WRITE_QUEUE_WINDOW_MS, WRITE_QUEUE_MAX_BATCH, positions, per_position,
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,36 @@
+"""QSO logging throughput: one POST per contact versus one batch POST.
+
+    cd backend && python -m benchmarks.bench_qso_batch [n_qsos]
+"""
+
+import asyncio
+import sys
+import time
+
+from benchmarks.harness import bench_client, bench_database, qso_payloads
+
+
+async def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    async with bench_database() as session_factory, bench_client(session_factory) as client:
+        sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+        url = f"/api/hunt-sessions/{sid}/qsos"
+
+        start = time.perf_counter()
+        for qso in qso_payloads(n, prefix="S"):
+            resp = await client.post(url, json=qso)
+            assert resp.status_code == 201
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        resp = await client.post(f"{url}/batch", json={"qsos": qso_payloads(n, prefix="B")})
+        assert resp.json()["created"] == n
+        batch = time.perf_counter() - start
+
+    print(f"{n} QSOs")
+    print(f"  {'single POSTs':24s} {single * 1e3:9.1f} ms   {single / n * 1e3:6.3f} ms/QSO")
+    print(f"  {'one batch POST':24s} {batch * 1e3:9.1f} ms   {batch / n * 1e3:6.3f} ms/QSO   {single / batch:5.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+"""Single-QSO insert latency: the original four-round-trip path against
+insert_qso(), which checks the session, rejects duplicates and reads the
+row back in one INSERT ... RETURNING statement.
+
+The two paths alternate insert by insert so both see the same table size.
+
+    cd backend && python -m benchmarks.bench_qso_insert [n_qsos]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from datetime import date
+
+from sqlalchemy import select
+
+from app.models import QSO, HuntSession
+from app.routers.qsos import insert_qso
+from app.schemas import QSOCreate
+from benchmarks.harness import bench_database, qso_payloads
+
+
+async def legacy_insert(db, session_id: uuid.UUID, data: QSOCreate) -> QSO:
+    # What create_qso used to do: session SELECT, INSERT, COMMIT, refresh SELECT
+    session = (
+        await db.execute(select(HuntSession).where(HuntSession.id == session_id))
+    ).scalar_one()
+    qso = QSO(hunt_session_id=session.id, **data.model_dump())
+    db.add(qso)
+    await db.commit()
+    await db.refresh(qso)
+    return qso
+
+
+async def returning_insert(db, session_id: uuid.UUID, data: QSOCreate) -> QSO:
+    qso = await insert_qso(db, session_id, data)
+    await db.commit()
+    return qso
+
+
+async def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    cases = {"legacy 4 round trips": legacy_insert, "INSERT ... RETURNING": returning_insert}
+    timings: dict[str, list[float]] = {name: [] for name in cases}
+    async with bench_database() as session_factory:
+        async with session_factory() as db:
+            session = HuntSession(session_date=date.today())
+            db.add(session)
+            await db.commit()
+        for i, payload in enumerate(qso_payloads(2 * n)):
+            name = list(cases)[i % 2]
+            async with session_factory() as db:
+                start = time.perf_counter()
+                await cases[name](db, session.id, QSOCreate(**payload))
+                timings[name].append(time.perf_counter() - start)
+
+    print(f"{n} inserts per path, one session each")
+    for name, values in timings.items():
+        q = statistics.quantiles(values, n=100)
+        print(
+            f"  {name:24s} p50 {q[49] * 1e3:6.3f} ms   p95 {q[94] * 1e3:6.3f} ms"
+            f"   mean {statistics.fmean(values) * 1e3:6.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
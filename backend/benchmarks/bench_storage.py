@@ -0,0 +1,261 @@
+"""File size and query timings of a large log before and after migration v0008.
+
+Builds a synthetic log in the v0007 layout (text UUIDs, float MHz, band
+and mode strings), times a set of typical queries, migrates it to the
+compact layout, VACUUMs, and times the same queries again. Both layouts
+are queried through SQLAlchemy Core with the same parameters; the compact
+side uses the app's own tables, so its timings include decoding ids,
+frequencies and band/mode codes back to the API's values.
+
+    cd backend && python -m benchmarks.bench_storage [n_qsos]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import (
+    Column,
+    Connection,
+    Date,
+    DateTime,
+    Float,
+    MetaData,
+    String,
+    Table,
+    bindparam,
+    create_engine,
+    func,
+    select,
+    text,
+)
+
+from app.database import SQLITE_PRAGMAS
+from app.migrations import _ensure_version_table, load_migrations
+from app.models import QSO, HuntSession
+from app.worked_index import _RECOUNT
+
+COMPACT_VERSION = 8
+QSOS_PER_SESSION = 1000
+SEED_BATCH_SIZE = 50_000
+PROBES = 200
+RANGES = 20
+BANDS = [("40m", 7.074), ("20m", 14.074), ("17m", 18.1), ("15m", 21.074), ("10m", 28.074), ("80m", 3.573)]
+MODES = ["FT8", "CW", "SSB", "FT4"]
+START = date(2021, 1, 1)
+
+# The v0007 layout, to build the same statements against
+_legacy = MetaData()
+LEGACY_SESSIONS = Table(
+    "hunt_sessions",
+    _legacy,
+    Column("id", String(36), primary_key=True),
+    Column("session_date", Date),
+    Column("created_at", DateTime),
+)
+LEGACY_QSOS = Table(
+    "qsos",
+    _legacy,
+    Column("id", String(36), primary_key=True),
+    Column("hunt_session_id", String(36)),
+    Column("park_reference", String(20)),
+    Column("callsign", String(20)),
+    Column("frequency", Float),
+    Column("band", String(10)),
+    Column("mode", String(10)),
+    Column("rst_sent", String(10)),
+    Column("rst_received", String(10)),
+    Column("timestamp", DateTime),
+    Column("created_at", DateTime),
+)
+# v0007's worked_summary recount; _RECOUNT is today's
+LEGACY_RECOUNT = text(
+    """SELECT kind, key, COUNT(*) FROM (
+        SELECT 'park' AS kind, upper(park_reference) AS key FROM qsos
+        UNION ALL SELECT 'park_band', upper(park_reference) || ' ' || upper(band) FROM qsos
+        UNION ALL SELECT 'call', upper(callsign) FROM qsos
+    ) GROUP BY kind, key"""
+)
+
+
+def statements(qsos: Table, sessions: Table, recount) -> dict:
+    c = qsos.c
+    export_columns = (
+        c.callsign, c.park_reference, c.timestamp, c.band,
+        c.frequency, c.mode, c.rst_sent, c.rst_received,
+    )
+    in_session = c.hunt_session_id == bindparam("sid", type_=c.hunt_session_id.type)
+    return {
+        # Repeated with varying parameters
+        "page of a session (100 rows)": select(*c).where(in_session).order_by(c.timestamp, c.id).limit(100),
+        "session export (1000 rows)": select(*export_columns).where(in_session).order_by(c.timestamp, c.id),
+        "duplicate probe (unique index)": select(c.id).where(
+            in_session,
+            c.callsign == bindparam("call"),
+            c.park_reference == bindparam("park"),
+            c.band == bindparam("band", type_=c.band.type),
+        ),
+        "sessions join, 90 days": select(sessions.c.session_date, func.count())
+        .join(qsos, c.hunt_session_id == sessions.c.id)
+        .where(sessions.c.session_date.between(bindparam("first"), bindparam("last")))
+        .group_by(sessions.c.session_date),
+        "date-range export, 30 days": select(*export_columns)
+        .where(c.timestamp >= bindparam("since"), c.timestamp < bindparam("until"))
+        .order_by(c.timestamp, c.id),
+        # Whole-table scans, run once
+        "QSOs per band and mode": select(c.band, c.mode, func.count()).group_by(c.band, c.mode),
+        "worked summary recount": recount,
+    }
+
+
+def _pragmas(conn: Connection) -> None:
+    for name, value in SQLITE_PRAGMAS.items():
+        if value:
+            conn.exec_driver_sql(f"PRAGMA {name}={value}")
+
+
+def seed(conn: Connection, n: int) -> list[tuple[str, list[tuple]]]:
+    """n QSOs in the v0007 layout; returns (session id, its QSO keys) per session."""
+    rng = random.Random(1)
+    sessions = []
+    rows = []
+
+    def flush():
+        # Random calls and parks occasionally collide on the unique constraint
+        conn.exec_driver_sql("INSERT OR IGNORE INTO qsos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        rows.clear()
+
+    for day in range((n + QSOS_PER_SESSION - 1) // QSOS_PER_SESSION):
+        session_id = str(uuid.uuid4())
+        session_date = START + timedelta(days=day)
+        start = datetime.combine(session_date, datetime.min.time())
+        conn.exec_driver_sql(
+            "INSERT INTO hunt_sessions VALUES (?, ?, ?)",
+            (session_id, session_date.isoformat(), f"{start:%Y-%m-%d %H:%M:%S}.000000"),
+        )
+        keys = []
+        for i in range(min(QSOS_PER_SESSION, n - day * QSOS_PER_SESSION)):
+            band, freq = BANDS[rng.randrange(len(BANDS))]
+            call = f"{rng.choice('KWN')}{rng.randrange(10)}{rng.randrange(17576):05d}"
+            park = f"K-{rng.randrange(10000):04d}"
+            ts = f"{start + timedelta(seconds=i * 80):%Y-%m-%d %H:%M:%S}.000000"
+            rows.append((
+                str(uuid.uuid4()), session_id, park, call, freq + rng.randrange(30) / 1000,
+                band, rng.choice(MODES), "59", "57", ts, ts,
+            ))
+            keys.append((call, park, band))
+            if len(rows) >= SEED_BATCH_SIZE:
+                flush()
+        sessions.append((session_id, keys))
+    if rows:
+        flush()
+    return sessions
+
+
+def sizes(conn: Connection, path: str) -> tuple[int, dict[str, int]]:
+    conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+    tables = dict(
+        conn.exec_driver_sql(
+            "SELECT name, SUM(pgsize) FROM dbstat "
+            "WHERE name LIKE '%qsos%' OR name LIKE '%hunt_sessions%' GROUP BY name"
+        ).all()
+    )
+    return os.path.getsize(path), tables
+
+
+def parameters(sessions: list[tuple[str, list[tuple]]]) -> dict[str, list[dict]]:
+    rng = random.Random(2)
+    picks = [sessions[rng.randrange(len(sessions))] for _ in range(PROBES)]
+    days = [START + timedelta(days=rng.randrange(max(1, len(sessions) - 90))) for _ in range(RANGES)]
+    probes = []
+    for sid, keys in picks:
+        for _ in range(10):
+            call, park, band = keys[rng.randrange(len(keys))]
+            probes.append({"sid": sid, "call": call, "park": park, "band": band})
+    midnight = datetime.min.time()
+    return {
+        "page of a session (100 rows)": [{"sid": sid} for sid, _ in picks],
+        "session export (1000 rows)": [{"sid": sid} for sid, _ in picks],
+        "duplicate probe (unique index)": probes,
+        "sessions join, 90 days": [{"first": d, "last": d + timedelta(days=89)} for d in days],
+        "date-range export, 30 days": [
+            {
+                "since": datetime.combine(d, midnight),
+                "until": datetime.combine(d + timedelta(days=30), midnight),
+            }
+            for d in days
+        ],
+        "QSOs per band and mode": [{}],
+        "worked summary recount": [{}],
+    }
+
+
+def time_statements(conn: Connection, stmts: dict, params: dict[str, list[dict]]) -> dict[str, float]:
+    timings = {}
+    for name, stmt in stmts.items():
+        runs = params[name]
+        if len(runs) > 1:
+            for p in runs[:5]:  # warm the page cache
+                conn.execute(stmt, p).all()
+        start = time.perf_counter()
+        for p in runs:
+            conn.execute(stmt, p).all()
+        timings[name] = (time.perf_counter() - start) / len(runs)
+    return timings
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    migrations = load_migrations()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        engine = create_engine(f"sqlite:///{path}")
+        with engine.begin() as conn:
+            _pragmas(conn)
+            _ensure_version_table(conn)
+            for migration in migrations:
+                if migration.version < COMPACT_VERSION:
+                    migration.apply(conn)
+
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            sessions = seed(conn, n)
+        print(f"{n} QSOs in {len(sessions)} sessions, seeded in {time.perf_counter() - start:.1f} s")
+        params = parameters(sessions)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM")
+            before_size, before_tables = sizes(conn, path)
+            before = time_statements(conn, statements(LEGACY_QSOS, LEGACY_SESSIONS, LEGACY_RECOUNT), params)
+
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            for migration in migrations:
+                if migration.version >= COMPACT_VERSION:
+                    migration.apply(conn)
+        migrate = time.perf_counter() - start
+        with engine.connect() as conn:
+            conn.exec_driver_sql("VACUUM")
+            after_size, after_tables = sizes(conn, path)
+            after = time_statements(conn, statements(QSO.__table__, HuntSession.__table__, _RECOUNT), params)
+        engine.dispose()
+
+    print(f"migration to v{COMPACT_VERSION:04d}: {migrate:.1f} s\n")
+    print(f"{'':34} {'v0007':>13} {'v0008':>13}")
+    print(f"{'file size':34} {before_size / 1e6:10.1f} MB {after_size / 1e6:10.1f} MB")
+    for name in sorted(before_tables, key=before_tables.get, reverse=True):
+        label = name.replace("sqlite_autoindex_", "autoindex ")
+        print(f"  {label:32} {before_tables[name] / 1e6:10.1f} MB {after_tables.get(name, 0) / 1e6:10.1f} MB")
+    print()
+    for name in before:
+        print(
+            f"{name:34} {before[name] * 1000:10.3f} ms {after[name] * 1000:10.3f} ms"
+            f"  x{before[name] / after[name]:.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Shared setup for benchmarks that drive the API in-process.
+
+Runs the real app over ASGI against a throwaway on-disk SQLite database,
+so timings include SQLAlchemy, aiosqlite and the file system but no
+network hop.
+"""
+
+import os
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database import create_engines, get_db, get_read_db
+from app.main import app, init_state
+from app.migrations import run_migrations
+from app.models import Base
+
+
+@asynccontextmanager
+async def bench_database() -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        await engine.dispose()
+
+
+@asynccontextmanager
+async def bench_engines(
+    profile: bool = True,
+) -> AsyncIterator[tuple[async_sessionmaker[AsyncSession], async_sessionmaker[AsyncSession]]]:
+    """(writer, reader) session factories over a migrated temp database.
+
+    With profile, the engines come from app.database.create_engines (WAL,
+    pragmas, one writer connection, a read-only pool); without, both are a
+    single default engine, as before that profile existed.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        if profile:
+            writer, reader = create_engines(url)
+        else:
+            writer = reader = create_async_engine(url)
+        await run_migrations(writer)
+        yield (
+            async_sessionmaker(writer, class_=AsyncSession, expire_on_commit=False),
+            async_sessionmaker(reader, class_=AsyncSession, expire_on_commit=False),
+        )
+        await writer.dispose()
+        await reader.dispose()
+
+
+@asynccontextmanager
+async def bench_client(
+    session_factory: async_sessionmaker[AsyncSession],
+    read_session_factory: async_sessionmaker[AsyncSession] | None = None,
+) -> AsyncIterator[httpx.AsyncClient]:
+    read_session_factory = read_session_factory or session_factory
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    async def override_get_read_db():
+        async with read_session_factory() as session:
+            yield session
+
+    @asynccontextmanager
+    async def no_lifespan(app):
+        yield
+
+    app.router.lifespan_context = no_lifespan
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_read_db
+    async with httpx.AsyncClient() as http_client:
+        app.state.http_client = http_client
+        init_state(app, session_factory, read_session_factory)
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            yield client
+        await app.state.settings_cache.stop()
+        await app.state.write_queue.stop()
+    app.dependency_overrides.clear()
+
+
+def qso_payloads(n: int, prefix: str = "W") -> list[dict]:
+    return [
+        {
+            "park_reference": f"K-{i % 500:04d}",
+            "callsign": f"{prefix}{i}XYZ",
+            "frequency": 14.074,
+            "band": "20m",
+            "mode": "FT8",
+            "rst_sent": "59",
+            "rst_received": "59",
+        }
+        for i in range(n)
+    ]
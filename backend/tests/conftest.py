@@ -8,7 +8,8 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 from sqlalchemy.pool import StaticPool
 
 from app.models import Base
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.migrations import run_migrations
 
 TEST_DATABASE_URL = "sqlite+aiosqlite://"
 
@@ -20,8 +21,7 @@ async def _test_engine():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await run_migrations(engine)
     yield engine
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
@@ -31,7 +31,7 @@ async def _test_engine():
 @pytest.fixture()
 async def client(_test_engine) -> AsyncGenerator[AsyncClient, None]:
     """HTTP test client with dependency-overridden database session."""
-    from app.main import app as _app
+    from app.main import app as _app, init_state
 
     session_factory = async_sessionmaker(
         _test_engine, class_=AsyncSession, expire_on_commit=False
@@ -47,11 +47,15 @@ async def client(_test_engine) -> AsyncGenerator[AsyncClient, None]:
 
     _app.router.lifespan_context = _test_lifespan
     _app.dependency_overrides[get_db] = _override_get_db
+    _app.dependency_overrides[get_read_db] = _override_get_db
 
     async with httpx.AsyncClient() as http_client:
         _app.state.http_client = http_client
+        init_state(_app, session_factory)
         transport = ASGITransport(app=_app)
         async with AsyncClient(transport=transport, base_url="http://test") as ac:
             yield ac
+        await _app.state.settings_cache.stop()
+        await _app.state.write_queue.stop()
 
     _app.dependency_overrides.clear()
@@ -5,7 +5,7 @@ from datetime import datetime, timezone
 from unittest.mock import MagicMock
 from decimal import Decimal
 
-from app.adif import _adif_field, generate_adif
+from app.adif import AdifEncoder, _adif_field, adif_header, generate_adif
 
 
 def _make_qso(**overrides):
@@ -101,3 +101,40 @@ class TestGenerateAdif:
         assert adif.count("<EOR>") == 2
         assert "<CALL:4>W1AW" in adif
         assert "<CALL:4>K3LR" in adif
+
+
+def _legacy_record(operator_callsign, qso):
+    """The field-by-field, strftime-based record the encoder replaced."""
+    fields = [
+        _adif_field("STATION_CALLSIGN", operator_callsign.upper()),
+        _adif_field("CALL", qso.callsign.upper()),
+        _adif_field("SIG", "POTA"),
+        _adif_field("SIG_INFO", qso.park_reference.upper()),
+        _adif_field("QSO_DATE", qso.timestamp.strftime("%Y%m%d")),
+        _adif_field("TIME_ON", qso.timestamp.strftime("%H%M%S")),
+        _adif_field("BAND", qso.band.lower()),
+        _adif_field("FREQ", f"{qso.frequency:.4f}"),
+        _adif_field("MODE", qso.mode.upper()),
+        _adif_field("RST_SENT", qso.rst_sent),
+        _adif_field("RST_RCVD", qso.rst_received),
+        "<EOR>",
+    ]
+    return "\n" + " ".join(fields) + "\n"
+
+
+class TestAdifEncoder:
+    def test_matches_legacy_output_byte_for_byte(self):
+        qsos = [
+            _make_qso(),
+            _make_qso(timestamp=datetime(2024, 1, 2, 3, 4, 5), frequency=7.0),
+            _make_qso(timestamp=datetime(1999, 12, 31, 23, 59, 59, 999999), frequency=14.07449),
+            _make_qso(callsign="ve3/w1aw/p", park_reference="ve-0123", band="2M", mode="ft4"),
+            _make_qso(callsign="SØABC", rst_sent="", rst_received="-12"),
+        ]
+        for operator in ("", "kd2abc"):
+            expected = adif_header() + "".join(
+                _legacy_record(operator, qso) for qso in qsos
+            )
+            assert generate_adif(operator, qsos) == expected
+            encoder = AdifEncoder(operator)
+            assert [encoder.record(q) for q in qsos] == [_legacy_record(operator, q) for q in qsos]
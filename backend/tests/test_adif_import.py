@@ -0,0 +1,108 @@
+"""Tests for the streaming ADIF parser and the ADIF import endpoint."""
+
+from datetime import datetime
+
+from httpx import AsyncClient
+
+from app.adif import AdifParser
+from app.adif_import import qso_values
+
+
+def _field(name: str, value: str) -> str:
+    return f"<{name}:{len(value)}>{value}"
+
+
+def _record(**fields) -> str:
+    return "".join(_field(k.upper(), v) for k, v in fields.items()) + "<EOR>\n"
+
+
+HEADER = "Exported by SomeLogger <not a tag>\n" + _field("ADIF_VER", "3.1.4") + "<EOH>\n"
+
+LOG = HEADER + "".join([
+    _record(call="w1aw", qso_date="20240501", time_on="1230", band="20M", freq="14.074",
+            mode="FT8", rst_sent="-10", rst_rcvd="-12", sig="POTA", sig_info="k-0001"),
+    _record(call="K3LR", qso_date="20240501", time_on="123500", freq="7.074",
+            mode="MFSK", submode="FT4", pota_ref="K-0002@US-PA,K-0003"),
+    _record(call="N5J", qso_date="20240502", time_on="0100", band="40m", mode="CW"),
+    _record(call="KX9X", qso_date="20240503", time_on="0200", band="15m", mode="SSB",
+            sig="POTA", sig_info="K-0004"),
+])
+
+
+def test_parser_handles_any_chunking():
+    whole = AdifParser().feed(LOG)
+    parser = AdifParser()
+    one_char = [r for ch in LOG for r in parser.feed(ch)] + parser.close()
+    assert one_char == whole
+    assert len(whole) == 4
+    assert whole[0]["CALL"] == "w1aw"
+    assert "ADIF_VER" not in whole[0]
+
+
+def test_parser_values_may_contain_markup():
+    text = _record(call="W1AW", comment="<EOR> inside\na comment")
+    assert AdifParser().feed(text) == [{"CALL": "W1AW", "COMMENT": "<EOR> inside\na comment"}]
+
+
+def test_parser_keeps_last_record_without_eor():
+    parser = AdifParser()
+    assert parser.feed(_field("CALL", "W1AW")) == []
+    assert parser.close() == [{"CALL": "W1AW"}]
+
+
+def test_qso_values_mapping():
+    records = AdifParser().feed(LOG)
+    (first,) = qso_values(records[0])
+    assert first == {
+        "park_reference": "K-0001", "callsign": "W1AW", "frequency": 14.074, "band": "20m",
+        "mode": "FT8", "rst_sent": "-10", "rst_received": "-12",
+        "timestamp": datetime(2024, 5, 1, 12, 30),
+    }
+    two_fer = qso_values(records[1])
+    assert [q["park_reference"] for q in two_fer] == ["K-0002", "K-0003"]
+    assert two_fer[0]["band"] == "40m"  # derived from FREQ
+    assert two_fer[0]["mode"] == "FT4"
+    assert qso_values(records[2]) == []  # not a POTA contact
+
+
+async def test_import_endpoint_files_qsos_by_date(client: AsyncClient):
+    resp = await client.post("/api/import/adif", content=LOG.encode())
+    assert resp.status_code == 200
+    body = resp.json()
+    assert {k: body[k] for k in ("records", "created", "duplicates", "skipped", "sessions_created")} == {
+        "records": 4, "created": 4, "duplicates": 0, "skipped": 1, "sessions_created": 2,
+    }
+    sessions = (await client.get("/api/hunt-sessions")).json()
+    assert [s["session_date"] for s in sessions] == ["2024-05-03", "2024-05-01"]
+    day_one = (await client.get(f"/api/hunt-sessions/{sessions[1]['id']}")).json()
+    assert day_one["qso_count"] == 3
+
+    # Importing the same log again only finds duplicates
+    again = (await client.post("/api/import/adif", content=LOG.encode())).json()
+    assert (again["created"], again["duplicates"], again["sessions_created"]) == (0, 4, 0)
+
+
+async def test_import_updates_worked_index(client: AsyncClient):
+    verify = (await client.get("/api/spots/worked/verify")).json()
+    assert verify["size"]["call"] == 0
+    await client.post("/api/import/adif", content=LOG.encode())
+    verify = (await client.get("/api/spots/worked/verify")).json()
+    assert verify["consistent"] is True
+    assert verify["size"] == {"park": 4, "park_band": 4, "call": 3}
+
+
+async def test_import_in_small_batches(client: AsyncClient):
+    from app.adif_import import import_adif
+    from app.main import app
+
+    async def chunks():
+        for i in range(0, len(LOG), 7):
+            yield LOG[i:i + 7].encode()
+
+    progress = []
+    stats = await import_adif(
+        app.state.write_queue, chunks(), progress=lambda s: progress.append(s.created), batch_size=2
+    )
+    assert stats.created == 4
+    # The two-fer adds two rows at once, so the first batch overshoots
+    assert progress == [3, 4]
@@ -2,6 +2,7 @@
 
 import pytest
 
+from app.bands import BAND_RANGES, NUMPY_MIN_BATCH, classify_khz
 from app.routers.spots import khz_to_band
 
 
@@ -77,3 +78,22 @@ class TestKhzToBand:
     def test_just_above_2m(self):
         """148000 kHz is above 2m."""
         assert khz_to_band("148000") == ""
+
+
+class TestClassifyKhz:
+    """Batch classification must agree with khz_to_band item by item."""
+
+    VALUES = ["1799", "1800", "2000", "7074", "14349.9", "14350", "29999",
+              "31000", "146520", "148000", "", "abc", None, "nan", "inf"]
+
+    def test_matches_single_lookup(self):
+        assert classify_khz(self.VALUES) == [khz_to_band(v) for v in self.VALUES]
+
+    def test_large_batch_matches_single_lookup(self):
+        # Large enough to take the NumPy path when it's installed
+        values = [str(1500 + i * 37) for i in range(NUMPY_MIN_BATCH * 2)] + self.VALUES
+        assert classify_khz(values) == [khz_to_band(v) for v in values]
+
+    def test_matches_band_ranges_table(self):
+        for low, high, band in BAND_RANGES:
+            assert classify_khz([low, high - 0.001, high]) == [band, band, ""]
@@ -0,0 +1,30 @@
+"""Tests for the SQLite engine profile."""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.database import create_engines
+
+
+async def test_file_database_gets_wal_writer_and_read_only_reader(tmp_path):
+    writer, reader = create_engines(f"sqlite+aiosqlite:///{tmp_path / 'pota.db'}")
+    try:
+        async with writer.begin() as conn:
+            assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+            assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+            await conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        async with reader.connect() as conn:
+            assert (await conn.execute(text("PRAGMA query_only"))).scalar() == 1
+            assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == 5000
+            with pytest.raises(OperationalError):
+                await conn.execute(text("INSERT INTO t VALUES (1)"))
+        assert writer.pool.size() == 1
+    finally:
+        await writer.dispose()
+        await reader.dispose()
+
+
+def test_in_memory_database_shares_one_engine():
+    writer, reader = create_engines("sqlite+aiosqlite://")
+    assert writer is reader
@@ -5,6 +5,8 @@ import uuid
 import pytest
 from httpx import AsyncClient
 
+from app.routers.export import accepts_gzip
+
 
 pytestmark = pytest.mark.asyncio
 
@@ -76,3 +78,176 @@ async def test_export_session_not_found(client: AsyncClient):
     fake_id = str(uuid.uuid4())
     resp = await client.get(f"/api/hunt-sessions/{fake_id}/export")
     assert resp.status_code == 404
+
+
+async def test_export_streams_large_session_in_order(client: AsyncClient):
+    from app.adif import generate_adif
+    from app.routers import export
+
+    sid = await _get_session_id(client)
+    qsos = [
+        {**QSO_DATA, "callsign": f"K{i}ABC", "timestamp": f"2025-06-15T{i // 60 % 24:02d}:{i % 60:02d}:00Z"}
+        for i in range(export.EXPORT_BATCH_SIZE + 250)
+    ]
+    await client.post(f"/api/hunt-sessions/{sid}/qsos/batch", json={"qsos": qsos[:1000]})
+    await client.post(f"/api/hunt-sessions/{sid}/qsos/batch", json={"qsos": qsos[1000:]})
+
+    resp = await client.get(f"/api/hunt-sessions/{sid}/export")
+    assert resp.status_code == 200
+    assert resp.text.count("<EOR>") == len(qsos)
+
+    class Row:
+        def __init__(self, data):
+            from datetime import datetime
+            self.__dict__.update(data)
+            self.timestamp = datetime.fromisoformat(data["timestamp"])
+
+    listed = (await client.get(f"/api/hunt-sessions/{sid}/qsos")).json()
+    assert resp.text == generate_adif("", [Row(q) for q in listed])
+
+
+def _adif_log(days: list[str]) -> bytes:
+    from app.adif import _adif_field
+
+    records = [
+        " ".join([
+            _adif_field("CALL", f"K{i}ABC"),
+            _adif_field("QSO_DATE", day),
+            _adif_field("TIME_ON", f"{12 + i % 3:02d}0000"),
+            _adif_field("BAND", "20m"),
+            _adif_field("FREQ", "14.0740"),
+            _adif_field("MODE", "FT8"),
+            _adif_field("POTA_REF", "K-0001"),
+        ]) + " <EOR>"
+        for i, day in enumerate(days)
+    ]
+    return ("<EOH>\n" + "\n".join(records)).encode()
+
+
+async def test_export_log_date_range_spans_sessions(client: AsyncClient):
+    days = ["20250601", "20250602", "20250602", "20250615", "20250701"]
+    resp = await client.post("/api/import/adif", content=_adif_log(days))
+    assert resp.json()["sessions_created"] == 4
+
+    resp = await client.get(
+        "/api/export", params={"from": "2025-06-02", "to": "2025-06-15"},
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert resp.status_code == 200
+    assert "content-encoding" not in resp.headers
+    assert 'filename="pota_log_20250602_20250615.adi"' in resp.headers["content-disposition"]
+    dates = [line.split("<QSO_DATE:8>")[1][:8] for line in resp.text.splitlines() if "<EOR>" in line]
+    assert dates == ["20250602", "20250602", "20250615"]
+
+    resp = await client.get("/api/export", headers={"Accept-Encoding": "identity"})
+    assert resp.text.count("<EOR>") == len(days)
+    assert 'filename="pota_log_all.adi"' in resp.headers["content-disposition"]
+
+
+async def test_export_log_gzip(client: AsyncClient):
+    import gzip
+
+    await client.post("/api/import/adif", content=_adif_log(["20250601", "20250602"]))
+    plain = await client.get("/api/export", headers={"Accept-Encoding": "identity"})
+
+    async with client.stream("GET", "/api/export", headers={"Accept-Encoding": "gzip"}) as resp:
+        assert resp.headers["content-encoding"] == "gzip"
+        raw = b"".join([chunk async for chunk in resp.aiter_raw()])
+    assert gzip.decompress(raw) == plain.content
+
+    resp = await client.get("/api/export", headers={"Accept-Encoding": "gzip;q=0"})
+    assert "content-encoding" not in resp.headers
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        ("gzip", True),
+        ("identity", False),
+        ("gzip;q=0", False),
+        ("*", True),
+        ("*;q=0, gzip", True),
+        ("gzip;q=0, *", False),
+        ("br, gzip; q=0.5", True),
+        ("gzip;q=bogus", False),
+    ],
+)
+async def test_accepts_gzip(header: str, expected: bool):
+    assert accepts_gzip(header) is expected
+
+
+async def test_export_log_rejects_reversed_range(client: AsyncClient):
+    resp = await client.get("/api/export", params={"from": "2025-06-02", "to": "2025-06-01"})
+    assert resp.status_code == 400
+
+
+async def test_export_repeat_served_from_cache_with_etag(client: AsyncClient):
+    sid = await _get_session_id(client)
+    await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+
+    first = await client.get(f"/api/hunt-sessions/{sid}/export")
+    etag = first.headers["etag"]
+    second = await client.get(f"/api/hunt-sessions/{sid}/export")
+    assert second.content == first.content
+    assert second.headers["etag"] == etag
+    assert second.headers["content-disposition"] == first.headers["content-disposition"]
+    assert (await client.get("/api/stats")).json()["export_cache"]["hits"] == 1
+
+    resp = await client.get(f"/api/hunt-sessions/{sid}/export", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+
+
+async def test_export_cache_invalidated_by_mutations(client: AsyncClient):
+    sid = await _get_session_id(client)
+    resp = await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+    qso_id = resp.json()["id"]
+    etags = [(await client.get(f"/api/hunt-sessions/{sid}/export")).headers["etag"]]
+
+    await client.post(f"/api/hunt-sessions/{sid}/qsos", json={**QSO_DATA, "callsign": "K2XYZ"})
+    resp = await client.get(f"/api/hunt-sessions/{sid}/export")
+    assert "<CALL:5>K2XYZ" in resp.text
+    etags.append(resp.headers["etag"])
+
+    await client.put("/api/settings", json={"operator_callsign": "KD2ABC"})
+    resp = await client.get(f"/api/hunt-sessions/{sid}/export")
+    assert "<STATION_CALLSIGN:6>KD2ABC" in resp.text
+    etags.append(resp.headers["etag"])
+
+    await client.delete(f"/api/hunt-sessions/{sid}/qsos/{qso_id}")
+    resp = await client.get(f"/api/hunt-sessions/{sid}/export")
+    assert "<CALL:4>W1AW" not in resp.text
+    etags.append(resp.headers["etag"])
+
+    assert len(set(etags)) == len(etags)
+    assert (await client.get("/api/stats")).json()["export_cache"]["hits"] == 0
+
+
+async def test_export_formats(client: AsyncClient):
+    sid = await _get_session_id(client)
+    await client.post(f"/api/hunt-sessions/{sid}/qsos/batch", json={"qsos": [QSO_DATA]})
+
+    resp = await client.get(f"/api/hunt-sessions/{sid}/export", params={"format": "csv"})
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert ".csv" in resp.headers["content-disposition"]
+    assert resp.text.splitlines()[1].startswith("W1AW,K-0001,2025-06-15 18:30:00,20m,14.074,FT8")
+
+    resp = await client.get(f"/api/hunt-sessions/{sid}/export", params={"format": "jsonl"})
+    assert resp.json()["timestamp"] == "2025-06-15T18:30:00Z"
+
+    resp = await client.get(f"/api/hunt-sessions/{sid}/export", params={"format": "cabrillo"})
+    assert resp.text.endswith("END-OF-LOG:\n")
+    assert "QSO: 14074 DG 2025-06-15 1830" in resp.text
+
+    resp = await client.get("/api/export", params={"format": "csv"}, headers={"Accept-Encoding": "identity"})
+    assert 'filename="pota_log_all.csv"' in resp.headers["content-disposition"]
+    assert len(resp.text.splitlines()) == 2
+
+    resp = await client.get(f"/api/hunt-sessions/{sid}/export")
+    assert "<EOH>" in resp.text
+    assert (await client.get("/api/stats")).json()["export_cache"]["hits"] == 0
+
+
+async def test_export_unknown_format(client: AsyncClient):
+    sid = await _get_session_id(client)
+    resp = await client.get(f"/api/hunt-sessions/{sid}/export", params={"format": "xlsx"})
+    assert resp.status_code == 422
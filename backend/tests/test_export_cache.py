@@ -0,0 +1,53 @@
+"""Unit tests for the byte-bounded export LRU."""
+
+from app.export_cache import ExportCache
+
+
+def _key(n: int) -> tuple:
+    return (f"session-{n}", "adif", 0, 0)
+
+
+def test_evicts_least_recently_used_over_budget():
+    cache = ExportCache(max_bytes=30, max_entry_bytes=30)
+    cache.put(_key(1), "a.adi", b"x" * 10)
+    cache.put(_key(2), "b.adi", b"x" * 10)
+    cache.put(_key(3), "c.adi", b"x" * 10)
+    assert cache.get(_key(1)) == ("a.adi", b"x" * 10)
+
+    cache.put(_key(4), "d.adi", b"x" * 10)
+    assert cache.get(_key(2)) is None
+    assert cache.get(_key(1)) is not None
+    assert cache.bytes == 30
+    assert cache.evictions == 1
+
+
+def test_skips_entries_over_entry_limit():
+    cache = ExportCache(max_bytes=100, max_entry_bytes=10)
+    cache.put(_key(1), "a.adi", b"x" * 11)
+    assert cache.get(_key(1)) is None
+    assert cache.bytes == 0
+
+
+def test_replacing_an_entry_keeps_byte_count():
+    cache = ExportCache(max_bytes=100)
+    cache.put(_key(1), "a.adi", b"x" * 10)
+    cache.put(_key(1), "a.adi", b"x" * 20)
+    assert cache.bytes == 20
+
+
+async def test_tee_stores_only_complete_renders_within_limit():
+    async def chunks(n: int):
+        for _ in range(n):
+            yield b"x" * 4
+
+    cache = ExportCache(max_bytes=100, max_entry_bytes=10)
+    assert b"".join([c async for c in cache.tee(_key(1), "a.adi", chunks(2))]) == b"x" * 8
+    assert cache.get(_key(1)) == ("a.adi", b"x" * 8)
+
+    assert len([c async for c in cache.tee(_key(2), "b.adi", chunks(3))]) == 3
+    assert cache.get(_key(2)) is None
+
+    stream = cache.tee(_key(3), "c.adi", chunks(2))
+    await stream.__anext__()
+    await stream.aclose()
+    assert cache.get(_key(3)) is None
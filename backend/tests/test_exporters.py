@@ -0,0 +1,77 @@
+"""Unit tests for the CSV, JSON Lines and Cabrillo writers (no database needed)."""
+
+import csv
+import io
+import json
+from datetime import datetime
+
+from app.exporters import EXPORTERS, CabrilloWriter, CsvWriter, JsonLinesWriter
+
+ROWS = [
+    ("W1AW", "K-0001", datetime(2025, 6, 15, 18, 30, 5), "20m", 14.074, "SSB", "59", "57"),
+    ('ve3"x', "k-0002", datetime(2025, 6, 15, 19, 1, 0), "40m", 7.074, "ft8", "-10", ""),
+]
+
+
+def _render(name: str, rows) -> str:
+    exporter = EXPORTERS[name]
+    return (
+        exporter.header("kd2abc")
+        + exporter.writer("kd2abc").records(rows)
+        + exporter.footer("kd2abc")
+    )
+
+
+def test_csv_round_trips_through_csv_reader():
+    parsed = list(csv.DictReader(io.StringIO(_render("csv", ROWS))))
+    assert [r["callsign"] for r in parsed] == ["W1AW", 've3"x']
+    assert parsed[0]["timestamp_utc"] == "2025-06-15 18:30:05"
+    assert float(parsed[1]["frequency_mhz"]) == 7.074
+    assert parsed[1]["rst_received"] == ""
+
+
+def test_csv_timestamps_drop_microseconds():
+    row = ("W1AW", "K-0001", datetime(2025, 6, 15, 18, 30, 5, 123456), "20m", 14.074, "SSB", "59", "57")
+    parsed = next(csv.DictReader(io.StringIO(_render("csv", [row]))))
+    assert parsed["timestamp_utc"] == "2025-06-15 18:30:05"
+
+
+def test_csv_writer_reuses_its_buffer_between_batches():
+    writer = CsvWriter("")
+    first = writer.records(ROWS[:1])
+    second = writer.records(ROWS[1:])
+    assert first.count("\n") == second.count("\n") == 1
+    assert "W1AW" not in second
+
+
+def test_jsonl_lines_are_json_objects():
+    lines = JsonLinesWriter("").records(ROWS).splitlines()
+    records = [json.loads(line) for line in lines]
+    assert records[0] == {
+        "callsign": "W1AW",
+        "park_reference": "K-0001",
+        "timestamp": "2025-06-15T18:30:05Z",
+        "band": "20m",
+        "frequency": 14.074,
+        "mode": "SSB",
+        "rst_sent": "59",
+        "rst_received": "57",
+    }
+    assert records[1]["callsign"] == 've3"x'
+
+
+def test_cabrillo_log():
+    lines = _render("cabrillo", ROWS).splitlines()
+    assert lines[0] == "START-OF-LOG: 3.0"
+    assert "CALLSIGN: KD2ABC" in lines
+    assert lines[-1] == "END-OF-LOG:"
+    qsos = [line for line in lines if line.startswith("QSO:")]
+    assert qsos[0].split() == [
+        "QSO:", "14074", "PH", "2025-06-15", "1830", "KD2ABC", "59", "W1AW", "57", "K-0001",
+    ]
+    assert qsos[1].split()[1:5] == ["7074", "DG", "2025-06-15", "1901"]
+
+
+def test_cabrillo_columns_line_up():
+    lines = CabrilloWriter("N0CALL").records(ROWS).splitlines()
+    assert len({line.index("N0CALL") for line in lines}) == 1
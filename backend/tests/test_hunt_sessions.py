@@ -1,9 +1,14 @@
 """Integration tests for hunt session endpoints."""
 
 import uuid
+from datetime import date, datetime
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import insert
+
+from app.models import HuntSession
+from app.pagination import encode_cursor
 
 
 pytestmark = pytest.mark.asyncio
@@ -46,3 +51,103 @@ async def test_get_session_not_found(client: AsyncClient):
     fake_id = str(uuid.uuid4())
     resp = await client.get(f"/api/hunt-sessions/{fake_id}")
     assert resp.status_code == 404
+
+
+QSO_DATA = {
+    "park_reference": "K-0001",
+    "callsign": "W1AW",
+    "frequency": 14.074,
+    "band": "20m",
+    "mode": "FT8",
+    "rst_sent": "59",
+    "rst_received": "59",
+}
+
+
+async def test_get_session_etag_not_modified(client: AsyncClient):
+    session_id = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    first = await client.get(f"/api/hunt-sessions/{session_id}")
+    etag = first.headers["etag"]
+
+    resp = await client.get(f"/api/hunt-sessions/{session_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+
+async def test_etag_wildcard_needs_existing_session(client: AsyncClient):
+    missing = uuid.uuid4()
+    resp = await client.get(f"/api/hunt-sessions/{missing}", headers={"If-None-Match": "*"})
+    assert resp.status_code == 404
+    resp = await client.get(f"/api/hunt-sessions/{missing}/export", headers={"If-None-Match": "*"})
+    assert resp.status_code == 404
+
+    session_id = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    resp = await client.get(f"/api/hunt-sessions/{session_id}", headers={"If-None-Match": "*"})
+    assert resp.status_code == 304
+
+
+async def test_session_etag_changes_after_qso_mutation(client: AsyncClient):
+    today = await client.get("/api/hunt-sessions/today")
+    session_id = today.json()["id"]
+    etag = today.headers["etag"]
+
+    qso = await client.post(f"/api/hunt-sessions/{session_id}/qsos", json=QSO_DATA)
+    resp = await client.get("/api/hunt-sessions/today", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert len(resp.json()["qsos"]) == 1
+    etag = resp.headers["etag"]
+
+    resp = await client.get("/api/hunt-sessions/today", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+
+    await client.delete(f"/api/hunt-sessions/{session_id}/qsos/{qso.json()['id']}")
+    resp = await client.get(f"/api/hunt-sessions/{session_id}", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["qsos"] == []
+
+
+async def test_list_sessions_keyset_pagination(client: AsyncClient, _test_engine):
+    async with _test_engine.begin() as conn:
+        await conn.execute(
+            insert(HuntSession),
+            [
+                {"id": str(uuid.uuid4()), "session_date": date(2025, 1, d), "created_at": datetime(2025, 1, d)}
+                for d in range(1, 6)
+            ],
+        )
+    dates, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        resp = await client.get("/api/hunt-sessions", params=params)
+        assert resp.status_code == 200
+        dates += [s["session_date"] for s in resp.json()]
+        cursor = resp.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert dates == [f"2025-01-0{d}" for d in range(5, 0, -1)]
+
+
+async def test_list_sessions_bad_cursor(client: AsyncClient):
+    resp = await client.get("/api/hunt-sessions", params={"cursor": "nonsense", "limit": 2})
+    assert resp.status_code == 400
+    for key in (5, [20240101], ["2024-01-01", "extra"]):
+        cursor = encode_cursor("sessions", key)
+        resp = await client.get("/api/hunt-sessions", params={"cursor": cursor, "limit": 2})
+        assert resp.status_code == 400, key
+
+
+async def test_get_session_header_only(client: AsyncClient):
+    sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+
+    full = await client.get(f"/api/hunt-sessions/{sid}")
+    assert full.json()["qso_count"] == 1
+    assert len(full.json()["qsos"]) == 1
+
+    header = await client.get(f"/api/hunt-sessions/{sid}", params={"include_qsos": "false"})
+    assert header.status_code == 200
+    assert header.json()["qsos"] is None
+    assert header.json()["qso_count"] == 1
+    assert header.json()["id"] == sid
+    # The two representations must not share a validator
+    assert header.headers["etag"] != full.headers["etag"]
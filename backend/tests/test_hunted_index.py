@@ -0,0 +1,98 @@
+"""Tests for the in-memory hunted-today index maintained by the QSO routes."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+import respx
+from httpx import AsyncClient, Response
+
+import app.hunted_index as hunted_index_module
+from app.main import app
+
+from tests.test_spots import QSO_DATA, SPOTS_DATA
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _hunted(client: AsyncClient) -> dict[str, bool]:
+    resp = await client.get("/api/spots")
+    return {s["activator"]: s["hunted"] for s in resp.json()}
+
+
+@respx.mock
+async def test_index_loaded_once_and_updated_in_place(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    assert (await _hunted(client))["W1AW"] is False
+
+    qso = (await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)).json()
+    assert (await _hunted(client))["W1AW"] is True
+
+    await client.delete(f"/api/hunt-sessions/{sid}/qsos/{qso['id']}")
+    assert (await _hunted(client))["W1AW"] is False
+
+    assert app.state.hunted_index.loads == 1
+
+
+@respx.mock
+async def test_index_reloads_when_today_session_created_after_load(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    await _hunted(client)  # loads with no session for today
+    sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+    assert (await _hunted(client))["W1AW"] is True
+
+
+async def test_index_rolls_over_at_utc_midnight(client: AsyncClient, monkeypatch):
+    index = app.state.hunted_index
+    sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+    assert len(await index.current()) == 1
+
+    class Tomorrow(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.now(tz) + timedelta(days=1)
+
+    monkeypatch.setattr(hunted_index_module, "datetime", Tomorrow)
+    assert len(await index.current()) == 0
+    assert index.loads == 2
+
+
+async def test_concurrent_inserts_and_deletes_stay_consistent(client: AsyncClient):
+    sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    await app.state.hunted_index.current()
+
+    parks = [f"K-{n:04d}" for n in range(20)]
+    created = await asyncio.gather(
+        *(
+            client.post(f"/api/hunt-sessions/{sid}/qsos", json={**QSO_DATA, "park_reference": p})
+            for p in parks
+        )
+    )
+    await asyncio.gather(
+        *(client.delete(f"/api/hunt-sessions/{sid}/qsos/{r.json()['id']}") for r in created[::2])
+    )
+
+    resp = await client.get("/api/spots/hunted/verify")
+    report = resp.json()
+    assert report["consistent"] is True
+    assert report["size"] == 10
+
+
+async def test_verify_reports_drift(client: AsyncClient):
+    sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+    index = app.state.hunted_index
+    await index.current()
+    index._keys.clear()
+
+    report = (await client.get("/api/spots/hunted/verify")).json()
+    assert report["consistent"] is False
+    assert report["missing"] == [["W1AW", "K-0001", "20M"]]
+    assert report["date"] == datetime.now(timezone.utc).date().isoformat()
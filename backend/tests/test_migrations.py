@@ -0,0 +1,140 @@
+"""Tests for the embedded schema migration runner."""
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.migrations import current_version, load_migrations, run_migrations
+from app.models import QSO, Base, Mode
+
+SESSION_ID = "3f2c1a9e-5b7d-4e21-9c0a-6d8e7f1b2a34"
+QSO_IDS = ["0a1b2c3d-4e5f-4a6b-8c7d-9e0f1a2b3c4d", "f0e1d2c3-b4a5-4968-8776-655443322110"]
+
+LATEST = load_migrations()[-1].version
+
+# qsos and friends exactly as create_all made them before migrations existed
+LEGACY_SCHEMA = [
+    "CREATE TABLE hunt_sessions (id VARCHAR(36) NOT NULL, session_date DATE NOT NULL, "
+    "created_at DATETIME NOT NULL, PRIMARY KEY (id), UNIQUE (session_date))",
+    "CREATE TABLE qsos (id VARCHAR(36) NOT NULL, hunt_session_id VARCHAR(36) NOT NULL, "
+    "park_reference VARCHAR(20) NOT NULL, callsign VARCHAR(20) NOT NULL, frequency FLOAT NOT NULL, "
+    "band VARCHAR(10) NOT NULL, mode VARCHAR(10) NOT NULL, rst_sent VARCHAR(10) NOT NULL, "
+    "rst_received VARCHAR(10) NOT NULL, timestamp DATETIME NOT NULL, created_at DATETIME NOT NULL, "
+    "PRIMARY KEY (id), CONSTRAINT uq_qso_session_call_park_band "
+    "UNIQUE (hunt_session_id, callsign, park_reference, band), "
+    "FOREIGN KEY(hunt_session_id) REFERENCES hunt_sessions (id))",
+    "CREATE TABLE settings (id VARCHAR(36) NOT NULL, operator_callsign VARCHAR(20) NOT NULL, "
+    "flrig_host VARCHAR(100) NOT NULL, flrig_port INTEGER NOT NULL, created_at DATETIME NOT NULL, "
+    "updated_at DATETIME NOT NULL, PRIMARY KEY (id))",
+    f"INSERT INTO hunt_sessions VALUES ('{SESSION_ID}', '2024-05-01', '2024-05-01 00:00:00.000000')",
+    f"INSERT INTO qsos VALUES ('{QSO_IDS[0]}', '{SESSION_ID}', 'K-0001', 'W1AW', 14.074, '20m', 'FT8', "
+    "'59', '59', '2024-05-01 12:00:00.000000', '2024-05-01 12:00:00.000000')",
+    f"INSERT INTO qsos VALUES ('{QSO_IDS[1]}', '{SESSION_ID}', 'K-0002', 'W1AW', 14.1055, '20m', 'VARAHF', "
+    "'59', '59', '2024-05-01 12:05:00.000000', '2024-05-01 12:05:00.000000')",
+]
+
+
+def _engine():
+    return create_async_engine(
+        "sqlite+aiosqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+
+
+def _schema(conn) -> dict:
+    inspector = inspect(conn)
+    schema = {}
+    for table in inspector.get_table_names():
+        if table == "schema_version":
+            continue
+        schema[table] = {
+            "columns": [
+                (c["name"], str(c["type"]), c["nullable"]) for c in inspector.get_columns(table)
+            ],
+            "pk": inspector.get_pk_constraint(table)["constrained_columns"],
+            "indexes": sorted((i["name"], tuple(i["column_names"])) for i in inspector.get_indexes(table)),
+            "unique": sorted(tuple(u["column_names"]) for u in inspector.get_unique_constraints(table)),
+        }
+    return schema
+
+
+async def test_migrations_match_models():
+    migrated, reference = _engine(), _engine()
+    applied = await run_migrations(migrated)
+    assert [m.version for m in applied] == list(range(1, LATEST + 1))
+    async with reference.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with migrated.connect() as a, reference.connect() as b:
+        assert await a.run_sync(_schema) == await b.run_sync(_schema)
+        assert await a.run_sync(current_version) == LATEST
+        for table in ("bands", "modes"):
+            seeded = f"SELECT code, name FROM {table} ORDER BY code"
+            assert (await a.exec_driver_sql(seeded)).all() == (await b.exec_driver_sql(seeded)).all()
+
+
+async def test_upgrades_populated_legacy_database():
+    engine = _engine()
+    async with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            await conn.exec_driver_sql(statement)
+
+    await run_migrations(engine)
+    async with engine.connect() as conn:
+        assert await conn.run_sync(current_version) == LATEST
+        indexes = await conn.run_sync(lambda c: inspect(c).get_indexes("qsos"))
+        assert "ix_qsos_session_timestamp" in {i["name"] for i in indexes}
+        raw = (await conn.exec_driver_sql("SELECT id, frequency, band FROM qsos ORDER BY id")).all()
+        assert [len(qso_id) for qso_id, _, _ in raw] == [16, 16]
+        assert [(f, b) for _, f, b in raw] == [(14_074_000, 9), (14_105_500, 9)]
+
+    async with AsyncSession(engine) as db:
+        qsos = (await db.execute(select(QSO).order_by(QSO.id))).scalars().all()
+        assert [(q.id, q.hunt_session_id, q.frequency, q.band, q.mode) for q in qsos] == [
+            (QSO_IDS[0], SESSION_ID, 14.074, "20m", "FT8"),
+            (QSO_IDS[1], SESSION_ID, 14.1055, "20m", "VARAHF"),
+        ]
+        # Unseeded names get codes after the seeds
+        assert (await db.execute(select(Mode.code).where(Mode.name == "VARAHF"))).scalar() > 16
+
+
+async def test_rebuild_keeps_worked_summary_triggers():
+    engine = _engine()
+    async with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            await conn.exec_driver_sql(statement)
+    await run_migrations(engine)
+
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(f"DELETE FROM qsos WHERE id = x'{QSO_IDS[1].replace('-', '')}'")
+        summary = (await conn.exec_driver_sql("SELECT kind, key, qso_count FROM worked_summary")).all()
+    assert sorted(summary) == [("call", "W1AW", 1), ("park", "K-0001", 1), ("park_band", "K-0001 20M", 1)]
+
+
+async def test_dry_run_changes_nothing():
+    engine = _engine()
+    pending = await run_migrations(engine, dry_run=True)
+    assert len(pending) == LATEST
+    async with engine.connect() as conn:
+        assert await conn.run_sync(lambda c: inspect(c).get_table_names()) == []
+
+
+async def test_current_schema_costs_one_query():
+    engine = _engine()
+    await run_migrations(engine)
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    assert await run_migrations(engine) == []
+    assert statements == ["SELECT MAX(version) FROM schema_version"]
+
+
+async def test_interrupted_upgrade_resumes():
+    engine = _engine()
+    await run_migrations(engine)
+    # Forget the last two versions as if the process died after their DDL ran
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(f"DELETE FROM schema_version WHERE version > {LATEST - 2}")
+    applied = await run_migrations(engine)
+    assert [m.version for m in applied] == [LATEST - 1, LATEST]
@@ -0,0 +1,148 @@
+"""Tests for the offline park catalog import, search and lookups."""
+
+import respx
+from httpx import AsyncClient, Response
+from sqlalchemy import event
+
+from app.main import app
+from app.park_catalog import ParkCatalog, parse_catalog
+
+
+CATALOG_CSV = """\
+"reference","name","active","entityId","locationDesc","latitude","longitude","grid"
+"K-0001","Acadia National Park","1","291","US-ME","44.31","-68.2034","FN54vh"
+"K-0010","Big Bend National Park","1","291","US-TX","29.25","-103.25","DL89"
+"K-0100","Acadia Lake State Park","0","291","US-ME","44.1","-68.1","FN54"
+"K-1000","Mount Desert Island Preserve","1","291","US-ME","","","FN54"
+"VE-0001","Banff National Park","1","1","CA-AB","51.5","-116","DO21"
+"""
+
+
+async def import_csv(client: AsyncClient, text: str = CATALOG_CSV):
+    resp = await client.post("/api/parks/import", content=text.encode())
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_parse_catalog():
+    rows = list(parse_catalog(CATALOG_CSV.splitlines()))
+    assert len(rows) == 5
+    assert rows[0]["reference"] == "K-0001"
+    assert rows[0]["entity_id"] == 291
+    assert rows[2]["active"] is False
+    assert rows[3]["latitude"] is None
+
+
+def test_parse_catalog_skips_blank_references():
+    lines = ["reference,name", ",Nowhere", "k-0002,Somewhere"]
+    assert [r["reference"] for r in parse_catalog(lines)] == ["K-0002"]
+
+
+async def test_import_endpoint(client: AsyncClient):
+    assert await import_csv(client) == {"imported": 5, "total": 5}
+    # Re-importing upserts instead of duplicating
+    assert await import_csv(client) == {"imported": 5, "total": 5}
+
+
+async def test_search_ranks_reference_then_name_then_word(client: AsyncClient):
+    await import_csv(client)
+
+    resp = await client.get("/api/parks/search", params={"q": "k-00"})
+    assert [p["reference"] for p in resp.json()] == ["K-0001", "K-0010"]
+
+    resp = await client.get("/api/parks/search", params={"q": "k-0001"})
+    assert resp.json()[0] == {
+        "reference": "K-0001", "name": "Acadia National Park", "locationDesc": "US-ME",
+    }
+
+    # Name prefixes come before matches on a later word
+    resp = await client.get("/api/parks/search", params={"q": "acadia"})
+    assert [p["reference"] for p in resp.json()] == ["K-0100", "K-0001"]
+    resp = await client.get("/api/parks/search", params={"q": "nation"})
+    assert [p["reference"] for p in resp.json()] == ["K-0001", "K-0010", "VE-0001"]
+
+
+async def test_search_limit_and_validation(client: AsyncClient):
+    await import_csv(client)
+    resp = await client.get("/api/parks/search", params={"q": "k", "limit": 2})
+    assert len(resp.json()) == 2
+    resp = await client.get("/api/parks/search", params={"q": ""})
+    assert resp.status_code == 422
+
+
+async def test_search_empty_catalog(client: AsyncClient):
+    resp = await client.get("/api/parks/search", params={"q": "acadia"})
+    assert resp.status_code == 200
+    assert resp.json() == []
+
+
+@respx.mock
+async def test_get_park_served_from_catalog(client: AsyncClient):
+    route = respx.get("https://api.pota.app/park/K-0001").mock(
+        return_value=Response(200, json={"reference": "K-0001", "name": "Upstream"})
+    )
+    await import_csv(client)
+    resp = await client.get("/api/parks/k-0001")
+    assert resp.status_code == 200
+    assert resp.json()["name"] == "Acadia National Park"
+    assert resp.json()["grid"] == "FN54vh"
+    assert route.call_count == 0
+
+
+async def test_repeat_catalog_lookup_served_from_memory(client: AsyncClient, _test_engine):
+    await import_csv(client)
+    await client.get("/api/parks/K-0001")
+    statements = []
+
+    @event.listens_for(_test_engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    resp = await client.get("/api/parks/k-0001")
+    assert resp.json()["name"] == "Acadia National Park"
+    assert statements == []
+    assert app.state.park_cache.catalog_hits == 1
+    assert app.state.park_cache.memory_hits == 1
+
+
+async def test_import_drops_remembered_lookups(client: AsyncClient):
+    await import_csv(client)
+    await client.get("/api/parks/K-0001")
+    await import_csv(client, CATALOG_CSV.replace("Acadia National Park", "Acadia NP"))
+    assert (await client.get("/api/parks/K-0001")).json()["name"] == "Acadia NP"
+
+
+@respx.mock
+async def test_get_park_falls_back_to_network(client: AsyncClient):
+    route = respx.get("https://api.pota.app/park/K-4000").mock(
+        return_value=Response(200, json={"reference": "K-4000", "name": "Elsewhere"})
+    )
+    await import_csv(client)
+    resp = await client.get("/api/parks/K-4000")
+    assert resp.status_code == 200
+    assert resp.json()["name"] == "Elsewhere"
+    assert route.call_count == 1
+
+
+@respx.mock
+async def test_batch_uses_catalog_first(client: AsyncClient):
+    route = respx.get("https://api.pota.app/park/K-4000").mock(return_value=Response(404))
+    await import_csv(client)
+    resp = await client.post(
+        "/api/parks/batch", json={"references": ["K-0001", "ve-0001", "K-4000"]}
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert set(body["parks"]) == {"K-0001", "VE-0001"}
+    assert body["errors"] == {"K-4000": "not_found"}
+    assert route.call_count == 1
+
+
+def test_search_large_catalog():
+    catalog = ParkCatalog()
+    catalog._build([(f"K-{i:05d}", f"Park Number {i}", "US-XX") for i in range(50_000)])
+    results = catalog.search("K-0123", limit=5)
+    assert [p["reference"] for p in results] == [
+        "K-01230", "K-01231", "K-01232", "K-01233", "K-01234",
+    ]
+    assert len(catalog.search("4999", limit=50)) == 11
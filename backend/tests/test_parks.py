@@ -1,8 +1,18 @@
-"""Tests for parks proxy endpoint (mocked POTA API)."""
+"""Tests for parks proxy endpoint and its cache (mocked POTA API)."""
 
+import asyncio
+import time
+
+import httpx
 import pytest
 import respx
-from httpx import AsyncClient, Response
+from httpx import ASGITransport, AsyncClient, Response
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.database import create_engines, get_db, get_read_db
+from app.main import app, init_state
+from app.migrations import run_migrations
+from app.park_cache import PARK_BATCH_CONCURRENCY, ParkCache
 
 
 pytestmark = pytest.mark.asyncio
@@ -15,6 +25,16 @@ PARK_DATA = {
     "longitude": -68.21,
 }
 
+QSO_DATA = {
+    "park_reference": "K-0001",
+    "callsign": "W1AW",
+    "frequency": 14.074,
+    "band": "20m",
+    "mode": "FT8",
+    "rst_sent": "59",
+    "rst_received": "59",
+}
+
 
 @respx.mock
 async def test_get_park_success(client: AsyncClient):
@@ -42,3 +62,233 @@ async def test_get_park_api_error(client: AsyncClient):
     )
     resp = await client.get("/api/parks/K-0001")
     assert resp.status_code == 404  # backend returns 404 for any non-200
+
+
+@respx.mock
+async def test_get_park_cached_in_memory(client: AsyncClient):
+    route = respx.get("https://api.pota.app/park/K-0001").mock(
+        return_value=Response(200, json=PARK_DATA)
+    )
+    await client.get("/api/parks/K-0001")
+    resp = await client.get("/api/parks/k-0001")
+    assert resp.json()["name"] == "Acadia National Park"
+    assert route.call_count == 1
+    assert app.state.park_cache.memory_hits == 1
+
+
+@respx.mock
+async def test_get_park_survives_restart(client: AsyncClient):
+    route = respx.get("https://api.pota.app/park/K-0001").mock(
+        return_value=Response(200, json=PARK_DATA)
+    )
+    await client.get("/api/parks/K-0001")
+    app.state.park_cache = ParkCache(app.state.write_queue)  # fresh process, same database
+
+    resp = await client.get("/api/parks/K-0001")
+    assert resp.json() == PARK_DATA
+    assert route.call_count == 1
+    assert app.state.park_cache.db_hits == 1
+
+
+@respx.mock
+async def test_unknown_park_negatively_cached(client: AsyncClient):
+    route = respx.get("https://api.pota.app/park/K-9999").mock(
+        return_value=Response(404)
+    )
+    await client.get("/api/parks/K-9999")
+    app.state.park_cache = ParkCache(app.state.write_queue)
+    resp = await client.get("/api/parks/K-9999")
+    assert resp.status_code == 404
+    assert route.call_count == 1
+
+
+@respx.mock
+async def test_upstream_error_not_cached(client: AsyncClient):
+    route = respx.get("https://api.pota.app/park/K-0001").mock(
+        side_effect=[Response(500), Response(200, json=PARK_DATA)]
+    )
+    assert (await client.get("/api/parks/K-0001")).status_code == 404
+    assert (await client.get("/api/parks/K-0001")).status_code == 200
+    assert route.call_count == 2
+
+
+@respx.mock
+async def test_expired_entry_refetched_and_served_stale_on_error(client: AsyncClient):
+    route = respx.get("https://api.pota.app/park/K-0001").mock(
+        side_effect=[Response(200, json=PARK_DATA), Response(503)]
+    )
+    await client.get("/api/parks/K-0001")
+    app.state.park_cache.ttl = 0
+
+    resp = await client.get("/api/parks/K-0001")
+    assert resp.status_code == 200
+    assert resp.json() == PARK_DATA
+    assert route.call_count == 2
+
+
+@respx.mock
+async def test_invalid_json_is_upstream_error(client: AsyncClient):
+    route = respx.get("https://api.pota.app/park/K-0001").mock(
+        side_effect=[Response(200, text="<html>oops</html>"), Response(200, json=PARK_DATA)]
+    )
+    resp = await client.post("/api/parks/batch", json={"references": ["K-0001"]})
+    assert resp.json()["errors"] == {"K-0001": "upstream_error"}
+    assert app.state.park_cache.stats()["upstream_errors"] == 1
+
+    # The failure wasn't cached, so the next lookup asks again
+    resp = await client.get("/api/parks/K-0001")
+    assert resp.json() == PARK_DATA
+    assert route.call_count == 2
+
+
+async def test_lru_evicts_oldest():
+    cache = ParkCache(None, size=2)
+    for ref in ("K-0001", "K-0002", "K-0003"):
+        cache._remember(ref, {"reference": ref}, time.time())
+    assert cache.peek("K-0001") is None
+    assert cache.peek("K-0003") == {"reference": "K-0003"}
+
+
+@respx.mock
+async def test_stats_reports_park_cache(client: AsyncClient):
+    respx.get("https://api.pota.app/park/K-0001").mock(
+        return_value=Response(200, json=PARK_DATA)
+    )
+    await client.get("/api/parks/K-0001")
+    await client.get("/api/parks/K-0001")
+    stats = (await client.get("/api/stats")).json()["park_cache"]
+    assert stats["misses"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["upstream_avg_ms"] is not None
+
+
+@respx.mock
+async def test_batch_lookup_mixes_cache_upstream_and_errors(client: AsyncClient):
+    cached = respx.get("https://api.pota.app/park/K-0001").mock(
+        return_value=Response(200, json=PARK_DATA)
+    )
+    respx.get("https://api.pota.app/park/K-0002").mock(
+        return_value=Response(200, json={**PARK_DATA, "reference": "K-0002"})
+    )
+    respx.get("https://api.pota.app/park/K-9999").mock(return_value=Response(404))
+    respx.get("https://api.pota.app/park/K-0500").mock(return_value=Response(503))
+    await client.get("/api/parks/K-0001")
+
+    resp = await client.post(
+        "/api/parks/batch",
+        json={"references": ["K-0001", "k-0002", "K-9999", "K-0500", "K-0002"]},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert set(body["parks"]) == {"K-0001", "K-0002"}
+    assert body["errors"] == {"K-9999": "not_found", "K-0500": "upstream_error"}
+    assert cached.call_count == 1
+
+
+@respx.mock
+async def test_batch_lookup_bounded_concurrency(client: AsyncClient):
+    in_flight = peak = 0
+
+    async def slow_park(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return Response(200, json={"reference": request.url.path.rsplit("/", 1)[-1]})
+
+    route = respx.get(url__regex=r"https://api.pota.app/park/.*").mock(side_effect=slow_park)
+    batches = [[f"K-{n:04d}" for n in range(start, start + 12)] for start in (0, 100)]
+    responses = await asyncio.gather(*(
+        client.post("/api/parks/batch", json={"references": refs}) for refs in batches
+    ))
+
+    assert [len(r.json()["parks"]) for r in responses] == [12, 12]
+    assert route.call_count == 24
+    # The limit holds across requests, not just within one batch
+    assert peak == PARK_BATCH_CONCURRENCY
+
+
+@respx.mock
+async def test_concurrent_lookups_share_one_upstream_request(client: AsyncClient):
+    release = asyncio.Event()
+
+    async def slow_park(request):
+        await release.wait()
+        return Response(200, json=PARK_DATA)
+
+    route = respx.get("https://api.pota.app/park/K-0001").mock(side_effect=slow_park)
+    single = asyncio.create_task(client.get("/api/parks/K-0001"))
+    batch = asyncio.create_task(
+        client.post("/api/parks/batch", json={"references": ["K-0001"]})
+    )
+    async with asyncio.timeout(5):
+        while app.state.park_cache.shared_fetches == 0:
+            await asyncio.sleep(0.01)
+    release.set()
+
+    assert (await single).json() == PARK_DATA
+    assert (await batch).json()["parks"] == {"K-0001": PARK_DATA}
+    assert route.call_count == 1
+
+
+async def test_batch_lookup_validates_size(client: AsyncClient):
+    assert (await client.post("/api/parks/batch", json={"references": []})).status_code == 422
+    refs = [f"K-{n:04d}" for n in range(201)]
+    assert (await client.post("/api/parks/batch", json={"references": refs})).status_code == 422
+
+
+@pytest.fixture()
+async def file_client(tmp_path):
+    """Client over an on-disk database with the real single-writer pool."""
+    writer, reader = create_engines(f"sqlite+aiosqlite:///{tmp_path / 'pota.db'}")
+    await run_migrations(writer)
+    write_factory = async_sessionmaker(writer, class_=AsyncSession, expire_on_commit=False)
+    read_factory = async_sessionmaker(reader, class_=AsyncSession, expire_on_commit=False)
+
+    async def _get_db():
+        async with write_factory() as session:
+            yield session
+
+    async def _get_read_db():
+        async with read_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_read_db] = _get_read_db
+    async with httpx.AsyncClient() as http_client:
+        app.state.http_client = http_client
+        init_state(app, write_factory, read_factory)
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+            yield ac
+        await app.state.settings_cache.stop()
+        await app.state.write_queue.stop()
+    app.dependency_overrides.clear()
+    await writer.dispose()
+    await reader.dispose()
+
+
+@respx.mock
+async def test_slow_park_lookup_does_not_block_qso_insert(file_client: AsyncClient):
+    upstream_called = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_park(request):
+        upstream_called.set()
+        await release.wait()
+        return Response(200, json=PARK_DATA)
+
+    respx.get("https://api.pota.app/park/K-0001").mock(side_effect=slow_park)
+    sid = (await file_client.get("/api/hunt-sessions/today")).json()["id"]
+
+    lookup = asyncio.create_task(file_client.get("/api/parks/K-0001"))
+    await upstream_called.wait()
+    # The lookup stays blocked upstream until the insert has finished
+    resp = await asyncio.wait_for(
+        file_client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA), timeout=5
+    )
+    assert resp.status_code == 201
+    assert not lookup.done()
+
+    release.set()
+    assert (await lookup).json() == PARK_DATA
@@ -4,6 +4,9 @@ import uuid
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
+
+from app.pagination import encode_cursor
 
 
 pytestmark = pytest.mark.asyncio
@@ -103,3 +106,164 @@ async def test_create_qso_session_not_found(client: AsyncClient):
     fake_id = str(uuid.uuid4())
     resp = await client.post(f"/api/hunt-sessions/{fake_id}/qsos", json=QSO_DATA)
     assert resp.status_code == 404
+
+
+async def test_batch_create_qsos(client: AsyncClient):
+    sid = await _get_session_id(client)
+    qsos = [
+        {**QSO_DATA, "callsign": f"W{i}AW", "timestamp": "2025-06-01T12:00:00Z"}
+        for i in range(300)
+    ]
+    resp = await client.post(f"/api/hunt-sessions/{sid}/qsos/batch", json={"qsos": qsos})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["created"] == 300
+    assert body["duplicates"] == 0
+    assert body["results"][0]["qso"]["callsign"] == "W0AW"
+    assert body["results"][0]["qso"]["timestamp"] in ("2025-06-01T12:00:00Z", "2025-06-01T12:00:00+00:00")
+
+    resp = await client.get(f"/api/hunt-sessions/{sid}/qsos")
+    assert len(resp.json()) == 300
+
+
+async def test_batch_reports_duplicates_per_row(client: AsyncClient):
+    sid = await _get_session_id(client)
+    await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+
+    other = {**QSO_DATA, "band": "40m", "frequency": 7.074}
+    # Existing row, new row, then a repeat of the new row within the batch
+    resp = await client.post(
+        f"/api/hunt-sessions/{sid}/qsos/batch", json={"qsos": [QSO_DATA, other, other]}
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert [r["status"] for r in body["results"]] == ["duplicate", "created", "duplicate"]
+    assert body["results"][0]["qso"] is None
+    assert (body["created"], body["duplicates"]) == (1, 2)
+
+    resp = await client.get(f"/api/hunt-sessions/{sid}/qsos")
+    assert len(resp.json()) == 2
+
+
+async def test_batch_unknown_session_404(client: AsyncClient):
+    resp = await client.post(
+        f"/api/hunt-sessions/{uuid.uuid4()}/qsos/batch", json={"qsos": [QSO_DATA]}
+    )
+    assert resp.status_code == 404
+
+
+async def test_batch_rejects_empty(client: AsyncClient):
+    sid = await _get_session_id(client)
+    resp = await client.post(f"/api/hunt-sessions/{sid}/qsos/batch", json={"qsos": []})
+    assert resp.status_code == 422
+
+
+async def test_create_qso_is_one_statement(client: AsyncClient, _test_engine):
+    sid = await _get_session_id(client)
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(_test_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        resp = await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+    finally:
+        event.remove(_test_engine.sync_engine, "before_cursor_execute", record)
+    assert resp.status_code == 201
+    assert len(statements) == 1
+    assert statements[0].startswith("INSERT INTO qsos")
+
+
+async def test_unseeded_band_and_mode_round_trip(client: AsyncClient):
+    sid = await _get_session_id(client)
+    resp = await client.post(
+        f"/api/hunt-sessions/{sid}/qsos", json={**QSO_DATA, "band": "11m", "mode": "VARAHF"}
+    )
+    assert resp.status_code == 201
+    batch = [{**QSO_DATA, "callsign": "K1ABC", "band": "11m", "mode": "Hell"}]
+    resp = await client.post(f"/api/hunt-sessions/{sid}/qsos/batch", json={"qsos": batch})
+    assert resp.json()["created"] == 1
+
+    qsos = (await client.get(f"/api/hunt-sessions/{sid}/qsos")).json()
+    assert [(q["band"], q["mode"], q["frequency"]) for q in qsos] == [
+        ("11m", "VARAHF", 14.074),
+        ("11m", "Hell", 14.074),
+    ]
+    dup = await client.post(f"/api/hunt-sessions/{sid}/qsos", json={**QSO_DATA, "band": "11m"})
+    assert dup.status_code == 409
+
+
+async def _page_through(client: AsyncClient, sid: str, limit: int) -> list[dict]:
+    qsos, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        resp = await client.get(f"/api/hunt-sessions/{sid}/qsos", params=params)
+        assert resp.status_code == 200
+        qsos += resp.json()
+        cursor = resp.headers.get("x-next-cursor")
+        if cursor is None:
+            return qsos
+
+
+async def test_list_qsos_keyset_pagination(client: AsyncClient):
+    sid = await _get_session_id(client)
+    # A batch shares one timestamp, so pages must break ties on id
+    qsos = [{**QSO_DATA, "callsign": f"K{i}ABC"} for i in range(25)]
+    await client.post(f"/api/hunt-sessions/{sid}/qsos/batch", json={"qsos": qsos})
+
+    paged = await _page_through(client, sid, limit=10)
+    unpaged = (await client.get(f"/api/hunt-sessions/{sid}/qsos")).json()
+    assert [q["id"] for q in paged] == [q["id"] for q in unpaged]
+    assert len(paged) == 25
+
+
+async def test_list_qsos_pages_stable_under_inserts(client: AsyncClient):
+    sid = await _get_session_id(client)
+    qsos = [
+        {**QSO_DATA, "callsign": f"K{i}ABC", "timestamp": f"2025-06-01T12:{i:02d}:00Z"}
+        for i in range(10)
+    ]
+    await client.post(f"/api/hunt-sessions/{sid}/qsos/batch", json={"qsos": qsos})
+
+    resp = await client.get(f"/api/hunt-sessions/{sid}/qsos", params={"limit": 5})
+    first = resp.json()
+    cursor = resp.headers["x-next-cursor"]
+    # A late entry for an earlier time and a brand new contact arrive mid-listing
+    late = [
+        {**QSO_DATA, "callsign": "EARLY", "timestamp": "2025-06-01T11:00:00Z"},
+        {**QSO_DATA, "callsign": "NEWER"},
+    ]
+    await client.post(f"/api/hunt-sessions/{sid}/qsos/batch", json={"qsos": late})
+    resp = await client.get(
+        f"/api/hunt-sessions/{sid}/qsos", params={"limit": 100, "cursor": cursor}
+    )
+    rest = resp.json()
+    callsigns = [q["callsign"] for q in first + rest]
+    assert callsigns == [f"K{i}ABC" for i in range(10)] + ["NEWER"]
+
+
+async def test_list_qsos_bad_cursor(client: AsyncClient):
+    sid = await _get_session_id(client)
+    resp = await client.get(f"/api/hunt-sessions/{sid}/qsos", params={"cursor": "bogus"})
+    assert resp.status_code == 400
+
+
+async def test_list_qsos_session_not_found(client: AsyncClient):
+    resp = await client.get(f"/api/hunt-sessions/{uuid.uuid4()}/qsos")
+    assert resp.status_code == 404
+
+
+async def test_list_qsos_session_not_found_with_cursor(client: AsyncClient):
+    sid = await _get_session_id(client)
+    await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+    resp = await client.get(f"/api/hunt-sessions/{sid}/qsos", params={"limit": 1})
+    # Only one QSO, so build the cursor a second page would carry
+    row = resp.json()[0]
+    cursor = encode_cursor("qsos", (row["timestamp"].removesuffix("Z"), row["id"]))
+
+    resp = await client.get(f"/api/hunt-sessions/{uuid.uuid4()}/qsos", params={"cursor": cursor})
+    assert resp.status_code == 404
+    resp = await client.get(f"/api/hunt-sessions/{sid}/qsos", params={"cursor": cursor})
+    assert resp.status_code == 200
+    assert resp.json() == []
@@ -0,0 +1,91 @@
+"""Tests for the in-memory settings snapshot behind exports and the radio."""
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.etag import VersionCounter
+from app.main import app
+from app.models import Settings
+from app.settings_cache import SETTINGS_VERSION_KEY, SettingsCache
+
+pytestmark = pytest.mark.asyncio
+
+QSO_DATA = {
+    "park_reference": "K-0001",
+    "callsign": "W1AW",
+    "frequency": 14.074,
+    "band": "20m",
+    "mode": "FT8",
+    "rst_sent": "59",
+    "rst_received": "59",
+}
+
+
+def _count_settings_queries(engine) -> list[str]:
+    seen = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if "settings" in statement:
+            seen.append(statement)
+
+    return seen
+
+
+async def test_exports_never_read_settings_table(client: AsyncClient, _test_engine):
+    await client.put("/api/settings", json={"operator_callsign": "KD2ABC"})
+    sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+    seen = _count_settings_queries(_test_engine)
+
+    resp = await client.get(f"/api/hunt-sessions/{sid}/export")
+    assert "KD2ABC" in resp.text
+    await client.get("/api/export")
+    await client.get("/api/settings")
+    assert seen == []
+
+
+async def test_put_writes_through_and_bumps_version(client: AsyncClient):
+    await client.get("/api/settings")
+    version = app.state.settings_versions.get(SETTINGS_VERSION_KEY)
+
+    await client.put("/api/settings", json={"operator_callsign": "W1AW", "flrig_port": 12346})
+    snapshot = await app.state.settings_cache.get()
+    assert snapshot.operator_callsign == "W1AW"
+    assert snapshot.flrig_port == 12346
+    assert app.state.settings_versions.get(SETTINGS_VERSION_KEY) == version + 1
+    assert app.state.settings_cache.loads == 1
+
+
+async def test_other_process_update_seen_after_ttl(_test_engine):
+    factory = async_sessionmaker(_test_engine, class_=AsyncSession, expire_on_commit=False)
+    versions = VersionCounter()
+    cache = SettingsCache(factory, versions, ttl=0)
+    assert (await cache.get()).operator_callsign == ""
+
+    # Another worker writes the row directly
+    async with factory() as db:
+        await db.execute(update(Settings).values(operator_callsign="N0CALL"))
+        await db.commit()
+
+    # Stale while the background read runs, fresh once it lands
+    assert (await cache.get()).operator_callsign == ""
+    await cache._refresh
+    assert (await cache.get()).operator_callsign == "N0CALL"
+    assert versions.get(SETTINGS_VERSION_KEY) == 1
+    assert cache.stats()["changes_seen"] == 1
+    await cache.stop()
+
+
+async def test_unchanged_reload_keeps_version(_test_engine):
+    factory = async_sessionmaker(_test_engine, class_=AsyncSession, expire_on_commit=False)
+    versions = VersionCounter()
+    cache = SettingsCache(factory, versions, ttl=0)
+    await cache.get()
+    await cache.get()
+    await cache._refresh
+    assert cache.loads == 2
+    assert versions.get(SETTINGS_VERSION_KEY) == 0
+    await cache.stop()
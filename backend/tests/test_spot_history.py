@@ -0,0 +1,114 @@
+"""Tests for the spot history recorder and /api/spots/history."""
+
+from datetime import datetime, timezone
+
+import asyncio
+
+import pytest
+import respx
+from httpx import AsyncClient, Response
+
+from app.main import app
+from app.spot_history import prune_history
+
+from tests.test_spots import SPOTS_DATA
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _record(data: list[dict]) -> None:
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=data)
+    )
+    cache = app.state.spot_cache
+    cache.ttl = cache.max_stale = 0  # force a fresh snapshot per tick
+    app.state.spot_recorder.retention_days = 0  # fixtures are older than the default
+    await app.state.spot_recorder.tick()
+
+
+@respx.mock
+async def test_recorder_appends_snapshot(client: AsyncClient):
+    await _record(SPOTS_DATA)
+    resp = await client.get("/api/spots/history")
+    assert resp.status_code == 200
+    rows = resp.json()
+    assert [r["activator"] for r in rows] == ["N5J", "K3LR", "W1AW"]  # newest first
+    assert rows[0]["band"] == "15m"
+    assert rows[0]["spot_time"].endswith("Z") or rows[0]["spot_time"].endswith("+00:00")
+
+
+@respx.mock
+async def test_recorder_deduplicates_repeated_spots(client: AsyncClient):
+    await _record(SPOTS_DATA)
+    respot = {**SPOTS_DATA[0], "spotTime": "2025-06-15T19:00:00Z"}
+    await _record([*SPOTS_DATA, respot])
+
+    rows = (await client.get("/api/spots/history", params={"park": "k-0001"})).json()
+    assert [r["spot_time"][:19] for r in rows] == ["2025-06-15T19:00:00", "2025-06-15T18:30:00"]
+    assert app.state.spot_recorder.snapshots_recorded == 2
+
+
+@respx.mock
+async def test_recorder_keeps_snapshots_fetched_between_ticks(client: AsyncClient):
+    route = respx.get("https://api.pota.app/spot/activator").mock(
+        side_effect=[
+            Response(200, json=SPOTS_DATA[:1]),
+            Response(200, json=SPOTS_DATA[1:2]),
+            Response(200, json=SPOTS_DATA[2:]),
+        ]
+    )
+    cache = app.state.spot_cache
+    cache.ttl = cache.max_stale = 0
+    recorder = app.state.spot_recorder
+    recorder.retention_days = 0
+    recorder.interval = 3600  # only the first tick runs during the test
+
+    recorder.start()
+    try:
+        async with asyncio.timeout(5):
+            while recorder.snapshots_recorded < 1:
+                await asyncio.sleep(0.01)
+            # Two refreshes driven by /api/spots readers before the next tick
+            await client.get("/api/spots")
+            await client.get("/api/spots")
+            while recorder.snapshots_recorded < 3:
+                await asyncio.sleep(0.01)
+    finally:
+        await recorder.stop()
+
+    rows = (await client.get("/api/spots/history")).json()
+    assert sorted(r["activator"] for r in rows) == sorted(s["activator"] for s in SPOTS_DATA)
+    assert route.call_count == 3
+
+
+@respx.mock
+async def test_history_filters(client: AsyncClient):
+    await _record(SPOTS_DATA)
+
+    async def activators(**params) -> list[str]:
+        resp = await client.get("/api/spots/history", params=params)
+        return [r["activator"] for r in resp.json()]
+
+    assert await activators(band="40m") == ["K3LR"]
+    assert await activators(activator="n5j") == ["N5J"]
+    assert await activators(mode="ft8") == ["K3LR", "W1AW"]
+    assert await activators(start="2025-06-15T18:35:00Z") == ["N5J", "K3LR"]
+    assert await activators(end="2025-06-15T18:35:00Z") == ["W1AW"]
+    assert await activators(limit=1) == ["N5J"]
+
+
+@respx.mock
+async def test_prune_removes_expired_spots(client: AsyncClient):
+    recent = datetime.now(timezone.utc).isoformat()
+    await _record([*SPOTS_DATA, {**SPOTS_DATA[0], "spotTime": recent}])
+
+    async with app.state.spot_recorder._session_factory() as db:
+        assert await prune_history(db, retention_days=30) == 3
+
+    rows = (await client.get("/api/spots/history")).json()
+    assert len(rows) == 1
+
+
+async def test_history_limit_validated(client: AsyncClient):
+    resp = await client.get("/api/spots/history", params={"limit": 5000})
+    assert resp.status_code == 422
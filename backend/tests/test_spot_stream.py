@@ -0,0 +1,121 @@
+"""Tests for the server-push spot stream (diffs and per-client filtering)."""
+
+import asyncio
+import json
+
+import pytest
+import respx
+from httpx import AsyncClient, Response
+
+from app.main import app
+from app.routers.spots import spot_filter
+from app.spot_cache import with_bands
+from app.spot_stream import SpotStream
+
+from tests.test_spots import QSO_DATA, SPOTS_DATA
+
+pytestmark = pytest.mark.asyncio
+
+
+def _parse(event: str) -> tuple[str, dict]:
+    lines = event.strip().split("\n")
+    return lines[0].removeprefix("event: "), json.loads(lines[1].removeprefix("data: "))
+
+
+async def _next(sub) -> tuple[str, dict]:
+    return _parse(await asyncio.wait_for(sub.queue.get(), timeout=1))
+
+
+def _stream(batches: list[list[dict]]) -> SpotStream:
+    it = iter(batches)
+
+    async def load():
+        return with_bands([dict(s) for s in next(it)])
+
+    return SpotStream(load, interval=3600)
+
+
+async def test_first_event_is_filtered_snapshot():
+    stream = _stream([SPOTS_DATA])
+    sub = stream.subscribe(spot_filter("20m", None))
+    event, data = await _next(sub)
+    stream.unsubscribe(sub)
+    assert event == "snapshot"
+    assert [s["activator"] for s in data["spots"]] == ["W1AW"]
+
+
+async def test_diff_reports_added_changed_removed():
+    changed = {**SPOTS_DATA[0], "comments": "QRT soon"}
+    new_spot = {**SPOTS_DATA[1], "activator": "AA1AA"}
+    stream = _stream([SPOTS_DATA, [changed, SPOTS_DATA[2], new_spot]])
+    sub = stream.subscribe(spot_filter(None, None))
+    await _next(sub)
+    stream.poke()
+    event, data = await _next(sub)
+    stream.unsubscribe(sub)
+
+    assert event == "diff"
+    assert [s["activator"] for s in data["added"]] == ["AA1AA"]
+    assert [s["comments"] for s in data["changed"]] == ["QRT soon"]
+    assert data["removed"] == [
+        {"activator": "K3LR", "reference": "K-0002", "frequency": "7074"}
+    ]
+
+
+async def test_diff_filtered_per_subscriber():
+    stream = _stream([SPOTS_DATA, SPOTS_DATA[1:]])
+    on_20m = stream.subscribe(spot_filter("20m", None))
+    on_cw = stream.subscribe(spot_filter(None, "CW"))
+    await _next(on_20m)
+    await _next(on_cw)
+    stream.poke()
+    event, data = await _next(on_20m)
+    assert event == "diff"
+    assert data["removed"][0]["activator"] == "W1AW"
+    # The CW client saw nothing change, so it gets no event at all
+    await asyncio.sleep(0.05)
+    assert on_cw.queue.empty()
+    stream.unsubscribe(on_20m)
+    stream.unsubscribe(on_cw)
+
+
+async def test_mode_change_moves_spot_across_filters():
+    retuned = {**SPOTS_DATA[2], "mode": "SSB"}
+    stream = _stream([SPOTS_DATA, [*SPOTS_DATA[:2], retuned]])
+    sub = stream.subscribe(spot_filter(None, "CW"))
+    await _next(sub)
+    stream.poke()
+    _, data = await _next(sub)
+    stream.unsubscribe(sub)
+    assert data["added"] == [] and data["changed"] == []
+    assert data["removed"][0]["activator"] == "N5J"
+
+
+async def test_poller_stops_without_subscribers():
+    stream = _stream([SPOTS_DATA])
+    sub = stream.subscribe(spot_filter(None, None))
+    await _next(sub)
+    stream.unsubscribe(sub)
+    assert stream.subscriber_count == 0
+    assert stream._task is None
+
+
+@respx.mock
+async def test_logging_qso_pushes_hunted_change(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    stream = app.state.spot_stream
+    sub = stream.subscribe(spot_filter(None, None))
+    try:
+        _, data = await _next(sub)
+        assert not any(s["hunted"] for s in data["spots"])
+
+        sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+        await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+
+        event, data = await _next(sub)
+        assert event == "diff"
+        assert [(s["activator"], s["hunted"]) for s in data["changed"]] == [("W1AW", True)]
+    finally:
+        stream.unsubscribe(sub)
@@ -1,9 +1,14 @@
 """Tests for spots endpoint (mocked POTA API + DB for hunted flag)."""
 
+import asyncio
+
 import pytest
 import respx
 from httpx import AsyncClient, Response
 
+from app.main import app
+from app.pagination import encode_cursor
+
 
 pytestmark = pytest.mark.asyncio
 
@@ -89,6 +94,19 @@ async def test_spots_hunted_after_logging_qso(client: AsyncClient):
     assert k3lr_spot["hunted"] is False
 
 
+@respx.mock
+async def test_spots_include_band(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    resp = await client.get("/api/spots")
+    assert {s["activator"]: s["band"] for s in resp.json()} == {
+        "W1AW": "20m",
+        "K3LR": "40m",
+        "N5J": "15m",
+    }
+
+
 @respx.mock
 async def test_spots_filter_by_band(client: AsyncClient):
     respx.get("https://api.pota.app/spot/activator").mock(
@@ -129,6 +147,16 @@ async def test_spots_api_failure(client: AsyncClient):
     assert resp.status_code == 502
 
 
+@respx.mock
+async def test_spots_invalid_upstream_body(client: AsyncClient):
+    route = respx.get("https://api.pota.app/spot/activator")
+    for body in (b'[{"spotId": 1, "activ', b"<html>Bad Gateway</html>", b'{"error": "x"}'):
+        route.mock(return_value=Response(200, content=body))
+        resp = await client.get("/api/spots")
+        assert resp.status_code == 502
+    assert app.state.spot_cache.errors == 3
+
+
 @respx.mock
 async def test_spots_empty_list(client: AsyncClient):
     respx.get("https://api.pota.app/spot/activator").mock(
@@ -137,3 +165,250 @@ async def test_spots_empty_list(client: AsyncClient):
     resp = await client.get("/api/spots")
     assert resp.status_code == 200
     assert resp.json() == []
+
+
+@respx.mock
+async def test_spots_served_from_cache(client: AsyncClient):
+    route = respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    await client.get("/api/spots")
+    resp = await client.get("/api/spots", params={"band": "20m"})
+    assert len(resp.json()) == 1
+    assert route.call_count == 1
+
+
+@respx.mock
+async def test_spots_concurrent_requests_share_one_fetch(client: AsyncClient):
+    route = respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    responses = await asyncio.gather(*(client.get("/api/spots") for _ in range(5)))
+    assert all(len(r.json()) == 3 for r in responses)
+    assert route.call_count == 1
+
+
+@respx.mock
+async def test_spots_stale_snapshot_served_while_refreshing(client: AsyncClient):
+    cache = app.state.spot_cache
+    cache.ttl = 0
+    route = respx.get("https://api.pota.app/spot/activator").mock(
+        side_effect=[Response(200, json=SPOTS_DATA), Response(200, json=SPOTS_DATA[:1])]
+    )
+    await client.get("/api/spots")
+    resp = await client.get("/api/spots")
+    assert len(resp.json()) == 3  # stale snapshot, refresh runs in background
+    await cache._refresh
+    assert route.call_count == 2
+    assert cache.stale_hits == 1
+
+    cache.ttl = 30
+    resp = await client.get("/api/spots")
+    assert len(resp.json()) == 1
+
+
+@respx.mock
+async def test_spots_cached_snapshot_not_mutated(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    await client.get("/api/spots")
+    snapshot = await app.state.spot_cache.get(app.state.http_client)
+    assert all("hunted" not in s for s in snapshot.spots)
+
+
+@respx.mock
+async def test_stats_reports_spot_cache_counters(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    await client.get("/api/spots")
+    await client.get("/api/spots")
+    resp = await client.get("/api/stats")
+    stats = resp.json()["spot_cache"]
+    assert stats["misses"] == 1
+    assert stats["hits"] == 1
+    assert stats["age_seconds"] is not None
+
+
+@respx.mock
+async def test_spots_etag_not_modified(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    first = await client.get("/api/spots", params={"band": "20m"})
+    etag = first.headers["etag"]
+
+    resp = await client.get("/api/spots", params={"band": "20m"}, headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+    other = await client.get("/api/spots", params={"band": "40m"}, headers={"If-None-Match": etag})
+    assert other.status_code == 200
+
+
+@respx.mock
+async def test_spots_etag_changes_when_hunted_changes(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    etag = (await client.get("/api/spots")).headers["etag"]
+    await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+
+    resp = await client.get("/api/spots", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["etag"] != etag
+
+
+@respx.mock
+async def test_spots_upstream_conditional_request(client: AsyncClient):
+    cache = app.state.spot_cache
+    route = respx.get("https://api.pota.app/spot/activator").mock(
+        side_effect=[
+            Response(200, json=SPOTS_DATA, headers={"ETag": '"abc"'}),
+            Response(304),
+        ]
+    )
+    etag = (await client.get("/api/spots")).headers["etag"]
+    cache.ttl = 0
+    cache.max_stale = 0
+    resp = await client.get("/api/spots", headers={"If-None-Match": etag})
+
+    assert route.calls[1].request.headers["if-none-match"] == '"abc"'
+    assert cache.not_modified == 1
+    assert resp.status_code == 304
+
+
+MANY_SPOTS = [
+    {
+        "spotId": n,
+        "activator": f"K{n}ABC",
+        "reference": f"K-{n % 4:04d}",
+        "frequency": str(7000 + n * 1000 if n < 10 else 14000 + n),
+        "mode": "CW" if n % 2 else "SSB",
+        "spotTime": f"2025-06-15T18:{n:02d}:00",
+    }
+    for n in range(12)
+]
+
+
+async def _activators(client: AsyncClient, **params) -> list[str]:
+    resp = await client.get("/api/spots", params=params)
+    assert resp.status_code == 200, resp.text
+    return [s["activator"] for s in resp.json()]
+
+
+@respx.mock
+async def test_spots_multiple_bands_and_modes(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    assert await _activators(client, band=["20m", "15m"]) == ["W1AW", "N5J"]
+    assert await _activators(client, band="20m,40m", mode="ft8") == ["K3LR", "W1AW"]
+    assert await _activators(client, mode=["CW", "FT8"], band="15m") == ["N5J"]
+
+
+@respx.mock
+async def test_spots_sort_orders(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    assert await _activators(client) == ["K3LR", "W1AW", "N5J"]
+    assert await _activators(client, sort="-frequency") == ["N5J", "W1AW", "K3LR"]
+    assert await _activators(client, sort="-time") == ["N5J", "K3LR", "W1AW"]
+    assert await _activators(client, sort="park") == ["W1AW", "K3LR", "N5J"]
+    resp = await client.get("/api/spots", params={"sort": "bogus"})
+    assert resp.status_code == 422
+
+
+@respx.mock
+async def test_spots_hunted_last(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    hunted_40m = {**QSO_DATA, "callsign": "K3LR", "park_reference": "K-0002", "band": "40m"}
+    await client.post(f"/api/hunt-sessions/{sid}/qsos", json=hunted_40m)
+    assert await _activators(client, sort="hunted-last") == ["W1AW", "N5J", "K3LR"]
+
+
+@respx.mock
+async def test_spots_cursor_pagination(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=MANY_SPOTS)
+    )
+    for sort in ("frequency", "-time", "park", "hunted-last"):
+        seen, cursor = [], None
+        while True:
+            params = {"sort": sort, "limit": 5, "mode": "CW"}
+            if cursor:
+                params["cursor"] = cursor
+            resp = await client.get("/api/spots", params=params)
+            assert resp.headers["x-total-count"] == "6"
+            seen += [s["activator"] for s in resp.json()]
+            cursor = resp.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+        assert seen == await _activators(client, sort=sort, mode="CW")
+        assert len(seen) == 6
+
+
+@respx.mock
+async def test_spots_cursor_stable_across_snapshots(client: AsyncClient):
+    route = respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=MANY_SPOTS)
+    )
+    first = await client.get("/api/spots", params={"limit": 4})
+    cursor = first.headers["x-next-cursor"]
+
+    # The next snapshot drops a spot from page one; page two must not repeat or skip
+    route.mock(return_value=Response(200, json=MANY_SPOTS[1:]))
+    app.state.spot_cache.ttl = app.state.spot_cache.max_stale = 0
+    second = await client.get("/api/spots", params={"limit": 4, "cursor": cursor})
+    assert [s["activator"] for s in second.json()] == [s["activator"] for s in MANY_SPOTS[4:8]]
+
+
+@respx.mock
+async def test_spots_invalid_cursor(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=MANY_SPOTS)
+    )
+    cursor = (await client.get("/api/spots", params={"limit": 2})).headers["x-next-cursor"]
+    resp = await client.get("/api/spots", params={"cursor": cursor, "sort": "park"})
+    assert resp.status_code == 400
+    resp = await client.get("/api/spots", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+
+
+@respx.mock
+async def test_spots_tampered_cursor_rejected(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=MANY_SPOTS)
+    )
+    # Well-formed JSON, but not a key of the frequency sort
+    for key in (5, ["x"], [14074.0, "W1AW"], [["x"], "W1AW", 1], ["x", "W1AW", 1]):
+        cursor = encode_cursor("frequency", key)
+        resp = await client.get("/api/spots", params={"cursor": cursor, "limit": 2})
+        assert resp.status_code == 400, key
+
+
+@respx.mock
+async def test_spots_fields_projection(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    resp = await client.get("/api/spots", params={"fields": "activator,hunted,nope", "band": "20m"})
+    assert resp.json() == [{"activator": "W1AW", "hunted": False}]
+
+
+@respx.mock
+async def test_spot_index_built_once_per_snapshot(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    await client.get("/api/spots", params={"band": "20m"})
+    snapshot = await app.state.spot_cache.get(app.state.http_client)
+    index = snapshot.index
+    await client.get("/api/spots", params={"mode": "CW", "sort": "park"})
+    assert snapshot.index is index
@@ -0,0 +1,91 @@
+"""Tests for the all-time worked index and the "new one" flags on spots."""
+
+import pytest
+import respx
+from httpx import AsyncClient, Response
+from sqlalchemy import text
+
+from app.main import app
+from app.worked_index import WorkedIndex
+
+from tests.test_spots import QSO_DATA, SPOTS_DATA
+
+pytestmark = pytest.mark.asyncio
+
+FLAGS = ("new_park", "new_park_band", "new_call")
+
+
+async def _flags(client: AsyncClient) -> dict[str, tuple[bool, bool, bool]]:
+    resp = await client.get("/api/spots")
+    return {s["activator"]: tuple(s[f] for f in FLAGS) for s in resp.json()}
+
+
+@respx.mock
+async def test_flags_follow_inserts_and_deletes(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    assert await _flags(client) == {
+        "W1AW": (True, True, True),
+        "K3LR": (True, True, True),
+        "N5J": (True, True, True),
+    }
+
+    qso = (await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)).json()
+    # K3LR worked before, but at N5J's park and on another band
+    other = {**QSO_DATA, "callsign": "k3lr", "park_reference": "k-0003"}
+    await client.post(f"/api/hunt-sessions/{sid}/qsos/batch", json={"qsos": [other]})
+    assert await _flags(client) == {
+        "W1AW": (False, False, False),
+        "K3LR": (True, True, False),
+        "N5J": (False, True, True),
+    }
+
+    await client.delete(f"/api/hunt-sessions/{sid}/qsos/{qso['id']}")
+    assert (await _flags(client))["W1AW"] == (True, True, True)
+    assert app.state.worked_index.loads == 1
+
+
+@respx.mock
+async def test_delete_keeps_keys_still_worked(client: AsyncClient):
+    respx.get("https://api.pota.app/spot/activator").mock(
+        return_value=Response(200, json=SPOTS_DATA)
+    )
+    sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    on_20m = (await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)).json()
+    await client.post(
+        f"/api/hunt-sessions/{sid}/qsos", json={**QSO_DATA, "band": "40m", "frequency": 7.074}
+    )
+    await client.delete(f"/api/hunt-sessions/{sid}/qsos/{on_20m['id']}")
+    # Park and call are still worked on 40m; only the 20m park-band is new again
+    assert (await _flags(client))["W1AW"] == (False, True, False)
+    assert (await client.get("/api/spots/worked/verify")).json()["consistent"] is True
+
+
+async def test_loads_existing_log_at_startup(client: AsyncClient):
+    sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+
+    index = WorkedIndex(app.state.hunted_index._session_factory)
+    worked = await index.current()
+    assert worked == {"park": {"K-0001"}, "park_band": {"K-0001 20M"}, "call": {"W1AW"}}
+
+
+async def test_verify_detects_drift_and_rebuild_repairs(client: AsyncClient):
+    sid = (await client.get("/api/hunt-sessions/today")).json()["id"]
+    await client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA)
+    session_factory = app.state.hunted_index._session_factory
+
+    async with session_factory() as db:
+        await db.execute(text("DELETE FROM worked_summary WHERE kind = 'call'"))
+        await db.commit()
+    report = (await client.get("/api/spots/worked/verify")).json()
+    assert report["consistent"] is False
+    assert report["table_drift"] == [["call", "W1AW"]]
+
+    resp = await client.post("/api/spots/worked/rebuild")
+    assert resp.json() == {"rows": 3}
+    report = (await client.get("/api/spots/worked/verify")).json()
+    assert report["consistent"] is True
+    assert report["size"] == {"park": 1, "park_band": 1, "call": 1}
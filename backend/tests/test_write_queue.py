@@ -0,0 +1,133 @@
+"""Tests for the group-commit write queue behind QSO create and delete."""
+
+import asyncio
+
+from httpx import AsyncClient
+from sqlalchemy import text
+
+QSO_DATA = {
+    "park_reference": "K-0001",
+    "callsign": "W1AW",
+    "frequency": 14.074,
+    "band": "20m",
+    "mode": "FT8",
+    "rst_sent": "59",
+    "rst_received": "59",
+}
+
+
+async def _get_session_id(client: AsyncClient) -> str:
+    resp = await client.get("/api/hunt-sessions/today")
+    return resp.json()["id"]
+
+
+async def test_concurrent_creates_share_commits(client: AsyncClient):
+    sid = await _get_session_id(client)
+    before = (await client.get("/api/stats")).json()["write_queue"]
+    responses = await asyncio.gather(*(
+        client.post(f"/api/hunt-sessions/{sid}/qsos", json={**QSO_DATA, "callsign": f"K{i}ABC"})
+        for i in range(20)
+    ))
+    assert [r.status_code for r in responses] == [201] * 20
+    assert len({r.json()["id"] for r in responses}) == 20
+
+    stats = (await client.get("/api/stats")).json()["write_queue"]
+    assert stats["writes"] - before["writes"] == 20
+    assert stats["batches"] - before["batches"] < 20
+    assert stats["max_batch_size"] > 1
+    listed = (await client.get(f"/api/hunt-sessions/{sid}/qsos")).json()
+    assert len(listed) == 20
+
+
+async def test_each_request_gets_its_own_result(client: AsyncClient):
+    sid = await _get_session_id(client)
+    missing = "00000000-0000-0000-0000-000000000000"
+    created, duplicate, not_found = await asyncio.gather(
+        client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA),
+        client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA),
+        client.post(f"/api/hunt-sessions/{missing}/qsos", json=QSO_DATA),
+    )
+    assert sorted([created.status_code, duplicate.status_code]) == [201, 409]
+    assert not_found.status_code == 404
+
+
+async def test_concurrent_deletes(client: AsyncClient):
+    sid = await _get_session_id(client)
+    ids = [
+        (await client.post(f"/api/hunt-sessions/{sid}/qsos", json={**QSO_DATA, "callsign": f"K{i}ABC"})).json()["id"]
+        for i in range(5)
+    ]
+    responses = await asyncio.gather(
+        *(client.delete(f"/api/hunt-sessions/{sid}/qsos/{qso_id}") for qso_id in ids),
+        client.delete(f"/api/hunt-sessions/{sid}/qsos/{ids[0]}"),
+    )
+    assert sorted(r.status_code for r in responses) == [204] * 5 + [404]
+    assert (await client.get(f"/api/hunt-sessions/{sid}/qsos")).json() == []
+
+
+async def test_failing_write_does_not_sink_its_batch(client: AsyncClient):
+    from app.main import app
+
+    queue = app.state.write_queue
+
+    async def bad(db):
+        await db.execute(text("INSERT INTO no_such_table VALUES (1)"))
+
+    async def good(db):
+        await db.execute(text("UPDATE settings SET operator_callsign = 'KD2ABC'"))
+        return "ok"
+
+    await client.get("/api/settings")
+    results = await asyncio.gather(queue.submit(bad), queue.submit(good), return_exceptions=True)
+    assert isinstance(results[0], Exception)
+    assert results[1] == "ok"
+    # Read the table itself; GET /api/settings serves the cached snapshot
+    callsign = await queue.submit(lambda db: db.scalar(text("SELECT operator_callsign FROM settings")))
+    assert callsign == "KD2ABC"
+    assert queue.stats()["errors"] == 1
+
+
+async def test_failing_write_is_rolled_back_as_a_whole(client: AsyncClient):
+    from app.main import app
+
+    queue = app.state.write_queue
+
+    async def half_done(db):
+        await db.execute(text("UPDATE settings SET operator_callsign = 'N0CALL'"))
+        await db.execute(text("INSERT INTO no_such_table VALUES (1)"))
+
+    async def good(db):
+        await db.execute(text("UPDATE settings SET flrig_port = 4532"))
+
+    await client.get("/api/settings")
+    results = await asyncio.gather(
+        queue.submit(half_done, savepoint=True), queue.submit(good), return_exceptions=True
+    )
+    assert isinstance(results[0], Exception)
+    row = await queue.submit(
+        lambda db: db.execute(text("SELECT operator_callsign, flrig_port FROM settings"))
+    )
+    assert tuple(row.one()) == ("", 4532)
+
+
+async def test_cancelled_create_still_updates_versions_and_indexes(client: AsyncClient):
+    from app.main import app
+
+    state = app.state
+    sid = await _get_session_id(client)
+    await state.worked_index.current()
+    version = state.session_versions.get(sid)
+    state.write_queue.window = 0.2
+
+    request = asyncio.create_task(client.post(f"/api/hunt-sessions/{sid}/qsos", json=QSO_DATA))
+    await asyncio.sleep(0.05)  # queued, still inside the collection window
+    request.cancel()
+
+    async def noop(db):
+        pass
+
+    await state.write_queue.submit(noop)
+    assert request.cancelled()
+    assert len((await client.get(f"/api/hunt-sessions/{sid}/qsos")).json()) == 1
+    assert state.session_versions.get(sid) == version + 1
+    assert "W1AW" in (await state.worked_index.current())["call"]
@@ -81,3 +81,11 @@ export async function getActiveSpots(band?: string, mode?: string): Promise<Spot
   const qs = params.toString();
   return request(`/spots${qs ? `?${qs}` : ""}`);
 }
+
+export function spotsStreamUrl(band?: string, mode?: string): string {
+  const params = new URLSearchParams();
+  if (band && band !== "All") params.set("band", band);
+  if (mode && mode !== "All") params.set("mode", mode);
+  const qs = params.toString();
+  return `${BASE}/spots/stream${qs ? `?${qs}` : ""}`;
+}
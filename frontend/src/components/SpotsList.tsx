@@ -1,6 +1,6 @@
 import { useState, useEffect, useRef } from "react";
-import { getActiveSpots, setRadioFrequency } from "../api";
-import { Spot } from "../types";
+import { setRadioFrequency, spotsStreamUrl } from "../api";
+import { Spot, SpotDiff, SpotKey } from "../types";
 
 const BANDS = ["All", "160m", "80m", "60m", "40m", "30m", "20m", "17m", "15m", "12m", "10m", "6m", "2m"];
 const MODES = ["All", "SSB", "CW", "FT8", "FT4", "AM", "FM", "RTTY"];
@@ -11,34 +11,46 @@ function kHzToMHz(kHz: string): string {
   return (val / 1000).toFixed(4);
 }
 
+function spotKey(s: SpotKey): string {
+  return `${s.activator.toUpperCase()}|${s.reference.toUpperCase()}|${s.frequency}`;
+}
+
+function applyDiff(spots: Spot[], diff: SpotDiff): Spot[] {
+  const byKey = new Map(spots.map((s) => [spotKey(s), s]));
+  for (const key of diff.removed) byKey.delete(spotKey(key));
+  for (const s of [...diff.added, ...diff.changed]) byKey.set(spotKey(s), s);
+  return Array.from(byKey.values());
+}
+
 interface Props {
   onSelect: (spot: Spot) => void;
-  refreshToken?: number;
 }
 
-export default function SpotsList({ onSelect, refreshToken }: Props) {
+export default function SpotsList({ onSelect }: Props) {
   const [spots, setSpots] = useState<Spot[]>([]);
   const [loading, setLoading] = useState(true);
   const [bandFilter, setBandFilter] = useState("All");
   const [modeFilter, setModeFilter] = useState("All");
   const [radioStatus, setRadioStatus] = useState<{ message: string; error: boolean } | null>(null);
-  const intervalRef = useRef<ReturnType<typeof setInterval>>();
   const statusTimerRef = useRef<ReturnType<typeof setTimeout>>();
 
-  const fetchSpots = () => {
-    getActiveSpots(bandFilter, modeFilter)
-      .then(setSpots)
-      .catch(console.error)
-      .finally(() => setLoading(false));
-  };
-
+  // The server pushes a full snapshot on connect (and on reconnect), then
+  // only the spots that changed. Logging or deleting a QSO triggers a push of
+  // the updated hunted flags.
   useEffect(() => {
-    fetchSpots();
-    intervalRef.current = setInterval(fetchSpots, 60000);
-    return () => {
-      if (intervalRef.current) clearInterval(intervalRef.current);
-    };
-  }, [bandFilter, modeFilter, refreshToken]);
+    setLoading(true);
+    const source = new EventSource(spotsStreamUrl(bandFilter, modeFilter));
+    source.addEventListener("snapshot", (e) => {
+      setSpots(JSON.parse((e as MessageEvent).data).spots);
+      setLoading(false);
+    });
+    source.addEventListener("diff", (e) => {
+      const diff: SpotDiff = JSON.parse((e as MessageEvent).data);
+      setSpots((prev) => applyDiff(prev, diff));
+    });
+    source.onerror = (e) => console.error(e);
+    return () => source.close();
+  }, [bandFilter, modeFilter]);
 
   const handleFreqClick = async (spot: Spot) => {
     try {
@@ -121,7 +133,14 @@ export default function SpotsList({ onSelect, refreshToken }: Props) {
                   <td style={tdStyle}>{spot.mode}</td>
                   <td style={tdStyle}>{spot.activator}</td>
                   <td style={tdStyle}>{spot.locationDesc}</td>
-                  <td style={tdStyle}>{spot.reference}</td>
+                  <td style={tdStyle}>
+                    {spot.reference}
+                    {spot.new_park ? (
+                      <span title="Never worked this park" style={{ marginLeft: "0.3rem", color: "#c60", fontWeight: 600 }}>NEW</span>
+                    ) : spot.new_park_band ? (
+                      <span title="Never worked this park on this band" style={{ marginLeft: "0.3rem", color: "#c60" }}>new band</span>
+                    ) : null}
+                  </td>
                   <td style={tdStyle}>{spot.name}</td>
                 </tr>
               ))}
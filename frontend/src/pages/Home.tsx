@@ -12,7 +12,6 @@ export default function Home() {
   const [loading, setLoading] = useState(true);
   const [session, setSession] = useState<HuntSessionDetail | null>(null);
   const [selectedSpot, setSelectedSpot] = useState<Spot | null>(null);
-  const [spotsRefresh, setSpotsRefresh] = useState(0);
   const [showSettings, setShowSettings] = useState(false);
 
   useEffect(() => {
@@ -30,7 +29,6 @@ export default function Home() {
     } else {
       getTodaySession().then(setSession).catch(console.error);
     }
-    setSpotsRefresh((n) => n + 1);
   }, [session]);
 
   useEffect(() => {
@@ -78,7 +76,7 @@ export default function Home() {
               onCancel={() => setShowSettings(false)}
             />
           )}
-          <SpotsList onSelect={setSelectedSpot} refreshToken={spotsRefresh} />
+          <SpotsList onSelect={setSelectedSpot} />
           <QSOForm sessionId={session.id} onCreated={loadSession} selectedSpot={selectedSpot} />
           <QSOTable sessionId={session.id} qsos={session.qsos} onDeleted={loadSession} />
         </>
@@ -6,6 +6,7 @@ export interface HuntSession {
 
 export interface HuntSessionDetail extends HuntSession {
   qsos: QSO[];
+  qso_count: number;
 }
 
 export interface QSO {
@@ -57,5 +58,21 @@ export interface Spot {
   mode: string;
   spotTime: string;
   comments: string;
+  band?: string;
   hunted?: boolean;
+  new_park?: boolean;
+  new_park_band?: boolean;
+  new_call?: boolean;
+}
+
+export interface SpotKey {
+  activator: string;
+  reference: string;
+  frequency: string;
+}
+
+export interface SpotDiff {
+  added: Spot[];
+  changed: Spot[];
+  removed: SpotKey[];
 }